@@ -0,0 +1,85 @@
+"""Feed registry: the nightly datasets declared under ``feeds`` in datasets.yaml."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from pipeline.common.utils import load_yaml
+
+DATASETS_PATH = "config/datasets.yaml"
+
+# Promotion kinds with an INT promoter in pipeline.promote.promote_int_gold.
+PROMOTION_KINDS = ("snapshot", "events")
+
+
+@dataclass(frozen=True)
+class Feed:
+    """One nightly file feed and where it lands."""
+
+    name: str
+    file_pattern: str
+    schema_path: str
+    raw_table: str
+    business_columns: int
+    required_headers: tuple[str, ...] = ()
+    promotion: str | None = None
+    int_table: str | None = None
+
+    @property
+    def history_name(self) -> str:
+        """PROMOTION_HISTORY dataset_name (the bare INT table name)."""
+        return (self.int_table or self.raw_table).rpartition(".")[2]
+
+    def file_name(self, batch_date: str) -> str:
+        """Expected file name for a YYYY-MM-DD batch date."""
+        return self.file_pattern.format(stamp=batch_date.replace("-", ""), batch_date=batch_date)
+
+
+def load_feeds(path: str | Path = DATASETS_PATH) -> list[Feed]:
+    """Return the feeds declared in the dataset registry, in file order."""
+    payload = load_yaml(path)
+    datasets = payload.get("datasets") or {}
+    feeds_payload = payload.get("feeds") or {}
+    if not feeds_payload:
+        raise ValueError(f"No feeds declared in {path}")
+
+    feeds: list[Feed] = []
+    for name, spec in feeds_payload.items():
+        spec = spec or {}
+        missing = [key for key in ("file_pattern", "schema", "raw_dataset", "business_columns") if key not in spec]
+        if missing:
+            raise ValueError(f"Feed {name} in {path} missing: {', '.join(missing)}")
+        promotion = spec.get("promotion")
+        if promotion is not None and promotion not in PROMOTION_KINDS:
+            raise ValueError(f"Feed {name} has unknown promotion {promotion!r}; expected one of {PROMOTION_KINDS}")
+        if promotion is not None and not spec.get("int_dataset"):
+            raise ValueError(f"Feed {name} promotes to INT but declares no int_dataset")
+        feeds.append(
+            Feed(
+                name=str(name),
+                file_pattern=str(spec["file_pattern"]),
+                schema_path=str(spec["schema"]),
+                raw_table=_dataset_table(datasets, spec["raw_dataset"], name, path),
+                business_columns=int(spec["business_columns"]),
+                required_headers=tuple(spec.get("required_headers") or ()),
+                promotion=promotion,
+                int_table=_dataset_table(datasets, spec["int_dataset"], name, path) if spec.get("int_dataset") else None,
+            )
+        )
+    return feeds
+
+
+def get_feed(name: str, path: str | Path = DATASETS_PATH) -> Feed:
+    """Return one feed by name."""
+    for feed in load_feeds(path):
+        if feed.name == name:
+            return feed
+    raise KeyError(f"Unknown feed {name!r} in {path}")
+
+
+def _dataset_table(datasets: dict, key: str, feed_name: str, path: str | Path) -> str:
+    table = (datasets.get(key) or {}).get("table")
+    if not table:
+        raise ValueError(f"Feed {feed_name} references unknown dataset {key!r} in {path}")
+    return str(table)
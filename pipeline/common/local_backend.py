@@ -0,0 +1,558 @@
+"""DuckDB-backed stand-in for a Snowflake connection (optional ``local`` extra).
+
+Implements the slice of the connector interface the pipeline uses, translates
+the Snowflake dialect subset in our SQL, and emulates PUT/COPY against local
+files, so the nightly job can run end to end without a warehouse.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - exercised only without the extra
+    duckdb = None
+
+LOCAL_DATABASE_PATH = "artifacts/local/claims.duckdb"
+LOCAL_SCHEMAS = ("RAW", "CTRL", "INT", "GOLD", "SEM", "SEMANTIC")
+# DDL run by bootstrap_local, in order; each file is translated statement by statement.
+LOCAL_BOOTSTRAP_FILES = (
+    "sql/01_raw/create_raw_tables_all_varchar.sql",
+    "sql/02_ctrl/ctrl_tables.sql",
+    "sql/03_int/int_facts.sql",
+    "sql/03_int/int_dimensions.sql",
+    "sql/04_gold/gold_claims_mart.sql",
+)
+
+# Account-level statements with no local meaning; they succeed without effect.
+_NO_OP_PATTERN = re.compile(
+    r"^\s*(USE\s+(DATABASE|ROLE|WAREHOUSE)\b"
+    r"|CREATE\s+(OR\s+REPLACE\s+)?(DATABASE|WAREHOUSE|STAGE|FILE\s+FORMAT|PROCEDURE)\b"
+    r"|ALTER\s+(WAREHOUSE|SESSION)\b"
+    r"|ALTER\s+TABLE\s+\S+\s+CLUSTER\s+BY\b"
+    r"|CALL\b)",
+    re.IGNORECASE,
+)
+_USE_SCHEMA_PATTERN = re.compile(r"^\s*USE\s+SCHEMA\s+(\S+?)\s*;?\s*$", re.IGNORECASE)
+_PUT_PATTERN = re.compile(r"^\s*PUT\s+file://(\S+)\s+(@\S+)", re.IGNORECASE)
+_COPY_PATTERN = re.compile(
+    r"^\s*COPY\s+INTO\s+(?P<table>[\w.$]+)\s*(?:\((?P<columns>[^)]*)\))?\s*"
+    r"FROM\s*\(\s*SELECT\s+(?P<projection>.*?)\s+FROM\s+(?P<stage>@[\w.$]+)\s+(?P<alias>\w+)\s*\)"
+    r"(?P<options>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_PATTERN_OPTION = re.compile(r"PATTERN\s*=\s*(%\((\w+)\)s|'([^']*)')", re.IGNORECASE)
+_PARAM_PATTERN = re.compile(r"%\((\w+)\)s")
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+
+# Snowflake types -> DuckDB types. Snowflake HASH is signed 64-bit; see _hash.
+_TYPE_REWRITES = (
+    (re.compile(r"\bTIMESTAMP_NTZ\b", re.IGNORECASE), "TIMESTAMP"),
+    (re.compile(r"\bTIMESTAMP_(LTZ|TZ)\b", re.IGNORECASE), "TIMESTAMPTZ"),
+    (re.compile(r"\bNUMBER\s*\(", re.IGNORECASE), "DECIMAL("),
+    (re.compile(r"\bNUMBER\b", re.IGNORECASE), "BIGINT"),
+    (re.compile(r"\b(VARIANT|OBJECT)\b", re.IGNORECASE), "JSON"),
+    (re.compile(r"\bCURRENT_TIMESTAMP\s*\(\s*\)", re.IGNORECASE), "CAST(CURRENT_TIMESTAMP AS TIMESTAMP)"),
+    (re.compile(r"\bIFF\s*\(", re.IGNORECASE), "IF("),
+    (re.compile(r"\bPARSE_JSON\s*\(", re.IGNORECASE), "JSON("),
+    (re.compile(r"\)\s*CLUSTER\s+BY\s*\([^)]*\)", re.IGNORECASE), ")"),
+    # Snowflake does not enforce primary keys; DuckDB would, so drop them.
+    (re.compile(r",\s*PRIMARY\s+KEY\s*\([^)]*\)", re.IGNORECASE), ""),
+)
+
+
+def _require_duckdb() -> None:
+    if duckdb is None:
+        raise ImportError("The local backend needs DuckDB: pip install 'claims-governed-poc[local]'")
+
+
+# -- dialect translation ---------------------------------------------------
+
+
+def translate_sql(sql: str) -> str:
+    """Rewrite one Snowflake statement into DuckDB SQL."""
+    sql = _rewrite_outside_literals(sql, _TYPE_REWRITES)
+    sql = _rewrite_call(sql, "TABLE", _flatten)
+    sql = _rewrite_call(sql, "LISTAGG", None, listagg=True)
+    sql = _rewrite_call(sql, "TRY_TO_DATE", lambda args: f"TRY_CAST({args[0]} AS DATE)")
+    sql = _rewrite_call(sql, "TRY_TO_BOOLEAN", lambda args: f"TRY_CAST({args[0]} AS BOOLEAN)")
+    sql = _rewrite_call(sql, "TRY_TO_TIMESTAMP_NTZ", lambda args: f"TRY_CAST({args[0]} AS TIMESTAMP)")
+    sql = _rewrite_call(sql, "TRY_TO_TIMESTAMP", lambda args: f"TRY_CAST({args[0]} AS TIMESTAMP)")
+    sql = _rewrite_call(sql, "TRY_TO_NUMBER", _try_to_number)
+    sql = _rewrite_call(sql, "TRY_TO_DECIMAL", _try_to_number)
+    sql = _rewrite_call(sql, "EQUAL_NULL", lambda args: f"({args[0]} IS NOT DISTINCT FROM {args[1]})")
+    sql = _rewrite_call(sql, "HASH", _hash)
+    return _rewrite_from_values(sql)
+
+
+def _try_to_number(args: list[str]) -> str:
+    precision = args[1] if len(args) > 1 else "38"
+    scale = args[2] if len(args) > 2 else "0"
+    return f"TRY_CAST({args[0]} AS DECIMAL({precision}, {scale}))"
+
+
+def _hash(args: list[str]) -> str:
+    # DuckDB hashes to UBIGINT; shift into Snowflake's signed 64-bit range.
+    return f"CAST(CAST(HASH({', '.join(args)}) AS HUGEINT) - 9223372036854775808 AS BIGINT)"
+
+
+def _flatten(args: list[str]) -> str | None:
+    match = re.match(r"^\s*FLATTEN\s*\(\s*INPUT\s*=>\s*(.*)\)\s*$", args[0], re.IGNORECASE | re.DOTALL)
+    if match is None:
+        return None
+    return f"(SELECT UNNEST(CAST({match.group(1)} AS VARCHAR[])) AS value)"
+
+
+def _rewrite_from_values(sql: str) -> str:
+    """``FROM VALUES (..), (..)`` -> a derived table with Snowflake's column1..N names."""
+    pattern = re.compile(r"\bFROM\s+VALUES\s*(?=\()", re.IGNORECASE)
+    match = pattern.search(sql)
+    while match is not None:
+        end = match.end()
+        width = 0
+        while True:
+            close = _matching_paren(sql, end)
+            width = width or len(_split_args(sql[end + 1:close]))
+            following = re.compile(r"\s*,\s*(?=\()").match(sql, close + 1)
+            if following is None:
+                end = close + 1
+                break
+            end = following.end()
+        names = ", ".join(f"column{index}" for index in range(1, width + 1))
+        replacement = f"FROM (VALUES {sql[match.end():end].strip()}) AS _values({names})"
+        sql = sql[: match.start()] + replacement + sql[end:]
+        match = pattern.search(sql, match.start() + len(replacement))
+    return sql
+
+
+def _literal_spans(sql: str) -> list[tuple[int, int]]:
+    return [match.span() for match in _LITERAL_PATTERN.finditer(sql)]
+
+
+def _rewrite_outside_literals(sql: str, rewrites: tuple[tuple[re.Pattern[str], str], ...]) -> str:
+    parts: list[str] = []
+    last = 0
+    for start, end in _literal_spans(sql):
+        parts.append(_apply(sql[last:start], rewrites))
+        parts.append(sql[start:end])
+        last = end
+    parts.append(_apply(sql[last:], rewrites))
+    return "".join(parts)
+
+
+def _apply(text: str, rewrites: tuple[tuple[re.Pattern[str], str], ...]) -> str:
+    for pattern, replacement in rewrites:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _rewrite_call(
+    sql: str,
+    name: str,
+    render: Callable[[list[str]], str | None] | None,
+    *,
+    listagg: bool = False,
+) -> str:
+    """Rewrite ``name(args)`` calls right to left (inner calls first), skipping literals."""
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    search_end = len(sql)
+    while True:
+        spans = _literal_spans(sql)
+        matches = [
+            match
+            for match in pattern.finditer(sql, 0, search_end)
+            if not any(start <= match.start() < end for start, end in spans)
+        ]
+        if not matches:
+            return sql
+        match = matches[-1]
+        close = _matching_paren(sql, match.end() - 1)
+        args = _split_args(sql[match.end():close])
+        end = close + 1
+        if listagg:
+            within = re.compile(r"\s*WITHIN\s+GROUP\s*\(\s*ORDER\s+BY\s+", re.IGNORECASE).match(sql, end)
+            order_by = ""
+            if within is not None:
+                within_close = _matching_paren(sql, sql.index("(", within.start()))
+                order_by = f" ORDER BY {sql[within.end():within_close].strip()}"
+                end = within_close + 1
+            separator = args[1] if len(args) > 1 else "''"
+            replacement: str | None = f"STRING_AGG({args[0]}, {separator}{order_by})"
+        else:
+            replacement = render(args) if render else None
+        if replacement is None:
+            # Not a form we translate (e.g. TABLE(...) over something else); leave it.
+            search_end = match.start()
+            continue
+        sql = sql[: match.start()] + replacement + sql[end:]
+        # Continue leftwards so a replacement reusing the name is not rewritten again.
+        search_end = match.start()
+
+
+def _matching_paren(sql: str, open_index: int) -> int:
+    depth = 0
+    in_literal = False
+    for index in range(open_index, len(sql)):
+        char = sql[index]
+        if char == "'":
+            in_literal = not in_literal
+        elif not in_literal and char == "(":
+            depth += 1
+        elif not in_literal and char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    raise ValueError(f"Unbalanced parentheses in SQL near: {sql[open_index:open_index + 60]!r}")
+
+
+def _split_args(text: str) -> list[str]:
+    args: list[str] = []
+    depth = 0
+    in_literal = False
+    current: list[str] = []
+    for char in text:
+        if char == "'":
+            in_literal = not in_literal
+        elif not in_literal and char == "(":
+            depth += 1
+        elif not in_literal and char == ")":
+            depth -= 1
+        elif not in_literal and depth == 0 and char == ",":
+            args.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    args.append("".join(current).strip())
+    return args
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split on semicolons outside string literals, dropping comments and empty statements."""
+    sql = _strip_comments(sql)
+    statements: list[str] = []
+    current: list[str] = []
+    in_literal = False
+    for char in sql:
+        if char == "'":
+            in_literal = not in_literal
+        if char == ";" and not in_literal:
+            statements.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    statements.append("".join(current))
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def _strip_comments(sql: str) -> str:
+    """Drop ``--`` line comments outside string literals."""
+    out: list[str] = []
+    in_literal = False
+    index = 0
+    while index < len(sql):
+        char = sql[index]
+        if char == "'":
+            in_literal = not in_literal
+        elif not in_literal and sql.startswith("--", index):
+            newline = sql.find("\n", index)
+            index = len(sql) if newline == -1 else newline
+            continue
+        out.append(char)
+        index += 1
+    return "".join(out)
+
+
+def _bind(sql: str, params: Any) -> tuple[str, Any]:
+    """Convert pyformat/format placeholders to DuckDB ``$name``/``?`` binds."""
+    if params is None:
+        return sql, None
+    if isinstance(params, dict):
+        used = _PARAM_PATTERN.findall(sql)
+        sql = _PARAM_PATTERN.sub(lambda match: f"${match.group(1)}", sql)
+        bound = {name: params[name] for name in dict.fromkeys(used)}
+        return sql.replace("%%", "%"), bound or None
+    return sql.replace("%s", "?").replace("%%", "%"), list(params)
+
+
+# -- connection and cursor -------------------------------------------------
+
+
+class LocalDatabase:
+    """One DuckDB database plus the named stages PUT has uploaded into."""
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        _require_duckdb()
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._root = duckdb.connect(self.path)
+        self._lock = threading.Lock()
+        self.stages: dict[str, dict[str, Path]] = {}
+        # (table, file name, size, mtime) already loaded, like Snowflake load metadata.
+        self.loaded_files: set[tuple[str, str, int, int]] = set()
+        for schema in LOCAL_SCHEMAS:
+            self._root.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+
+    def connect(self, *, autocommit: bool = False) -> "LocalConnection":
+        """Open a connection (a DuckDB cursor on the shared database)."""
+        with self._lock:
+            return LocalConnection(self, self._root.cursor(), autocommit=autocommit)
+
+    def put(self, stage: str, file_path: Path) -> None:
+        with self._lock:
+            self.stages.setdefault(_stage_key(stage), {})[file_path.name] = file_path
+
+    def staged_files(self, stage: str, pattern: str | None) -> list[Path]:
+        with self._lock:
+            files = dict(self.stages.get(_stage_key(stage), {}))
+        regex = re.compile(pattern) if pattern else None
+        return [path for name, path in sorted(files.items()) if regex is None or regex.fullmatch(name)]
+
+    def close(self) -> None:
+        self._root.close()
+
+
+_databases: dict[str, LocalDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def local_database(path: str | Path = LOCAL_DATABASE_PATH) -> LocalDatabase:
+    """Return the process-wide database for ``path`` (``:memory:`` included)."""
+    with _databases_lock:
+        database = _databases.get(str(path))
+        if database is None:
+            database = LocalDatabase(path)
+            _databases[str(path)] = database
+    return database
+
+
+def connect_local(path: str | Path = LOCAL_DATABASE_PATH, *, autocommit: bool = False) -> "LocalConnection":
+    """Connector-style entry point used by the connection pool."""
+    return local_database(path).connect(autocommit=autocommit)
+
+
+class LocalConnection:
+    """Connection with Snowflake connector semantics (explicit commit/rollback)."""
+
+    def __init__(self, database: LocalDatabase, duck: Any, *, autocommit: bool = False) -> None:
+        self.database = database
+        self.autocommit = autocommit
+        self._duck = duck
+        self._in_transaction = False
+        self._closed = False
+
+    def cursor(self) -> "LocalCursor":
+        return LocalCursor(self)
+
+    def commit(self) -> None:
+        if self._in_transaction:
+            self._duck.execute("COMMIT")
+            self._in_transaction = False
+
+    def rollback(self) -> None:
+        if self._in_transaction:
+            self._duck.execute("ROLLBACK")
+            self._in_transaction = False
+
+    def close(self) -> None:
+        if not self._closed:
+            self.rollback()
+            self._duck.close()
+            self._closed = True
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def _run(self, sql: str, params: Any = None) -> Any:
+        if not self.autocommit and not self._in_transaction:
+            self._duck.execute("BEGIN TRANSACTION")
+            self._in_transaction = True
+        return self._duck.execute(sql, params) if params is not None else self._duck.execute(sql)
+
+
+class LocalCursor:
+    """Cursor exposing execute/fetch*/description/rowcount/nextset/sfqid."""
+
+    def __init__(self, connection: LocalConnection) -> None:
+        self.connection = connection
+        self._results: list[tuple[list[tuple[Any, ...]], list[tuple[Any, ...]] | None, int]] = []
+        self._rows: list[tuple[Any, ...]] = []
+        self.description: list[tuple[Any, ...]] | None = None
+        self.rowcount = -1
+        self.sfqid: str | None = None
+
+    def __enter__(self) -> "LocalCursor":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        while self._rows:
+            yield self._rows.pop(0)
+
+    def close(self) -> None:
+        self._results = []
+        self._rows = []
+
+    def execute(self, sql: str, params: Any = None, *, num_statements: int | None = None, **_kwargs: Any) -> "LocalCursor":
+        statements = split_statements(sql)
+        if num_statements is not None and num_statements != len(statements):
+            raise ValueError(f"Expected {num_statements} statements, found {len(statements)}")
+        if num_statements is None and len(statements) > 1:
+            raise ValueError("Multiple statements require num_statements, as in Snowflake")
+        self._results = [self._execute_one(statement, params) for statement in statements or [""]]
+        self.sfqid = uuid.uuid4().hex
+        self._advance()
+        return self
+
+    def nextset(self) -> bool | None:
+        if not self._results:
+            return None
+        self._advance()
+        return True
+
+    def fetchone(self) -> tuple[Any, ...] | None:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int = 1) -> list[tuple[Any, ...]]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> list[tuple[Any, ...]]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _advance(self) -> None:
+        self._rows, self.description, self.rowcount = self._results.pop(0)
+
+    def _execute_one(self, sql: str, params: Any) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]] | None, int]:
+        if not sql or _NO_OP_PATTERN.match(sql):
+            return _status("Statement executed successfully.")
+        use_schema = _USE_SCHEMA_PATTERN.match(sql)
+        if use_schema:
+            self.connection._run(f"USE {use_schema.group(1).rpartition('.')[2]}")
+            return _status("Statement executed successfully.")
+        put = _PUT_PATTERN.match(sql)
+        if put:
+            file_path = Path(put.group(1))
+            self.connection.database.put(put.group(2), file_path)
+            return (
+                [(file_path.name, file_path.name, "UPLOADED")],
+                _describe("source", "target", "status"),
+                1,
+            )
+        copy = _COPY_PATTERN.match(sql)
+        if copy:
+            return self._copy(copy, params)
+        if re.match(r"^\s*MERGE\b", sql, re.IGNORECASE):
+            return self._merge(sql, params)
+        bound_sql, bound_params = _bind(translate_sql(sql), params)
+        result = self.connection._run(bound_sql, bound_params)
+        return _materialize(result)
+
+    def _merge(self, sql: str, params: Any) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]], int]:
+        """Run MERGE and report per-action counts under Snowflake's column names."""
+        bound_sql, bound_params = _bind(translate_sql(sql).rstrip().rstrip(";"), params)
+        result = self.connection._run(f"{bound_sql}\nRETURNING merge_action", bound_params)
+        actions = [row[0] for row in result.fetchall()]
+        names = ["number of rows inserted", "number of rows updated"]
+        counts = [actions.count("INSERT"), actions.count("UPDATE")]
+        if re.search(r"\bTHEN\s+DELETE\b", sql, re.IGNORECASE):
+            names.append("number of rows deleted")
+            counts.append(actions.count("DELETE"))
+        return [tuple(counts)], _describe(*names), sum(counts)
+
+    def _copy(self, match: re.Match[str], params: Any) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]], int]:
+        """Emulate COPY INTO ... FROM (SELECT t.$n ... FROM @stage t) for CSV stages."""
+        pattern_match = _PATTERN_OPTION.search(match.group("options"))
+        pattern = None
+        if pattern_match is not None:
+            pattern = params[pattern_match.group(2)] if pattern_match.group(2) else pattern_match.group(3)
+        table = match.group("table")
+        columns = f" ({match.group('columns')})" if match.group("columns") else ""
+        alias = match.group("alias")
+        database = self.connection.database
+        results: list[tuple[Any, ...]] = []
+        for file_path in database.staged_files(match.group("stage"), pattern):
+            stat = file_path.stat()
+            load_key = (table.upper(), file_path.name, stat.st_size, stat.st_mtime_ns)
+            if load_key in database.loaded_files:
+                results.append((file_path.name, "LOAD_SKIPPED", 0, 0))
+                continue
+            width = _csv_width(file_path)
+            projection = re.sub(rf"\b{alias}\.\$(\d+)", lambda item: f'{alias}."c{item.group(1)}"', match.group("projection"))
+            projection = re.sub(r"METADATA\$FILENAME", f"'{file_path.name}'", projection, flags=re.IGNORECASE)
+            projection = re.sub(r"METADATA\$FILE_ROW_NUMBER", "ROW_NUMBER() OVER ()", projection, flags=re.IGNORECASE)
+            column_types = ", ".join(f"'c{index}': 'VARCHAR'" for index in range(1, width + 1))
+            source = (
+                f"read_csv('{file_path.as_posix()}', header = false, skip = 1, quote = '\"', "
+                f"nullstr = ['', 'NULL'], columns = {{{column_types}}})"
+            )
+            insert_sql = f"INSERT INTO {table}{columns} SELECT {translate_sql(projection)} FROM {source} AS {alias}"
+            loaded = int(self.connection._run(insert_sql).fetchone()[0])
+            database.loaded_files.add(load_key)
+            results.append((file_path.name, "LOADED", loaded, loaded))
+        return results, _describe("file", "status", "rows_parsed", "rows_loaded"), sum(row[3] for row in results)
+
+
+def _csv_width(file_path: Path) -> int:
+    with file_path.open("r", encoding="utf-8", newline="") as handle:
+        header = next(csv.reader(handle), [])
+    return len(header)
+
+
+def _stage_key(stage: str) -> str:
+    return stage.lstrip("@").upper()
+
+
+def _describe(*names: str) -> list[tuple[Any, ...]]:
+    return [(name, None, None, None, None, None, None) for name in names]
+
+
+def _status(message: str) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]], int]:
+    return [(message,)], _describe("status"), 0
+
+
+def _materialize(result: Any) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]] | None, int]:
+    description = list(result.description) if result.description else None
+    rows = result.fetchall() if description else []
+    rowcount = len(rows)
+    if description and len(description) == 1 and description[0][0] == "Count":
+        # DML: DuckDB's single Count row doubles as the affected-row count.
+        rowcount = int(rows[0][0]) if rows else 0
+    return rows, description, rowcount
+
+
+def bootstrap_local(conn: LocalConnection, root: str | Path = ".") -> None:
+    """Create the RAW/CTRL/INT/GOLD tables from the repo DDL."""
+    for relative in LOCAL_BOOTSTRAP_FILES:
+        sql = (Path(root) / relative).read_text(encoding="utf-8")
+        with conn.cursor() as cur:
+            for statement in split_statements(sql):
+                cur.execute(statement)
+    conn.commit()
+
+
+def main() -> int:
+    """Create (or reset) the local database tables from the repo DDL."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--database", default=LOCAL_DATABASE_PATH)
+    args = parser.parse_args()
+    connection = connect_local(args.database)
+    bootstrap_local(connection)
+    connection.close()
+    print(f"Local database ready at {args.database}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
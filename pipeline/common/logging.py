@@ -1,37 +1,225 @@
-"""Structured logging helpers for pipeline execution."""
+"""Structured logging helpers for pipeline execution.
+
+Records are handed to a background listener through a queue, so the calling
+thread only snapshots the message and the bound context. JSON rendering and
+I/O (console plus a rotating file under ``artifacts/run_logs``) happen on the
+listener thread.
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast serialiser
+    orjson = None
+
+RUN_LOG_DIR = "artifacts/run_logs"
+LOG_FILE_NAME = "pipeline.log"
+CONTEXT_FIELDS = ("run_id", "batch_date", "correlation_id", "stage", "control_id")
+
+# Fields bound with ``log_context``; copied contexts (DAG stage threads) inherit them.
+_log_context: ContextVar[dict[str, Any]] = ContextVar("pipeline_log_context", default={})
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_configure_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Bind fields (run_id, batch_date, ...) to every record logged in this context."""
+    token = _log_context.set({**_log_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def current_log_context() -> dict[str, Any]:
+    """Return the fields currently bound with ``log_context``."""
+    return dict(_log_context.get())
+
+
+def _json_dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+def _orjson_dumps(payload: dict[str, Any]) -> str:
+    return orjson.dumps(payload, default=str).decode("utf-8")
 
 
 class JsonFormatter(logging.Formatter):
-    """Render log records as JSON for easy ingestion and correlation."""
+    """Render log records as JSON for easy ingestion and correlation.
+
+    The timestamp is the record's creation time, and orjson is used when
+    installed (``fast=False`` forces the standard library serialiser).
+    """
+
+    def __init__(self, *, fast: bool = True) -> None:
+        super().__init__()
+        self._dumps: Callable[[dict[str, Any]], str] = _orjson_dumps if fast and orjson else _json_dumps
 
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        for key in ("run_id", "batch_date", "correlation_id"):
-            if hasattr(record, key):
-                payload[key] = getattr(record, key)
-        return json.dumps(payload, default=str)
+        # Records queued by ContextQueueHandler already carry their context.
+        context = _log_context.get()
+        for key in CONTEXT_FIELDS + ("suppressed",):
+            value = getattr(record, key, context.get(key))
+            if value is not None:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return self._dumps(payload)
 
 
-def configure_logging(level: str = "INFO") -> None:
-    """Configure root logger once for JSON output."""
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that snapshots message and log context on the calling thread.
+
+    Unlike the stock ``prepare`` it does not format the record here; only
+    the message arguments are merged so mutable arguments cannot change
+    before the listener renders them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks cannot cross threads safely; render them now (rare path).
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in _log_context.get().items():
+            # Explicit ``extra=`` values win over the bound context.
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return record
+
+
+class DebugRateLimiter(logging.Filter):
+    """Token-bucket limit (plus optional 1-in-N sampling) for DEBUG records.
+
+    Buckets are per call site, so one chatty loop cannot starve other debug
+    output. The next record let through carries a ``suppressed`` count of
+    what was dropped before it. INFO and above always pass.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 50.0,
+        burst: int = 100,
+        sample_every: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        if rate_per_second <= 0 or burst < 1 or sample_every < 1:
+            raise ValueError("rate_per_second, burst and sample_every must be positive")
+        self._rate = rate_per_second
+        self._burst = float(burst)
+        self._sample_every = sample_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> [tokens, last refill, records seen, suppressed since last pass]
+        self._buckets: dict[tuple[str, int], list[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.setdefault(key, [self._burst, now, 0, 0])
+            bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+            bucket[1] = now
+            bucket[2] += 1
+            sampled = (bucket[2] - 1) % self._sample_every == 0
+            if not sampled or bucket[0] < 1:
+                bucket[3] += 1
+                return False
+            bucket[0] -= 1
+            if bucket[3]:
+                record.suppressed = int(bucket[3])
+                bucket[3] = 0
+        return True
+
+
+def configure_logging(
+    level: str = "INFO",
+    *,
+    log_dir: str | Path | None = RUN_LOG_DIR,
+    fast: bool = True,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    debug_rate_per_second: float = 50.0,
+    debug_burst: int = 100,
+    debug_sample_every: int = 1,
+) -> None:
+    """Configure the root logger once: JSON to stderr and a rotating file, via a queue.
+
+    ``log_dir=None`` skips the file. Calling again only updates the level.
+    """
+    global _listener, _queue_handler
     root = logging.getLogger()
     root.setLevel(level.upper())
-    if root.handlers:
-        return
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
-    root.addHandler(handler)
+    with _configure_lock:
+        if _queue_handler is not None or root.handlers:
+            return
+        formatter = JsonFormatter(fast=fast)
+        handlers: list[logging.Handler] = [logging.StreamHandler()]
+        if log_dir is not None:
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            handlers.append(
+                RotatingFileHandler(
+                    Path(log_dir) / LOG_FILE_NAME,
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding="utf-8",
+                )
+            )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _queue_handler = ContextQueueHandler(log_queue)
+        _queue_handler.addFilter(DebugRateLimiter(debug_rate_per_second, debug_burst, debug_sample_every))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(_queue_handler)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Drain the queue, stop the listener and detach the handler (idempotent)."""
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = None
+        _queue_handler = None
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,322 @@
+"""In-process metrics registry with an atomic Prometheus textfile writer.
+
+The nightly job records throughput here and writes the registry as a textfile
+for the node-exporter textfile collector, which reads the Prometheus text
+exposition format (0.0.4). It writes once at run end, or every ``interval``
+seconds while the run is in progress.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterator
+
+from pipeline.common.logging import get_logger
+
+METRICS_FILE_ENV = "PIPELINE_METRICS_FILE"
+DEFAULT_METRICS_FILE = "artifacts/metrics/claims_pipeline.prom"
+# Seconds; spans sub-second statements up to a long COPY or control.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_bound(bound: float) -> str:
+    # Bucket bounds are canonical floats ("1.0", "+Inf"), unlike sample values.
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: LabelValues, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """One metric family; samples are keyed by label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(sorted(labels))}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @property
+    def family(self) -> str:
+        """Name the HELP/TYPE lines use; every sample must belong to it."""
+        return self.name
+
+    def samples(self) -> Iterator[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.family} {_escape(self.documentation)}",
+            f"# TYPE {self.family} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic total (rows, bytes); the family and its samples end in ``_total``."""
+
+    kind = "counter"
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}_total"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name} can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.family}{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Last observed value (rows/sec, latency, timestamps)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: str) -> float | None:
+        return self._values.get(self._key(labels))
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Bucketed durations; buckets are cumulative, as the exposition format expects."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), count, sum]
+        self._values: dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0, 0.0])
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[1] if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((key, [list(entry[0]), entry[1], entry[2]]) for key, entry in self._values.items())
+        for key, (counts, count, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _labels(self.labelnames, key, (("le", _format_bound(bound)),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(total)}"
+
+
+class MetricsRegistry:
+    """Named metric families rendered together as one Prometheus text exposition."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with another type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Return the Prometheus text exposition (format 0.0.4)."""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str | Path, registry: MetricsRegistry | None = None) -> Path:
+    """Write the registry atomically, so the collector never reads a partial file.
+
+    The text goes to a temporary file in the target directory and is renamed
+    over the target, because a rename is only atomic within one filesystem.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    text = (registry or REGISTRY).render()
+    # The collector only reads *.prom, so the temporary name is never scraped.
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return target
+
+
+class PeriodicTextfileWriter:
+    """Rewrites the textfile every ``interval`` seconds on a daemon thread.
+
+    ``stop`` writes one final time, so the file always ends with the values at
+    run end. Write failures are logged and never stop the run.
+    """
+
+    def __init__(self, path: str | Path, interval: float, registry: MetricsRegistry | None = None) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.path = Path(path)
+        self.interval = interval
+        self._registry = registry or REGISTRY
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics-textfile", daemon=True)
+
+    def __enter__(self) -> "PeriodicTextfileWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._write()
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_textfile(self.path, self._registry)
+        except OSError as exc:
+            get_logger(__name__).warning("metrics textfile write failed (%s): %s", self.path, exc)
+
+
+# Process-wide registry and the pipeline's metric families.
+REGISTRY = MetricsRegistry()
+
+ROWS_VALIDATED = REGISTRY.counter(
+    "claims_pipeline_rows_validated", "Rows checked against the feed schema contract.", ("feed",)
+)
+VALIDATION_ROWS_PER_SECOND = REGISTRY.gauge(
+    "claims_pipeline_validation_rows_per_second", "Schema validation throughput of the last run.", ("feed",)
+)
+UPLOADED_BYTES = REGISTRY.counter(
+    "claims_pipeline_uploaded_bytes", "Bytes of feed files PUT to the internal stage.", ("feed",)
+)
+COPY_DURATION = REGISTRY.histogram(
+    "claims_pipeline_copy_duration_seconds", "Duration of COPY INTO RAW per feed file.", ("feed",)
+)
+CONTROL_DURATION = REGISTRY.histogram(
+    "claims_pipeline_control_duration_seconds", "Duration of one control evaluation.", ("control_id",)
+)
+CONTROL_RESULTS = REGISTRY.counter(
+    "claims_pipeline_control_results", "Control results by status.", ("control_id", "status")
+)
+PROMOTED_ROWS = REGISTRY.counter(
+    "claims_pipeline_promoted_rows", "Rows written to INT by promotion.", ("feed", "action")
+)
+LANDING_TO_PROMOTION = REGISTRY.gauge(
+    "claims_pipeline_landing_to_promotion_seconds",
+    "Seconds from the feed file landing (mtime) to its promotion into INT.",
+    ("feed",),
+)
+RUN_DURATION = REGISTRY.gauge("claims_pipeline_run_duration_seconds", "Wall time of the last nightly run.")
+LAST_RUN_SUCCESS = REGISTRY.gauge("claims_pipeline_last_run_success", "1 when the last nightly run passed.")
+LAST_RUN_TIMESTAMP = REGISTRY.gauge(
+    "claims_pipeline_last_run_timestamp_seconds", "Unix time the last nightly run finished."
+)
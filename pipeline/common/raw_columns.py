@@ -2,8 +2,26 @@
 
 from __future__ import annotations
 
+from typing import Iterable, Literal
 
-def _table_columns(conn, schema_name: str, table_name: str) -> set[str]:
+# Typed columns populated at COPY time on the positional COL_* layout:
+# (column, SQL type, 1-based file position, cast template).
+LEGACY_TYPED_COLUMNS: dict[str, list[tuple[str, str, int, str]]] = {
+    "snapshot": [
+        ("BATCH_DATE", "DATE", 1, "TRY_TO_DATE({})"),
+        ("CLAIM_AMOUNT_INCURRED", "NUMBER(18,2)", 24, "TRY_TO_NUMBER({}, 18, 2)"),
+        ("PAID_AMOUNT_TO_DATE", "NUMBER(18,2)", 25, "TRY_TO_NUMBER({}, 18, 2)"),
+        ("RESERVE_AMOUNT", "NUMBER(18,2)", 26, "TRY_TO_NUMBER({}, 18, 2)"),
+    ],
+    "events": [
+        ("BATCH_DATE", "DATE", 1, "TRY_TO_DATE({})"),
+    ],
+}
+
+RawLayout = Literal["named", "typed_legacy", "legacy"]
+
+
+def table_columns(conn, schema_name: str, table_name: str) -> set[str]:
     """Return uppercase column names for an existing table."""
     sql = """
       SELECT UPPER(column_name)
@@ -17,18 +35,61 @@ def _table_columns(conn, schema_name: str, table_name: str) -> set[str]:
     return {row[0] for row in rows}
 
 
-def snapshot_expressions(conn) -> dict[str, str]:
-    """Return SQL expressions for logical snapshot fields."""
-    cols = _table_columns(conn, "RAW", "CLAIMS_SNAPSHOT_NIGHTLY")
+def tables_columns(conn, table_names: Iterable[str]) -> dict[str, set[str]]:
+    """Return uppercase column names for several ``SCHEMA.TABLE`` names in one query.
+
+    Keys are the names as given; tables that do not exist map to an empty set.
+    """
+    names = list(dict.fromkeys(table_names))
+    if not names:
+        return {}
+    placeholders = ", ".join(f"%(table_{index})s" for index in range(len(names)))
+    sql = f"""
+      SELECT UPPER(table_schema) || '.' || UPPER(table_name), UPPER(column_name)
+      FROM INFORMATION_SCHEMA.COLUMNS
+      WHERE UPPER(table_schema) || '.' || UPPER(table_name) IN ({placeholders})
+    """
+    params = {f"table_{index}": _qualified(name) for index, name in enumerate(names)}
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall() or []
+    found: dict[str, set[str]] = {}
+    for qualified, column in rows:
+        found.setdefault(qualified, set()).add(column)
+    return {name: found.get(_qualified(name), set()) for name in names}
+
+
+def _qualified(table_name: str) -> str:
+    schema_name, _, bare_table = table_name.rpartition(".")
+    return f"{(schema_name or 'RAW').upper()}.{bare_table.upper()}"
+
+
+def raw_layout(cols: set[str]) -> RawLayout:
+    """Classify a RAW table by its column names."""
+    if "COL_1" not in cols:
+        # Named layouts have no positional columns (BATCH_DATE may be absent too).
+        return "named" if "BATCH_DATE" in cols else "legacy"
+    # Positional layout; typed columns exist once COPY/migration populate them.
+    return "typed_legacy" if "BATCH_DATE" in cols else "legacy"
+
+
+def _loaded_at_expression(cols: set[str]) -> str:
+    """Return the load timestamp column for either RAW metadata naming."""
     # Timestamp column name changed across schema versions.
     if "LOADED_AT" in cols:
-        loaded_at_expr = "LOADED_AT"
-    elif "LOAD_TS" in cols:
-        loaded_at_expr = "LOAD_TS"
-    else:
-        # Keep pipeline runnable even if metadata column is absent.
-        loaded_at_expr = "CURRENT_TIMESTAMP()"
-    if "BATCH_DATE" in cols:
+        return "LOADED_AT"
+    if "LOAD_TS" in cols:
+        return "LOAD_TS"
+    # Keep pipeline runnable even if metadata column is absent.
+    return "CURRENT_TIMESTAMP()"
+
+
+def snapshot_expressions(conn) -> dict[str, str]:
+    """Return SQL expressions for logical snapshot fields."""
+    cols = table_columns(conn, "RAW", "CLAIMS_SNAPSHOT_NIGHTLY")
+    loaded_at_expr = _loaded_at_expression(cols)
+    layout = raw_layout(cols)
+    if layout == "named":
         # New schema: use direct column names.
         return {
             "batch_date": "BATCH_DATE",
@@ -41,11 +102,15 @@ def snapshot_expressions(conn) -> dict[str, str]:
             "loss_date": "LOSS_DATE",
             "report_date": "REPORT_DATE",
             "claim_status": "CLAIM_STATUS",
+            "close_date": "CLOSE_DATE",
+            "r_tw_flag": "TRY_TO_BOOLEAN(R_TW_FLAG)",
+            "r_tw_date": "R_TW_DATE",
             "pii_class": "PII_CLASS",
             "loaded_at": loaded_at_expr,
+            "src_file_row_number": "SRC_FILE_ROW_NUMBER",
         }
     # Legacy schema: map logical fields to positional COL_* columns.
-    return {
+    expressions = {
         "batch_date": "TRY_TO_DATE(COL_1)",
         "claim_id": "COL_3",
         "policy_id": "COL_5",
@@ -56,16 +121,59 @@ def snapshot_expressions(conn) -> dict[str, str]:
         "loss_date": "TRY_TO_DATE(COL_12)",
         "report_date": "TRY_TO_DATE(COL_13)",
         "claim_status": "COL_18",
+        "close_date": "TRY_TO_DATE(COL_17)",
+        "r_tw_flag": "TRY_TO_BOOLEAN(COL_22)",
+        "r_tw_date": "TRY_TO_DATE(COL_23)",
         "pii_class": "COL_29",
         "loaded_at": loaded_at_expr,
+        "src_file_row_number": "SRC_FILE_ROW_NUMBER",
     }
+    if layout == "typed_legacy":
+        # Typed columns populated at COPY time keep batch filters prunable.
+        expressions.update(
+            {
+                "batch_date": "BATCH_DATE",
+                "claim_amount_incurred": "CLAIM_AMOUNT_INCURRED",
+                "paid_amount_to_date": "PAID_AMOUNT_TO_DATE",
+                "reserve_amount": "RESERVE_AMOUNT",
+            }
+        )
+    return expressions
 
 
 def events_expressions(conn) -> dict[str, str]:
-    """Return SQL expressions for logical events fields used by controls."""
-    cols = _table_columns(conn, "RAW", "CLAIMS_EVENTS_NIGHTLY")
-    if "BATCH_DATE" in cols:
+    """Return typed SQL expressions for logical events fields."""
+    cols = table_columns(conn, "RAW", "CLAIMS_EVENTS_NIGHTLY")
+    loaded_at_expr = _loaded_at_expression(cols)
+    layout = raw_layout(cols)
+    if layout == "named":
         # New schema with explicit field names.
-        return {"batch_date": "BATCH_DATE", "event_type": "EVENT_TYPE"}
-    # Legacy schema.
-    return {"batch_date": "TRY_TO_DATE(COL_1)", "event_type": "COL_4"}
+        return {
+            "batch_date": "BATCH_DATE",
+            "claim_id": "CLAIM_ID",
+            "event_ts": "EVENT_TS",
+            "event_type": "EVENT_TYPE",
+            "old_status": "OLD_STATUS",
+            "new_status": "NEW_STATUS",
+            "amount_delta": "AMOUNT_DELTA",
+            "currency": "CURRENCY",
+            "source_system": "SOURCE_SYSTEM",
+            "note": "NOTE",
+            "loaded_at": loaded_at_expr,
+            "src_file_row_number": "SRC_FILE_ROW_NUMBER",
+        }
+    # Legacy schema: positions follow schemas/claims_events_schema.md.
+    return {
+        "batch_date": "BATCH_DATE" if layout == "typed_legacy" else "TRY_TO_DATE(COL_1)",
+        "claim_id": "COL_2",
+        "event_ts": "TRY_TO_TIMESTAMP_NTZ(COL_3)",
+        "event_type": "COL_4",
+        "old_status": "COL_5",
+        "new_status": "COL_6",
+        "amount_delta": "TRY_TO_NUMBER(COL_7, 18, 2)",
+        "currency": "COL_8",
+        "source_system": "COL_9",
+        "note": "COL_10",
+        "loaded_at": loaded_at_expr,
+        "src_file_row_number": "SRC_FILE_ROW_NUMBER",
+    }
@@ -2,14 +2,40 @@
 
 from __future__ import annotations
 
-import yaml
+import atexit
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Generator
+from functools import lru_cache
+from typing import Any, Callable, Generator
 
 import snowflake.connector
+import yaml
 from snowflake.connector import SnowflakeConnection
 
+from pipeline.common.tracing import traced
+
+CONFIG_PATH = "config/env.dev.yaml"
+
+# Session presets applied to every pooled connection: keep idle sessions
+# alive between stages, fetch results as Arrow chunks, download them in parallel.
+SESSION_PARAMETERS: dict[str, Any] = {
+    "CLIENT_SESSION_KEEP_ALIVE": True,
+    "PYTHON_CONNECTOR_QUERY_RESULT_FORMAT": "ARROW",
+}
+DEFAULT_POOL_CONFIG: dict[str, Any] = {
+    # "snowflake", or "local" for the DuckDB backend (PIPELINE_BACKEND overrides).
+    "backend": "snowflake",
+    "local_database": "artifacts/local/claims.duckdb",
+    "min_size": 1,
+    "max_size": 4,
+    "acquire_timeout_seconds": 60,
+    "health_check_after_seconds": 300,
+    "prefetch_threads": 4,
+}
+
 
 def _required_env(name: str) -> str:
     """Read required environment variable and fail early if missing."""
@@ -19,10 +45,20 @@ def _required_env(name: str) -> str:
     return value
 
 
+@lru_cache(maxsize=None)
+def _load_config_file(path: str) -> dict[str, Any]:
+    with open(path, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
 def load_yaml_config() -> dict[str, Any]:
-    """Load default Snowflake connection values from local dev config."""
-    with open("config/env.dev.yaml", "r") as f:
-        return yaml.safe_load(f)["snowflake"]
+    """Load default Snowflake connection values from local dev config (read once)."""
+    return dict(_load_config_file(CONFIG_PATH)["snowflake"])
+
+
+def pool_config() -> dict[str, Any]:
+    """Return pool sizing from the ``pool`` section of the config, over defaults."""
+    return {**DEFAULT_POOL_CONFIG, **(_load_config_file(CONFIG_PATH).get("pool") or {})}
 
 
 def connection_params() -> dict[str, Any]:
@@ -46,20 +82,239 @@ def connection_params() -> dict[str, Any]:
     }
 
 
+class ConnectionPool:
+    """Thread-safe pool of Snowflake connections sharing one autocommit mode.
+
+    Connections are opened lazily up to ``max_size``; ``open`` pre-warms
+    ``min_size``. A connection idle for longer than ``health_check_after``
+    seconds is probed with ``SELECT 1`` before reuse and replaced if dead.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any] | None = None,
+        *,
+        autocommit: bool = False,
+        min_size: int = 1,
+        max_size: int = 4,
+        acquire_timeout: float = 60.0,
+        health_check_after: float = 300.0,
+    ) -> None:
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self._connect = connect or (lambda: _connect(autocommit))
+        self.autocommit = autocommit
+        self.min_size = min_size
+        self.max_size = max_size
+        self._acquire_timeout = acquire_timeout
+        self._health_check_after = health_check_after
+        self._idle: deque[tuple[Any, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._available = threading.Condition()
+        # QUERY_TAG last applied per open connection (by id), kept across borrows.
+        self._session_tags: dict[int, str] = {}
+
+    @property
+    def size(self) -> int:
+        """Connections currently open (idle plus checked out)."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def open(self) -> "ConnectionPool":
+        """Pre-open connections up to ``min_size``."""
+        while True:
+            with self._available:
+                if self._size >= self.min_size:
+                    return self
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                raise
+            self.release(conn)
+
+    def acquire(self) -> Any:
+        """Check out a healthy connection, waiting while the pool is exhausted."""
+        deadline = time.monotonic() + self._acquire_timeout
+        while True:
+            with self._available:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No Snowflake connection free within {self._acquire_timeout:.0f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._available.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    # LIFO keeps the warmest sessions busy and lets the rest idle.
+                    conn, released_at = self._idle.pop()
+                else:
+                    conn, released_at = None, 0.0
+                    self._size += 1
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._discard_slot()
+                    raise
+            if self._healthy(conn, time.monotonic() - released_at):
+                return conn
+            self._forget(conn)
+            _close_quietly(conn)
+            self._discard_slot()
+
+    def traced(self, conn: Any) -> Any:
+        """Wrap a borrowed connection, sharing the pool's record of its QUERY_TAG."""
+        return traced(conn, self._session_tags)
+
+    def release(self, conn: Any, *, discard: bool = False) -> None:
+        """Return a connection; broken or discarded ones are closed instead."""
+        if discard or self._closed or _is_closed(conn):
+            self._forget(conn)
+            _close_quietly(conn)
+            self._discard_slot()
+            return
+        with self._available:
+            self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self) -> Generator[Any, None, None]:
+        """Borrow a traced connection; commit on success, roll back on error."""
+        conn = self.acquire()
+        broken = False
+        try:
+            # Cursors are traced when a run tracer is active; otherwise a thin proxy.
+            yield self.traced(conn)
+            if not self.autocommit:
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones close when released."""
+        with self._available:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._available.notify_all()
+        for conn in idle:
+            self._forget(conn)
+            _close_quietly(conn)
+
+    def _healthy(self, conn: Any, idle_seconds: float) -> bool:
+        if _is_closed(conn):
+            return False
+        if idle_seconds < self._health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            return True
+        except Exception:
+            return False
+
+    def _forget(self, conn: Any) -> None:
+        # A closed connection's id can be reused by a new session.
+        self._session_tags.pop(id(conn), None)
+
+    def _discard_slot(self) -> None:
+        with self._available:
+            self._size -= 1
+            self._available.notify()
+
+
+_pools: dict[bool, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(*, autocommit: bool = False) -> ConnectionPool:
+    """Return the process-wide pool for the given autocommit mode."""
+    with _pools_lock:
+        pool = _pools.get(autocommit)
+        if pool is None:
+            settings = pool_config()
+            pool = ConnectionPool(
+                autocommit=autocommit,
+                min_size=int(settings["min_size"]),
+                max_size=int(settings["max_size"]),
+                acquire_timeout=float(settings["acquire_timeout_seconds"]),
+                health_check_after=float(settings["health_check_after_seconds"]),
+            )
+            _pools[autocommit] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """Close every process-wide pool (registered to run at exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_pools)
+
+
 @contextmanager
 def get_connection() -> Generator[SnowflakeConnection, None, None]:
-    """Open Snowflake connection with commit/rollback handling."""
-    conn = snowflake.connector.connect(autocommit=False, **connection_params())
-    try:
+    """Borrow a pooled connection with commit/rollback handling."""
+    with get_pool().connection() as conn:
         yield conn
-        # If no exception happened in caller code, persist the transaction.
-        conn.commit()
-    except Exception:
-        # Roll back partial changes so each run is all-or-nothing.
-        conn.rollback()
-        raise
-    finally:
+
+
+def backend_name() -> str:
+    """Return the configured backend; ``PIPELINE_BACKEND`` wins over the config."""
+    return os.getenv("PIPELINE_BACKEND", str(pool_config()["backend"])).lower()
+
+
+def _connect(autocommit: bool) -> SnowflakeConnection:
+    """Open one connection with the session presets (or a local one)."""
+    if backend_name() == "local":
+        # Optional extra; imported only when selected.
+        from pipeline.common.local_backend import connect_local
+
+        path = os.getenv("PIPELINE_LOCAL_DATABASE", str(pool_config()["local_database"]))
+        return connect_local(path, autocommit=autocommit)  # type: ignore[return-value]
+    return snowflake.connector.connect(
+        autocommit=autocommit,
+        session_parameters=dict(SESSION_PARAMETERS),
+        client_session_keep_alive=True,
+        client_prefetch_threads=int(pool_config()["prefetch_threads"]),
+        **connection_params(),
+    )
+
+
+def _is_closed(conn: Any) -> bool:
+    is_closed = getattr(conn, "is_closed", None)
+    return bool(is_closed()) if callable(is_closed) else False
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
         conn.close()
+    except Exception:
+        pass
 
 
 def execute_scalar(
@@ -75,24 +330,38 @@ def execute_scalar(
 
 
 class SnowflakeClient:
-    """Small convenience wrapper used by control/evidence modules."""
+    """Small convenience wrapper used by control/evidence modules.
+
+    The connection is borrowed from the shared pool and returned on close.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, pool: ConnectionPool | None = None) -> None:
+        self._pool = pool
         self._conn: SnowflakeConnection | None = None
+        self._traced: Any = None
 
     def connect(self) -> None:
-        """Open a connection when needed."""
+        """Borrow a connection when needed."""
         if self._conn is None:
-            self._conn = snowflake.connector.connect(
-                autocommit=False,
-                **connection_params(),
-            )
+            if self._pool is None:
+                self._pool = get_pool()
+            self._conn = self._pool.acquire()
 
     def close(self) -> None:
-        """Close the active connection if it exists."""
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        """Roll back uncommitted work and return the connection to the pool."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.rollback()
+        except Exception:
+            self._release(discard=True)
+            return
+        self._release()
+
+    def _release(self, *, discard: bool = False) -> None:
+        if self._conn is not None and self._pool is not None:
+            self._pool.release(self._conn, discard=discard)
+        self._conn = None
 
     def __enter__(self) -> "SnowflakeClient":
         self.connect()
@@ -101,18 +370,28 @@ class SnowflakeClient:
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         if self._conn is None:
             return
-        if exc_type:
-            self._conn.rollback()
-        else:
-            self._conn.commit()
-        self.close()
+        broken = False
+        try:
+            if exc_type:
+                self._conn.rollback()
+            else:
+                self._conn.commit()
+        except Exception:
+            # The session's state is unknown; close it rather than pool it.
+            broken = True
+            raise
+        finally:
+            self._release(discard=broken)
 
     @property
     def connection(self) -> SnowflakeConnection:
         """Return an open connection."""
         self.connect()
         assert self._conn is not None
-        return self._conn
+        # One proxy per borrowed session, so its QUERY_TAG is set only on change.
+        if self._traced is None or self._traced.wrapped is not self._conn:
+            self._traced = self._pool.traced(self._conn) if self._pool is not None else traced(self._conn)
+        return self._traced
 
     def execute(
         self,
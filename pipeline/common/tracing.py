@@ -0,0 +1,292 @@
+"""Lightweight nested tracing spans for runs, stages, controls and SQL."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+# Longest SQL prefix kept on a span; full statements belong in query history.
+SQL_PREVIEW_CHARS = 300
+
+
+@dataclass
+class Span:
+    """One timed unit of work; ``parent_id`` links spans into a tree."""
+
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes (rows, query_id, ...) to the span."""
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def to_dict(self, origin_ns: int) -> dict[str, Any]:
+        return {
+            "type": "span",
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ms": round((self.start_ns - origin_ns) / 1_000_000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """Collects finished spans for one run and exports them as JSON lines."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def critical_path(self) -> list[Span]:
+        """Follow, from the longest root, the child that finished last at each level."""
+        spans = [span for span in self.spans if span.end_ns is not None]
+        children: dict[str | None, list[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+        roots = children.get(None, [])
+        if not roots:
+            return []
+        path = [max(roots, key=lambda span: span.duration_ms)]
+        while children.get(path[-1].span_id):
+            path.append(max(children[path[-1].span_id], key=lambda span: span.end_ns or 0))
+        return path
+
+    def summary(self) -> dict[str, Any]:
+        path = self.critical_path()
+        return {
+            "type": "summary",
+            "run_id": self.run_id,
+            "span_count": len(self.spans),
+            "total_ms": round(path[0].duration_ms, 3) if path else 0.0,
+            "critical_path": [
+                {"name": span.name, "kind": span.kind, "duration_ms": round(span.duration_ms, 3)}
+                for span in path
+            ],
+            "errors": [span.name for span in self.spans if span.error],
+        }
+
+    def export(self, log_dir: str | Path = "artifacts/run_logs") -> Path:
+        """Write spans plus a trailing critical-path summary to ``<run_id>.trace.jsonl``."""
+        path = Path(log_dir) / f"{self.run_id}.trace.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        spans = sorted(self.spans, key=lambda span: span.start_ns)
+        with path.open("w", encoding="utf-8") as fh:
+            for span in spans:
+                fh.write(json.dumps(span.to_dict(self._origin_ns), default=str) + "\n")
+            fh.write(json.dumps(self.summary(), default=str) + "\n")
+        return path
+
+
+_tracer: ContextVar[Tracer | None] = ContextVar("pipeline_tracer", default=None)
+_current: ContextVar[Span | None] = ContextVar("pipeline_span", default=None)
+# (run_id, stage, control_id) of the innermost run/stage/control span, traced or not.
+_query_tag: ContextVar[tuple[str, str, str]] = ContextVar("pipeline_query_tag", default=("", "", ""))
+
+
+def current_tracer() -> Tracer | None:
+    """Return the tracer active in this context, if any."""
+    return _tracer.get()
+
+
+def current_span() -> Span | None:
+    """Return the innermost open span in this context, if any."""
+    return _current.get()
+
+
+def current_query_tag() -> str:
+    """Return the Snowflake QUERY_TAG ``run_id:stage:control_id`` ('' outside a run)."""
+    run_id, stage, control_id = _query_tag.get()
+    if not run_id:
+        return ""
+    return f"{run_id}:{stage}:{control_id}"
+
+
+@contextmanager
+def start_trace(run_id: str) -> Iterator[Tracer]:
+    """Activate a tracer for the current context (and contexts copied from it)."""
+    tracer = Tracer(run_id)
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span | None]:
+    """Time a block as a child of the current span; a no-op without a tracer.
+
+    Run, stage and control spans also scope the query tag, with or without
+    a tracer, so every statement they issue is attributable in query history.
+    """
+    tracer = _tracer.get()
+    scope = _tag_scope(name, kind, attributes, tracer)
+    tag_token = _query_tag.set(scope) if scope is not None else None
+    try:
+        if tracer is None:
+            yield None
+            return
+        parent = _current.get()
+        item = Span(
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            kind=kind,
+            start_ns=time.perf_counter_ns(),
+        )
+        item.set(**attributes)
+        token = _current.set(item)
+        try:
+            yield item
+        except BaseException as exc:
+            item.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current.reset(token)
+            item.end_ns = time.perf_counter_ns()
+            tracer.record(item)
+    finally:
+        if tag_token is not None:
+            _query_tag.reset(tag_token)
+
+
+def _tag_scope(
+    name: str,
+    kind: str,
+    attributes: dict[str, Any],
+    tracer: Tracer | None,
+) -> tuple[str, str, str] | None:
+    run_id, stage, _control_id = _query_tag.get()
+    # ":" separates the tag fields, so it never appears inside one.
+    if kind == "run":
+        run_id = str(attributes.get("run_id") or (tracer.run_id if tracer else name))
+        return (run_id.replace(":", "_"), "", "")
+    if kind == "stage":
+        return (run_id, name.replace(":", "_"), "")
+    if kind == "control":
+        return (run_id, stage, name.replace(":", "_"))
+    return None
+
+
+class TracingCursor:
+    """Cursor proxy that wraps every ``execute`` in a ``sql`` span.
+
+    Before a statement runs under a different query tag than the session
+    last saw, the session's QUERY_TAG is updated to match; outside a run the
+    tag is unset, so later queries are not attributed to the last run.
+    """
+
+    def __init__(self, cursor: Any, connection: "TracingConnection | None" = None) -> None:
+        self._cursor = cursor
+        self._connection = connection
+
+    def execute(self, sql: str, *args: Any, **kwargs: Any) -> Any:
+        self._apply_query_tag()
+        preview = " ".join(str(sql).split())[:SQL_PREVIEW_CHARS]
+        with span("sql", kind="sql", statement=preview) as item:
+            result = self._cursor.execute(sql, *args, **kwargs)
+            if item is not None:
+                rowcount = getattr(self._cursor, "rowcount", None)
+                item.set(
+                    rows=rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+                    query_id=getattr(self._cursor, "sfqid", None),
+                )
+            return result
+
+    def _apply_query_tag(self) -> None:
+        if self._connection is None:
+            return
+        tag = current_query_tag()
+        # None means the session was never tagged, which is the same as no tag.
+        if tag == (self._connection.query_tag or ""):
+            return
+        if tag:
+            self._cursor.execute("ALTER SESSION SET QUERY_TAG = %(query_tag)s", {"query_tag": tag})
+        else:
+            self._cursor.execute("ALTER SESSION UNSET QUERY_TAG")
+        self._connection.query_tag = tag
+
+    def __enter__(self) -> "TracingCursor":
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Any:
+        return self._cursor.__exit__(exc_type, exc, tb)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._cursor)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class TracingConnection:
+    """Connection proxy whose cursors are traced; everything else delegates.
+
+    ``session_tags`` holds the QUERY_TAG last applied per physical
+    connection. A pool passes its own, so a session borrowed again keeps
+    what it already knows instead of re-tagging.
+    """
+
+    def __init__(self, connection: Any, session_tags: dict[int, str] | None = None) -> None:
+        self._connection = connection
+        self._session_tags = session_tags if session_tags is not None else {}
+
+    @property
+    def wrapped(self) -> Any:
+        return self._connection
+
+    @property
+    def query_tag(self) -> str | None:
+        """QUERY_TAG last set on the session, or None if it was never set."""
+        return self._session_tags.get(id(self._connection))
+
+    @query_tag.setter
+    def query_tag(self, tag: str) -> None:
+        self._session_tags[id(self._connection)] = tag
+
+    def cursor(self, *args: Any, **kwargs: Any) -> TracingCursor:
+        return TracingCursor(self._connection.cursor(*args, **kwargs), self)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+
+def traced(connection: Any, session_tags: dict[int, str] | None = None) -> Any:
+    """Wrap a connection for SQL spans (idempotent)."""
+    if isinstance(connection, TracingConnection):
+        return connection
+    return TracingConnection(connection, session_tags)
@@ -0,0 +1,133 @@
+"""Backfill control results over a batch-date range in grouped scans."""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timezone
+from typing import Any
+
+from pipeline.common.raw_columns import snapshot_expressions
+from pipeline.common.snowflake_client import get_connection
+from pipeline.controls.engine import ControlEngine
+from pipeline.controls.handlers import DqLibraryHandler, SqlHandler
+from pipeline.controls.models import ControlContext, ControlDefinition, ControlsSummary
+from pipeline.controls.registry import ControlRegistry
+from pipeline.controls.repository import ControlRepository
+
+
+def raw_batch_dates(
+    conn: Any,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    last_n: int | None = None,
+) -> list[date]:
+    """Return distinct snapshot batch dates present in RAW, oldest first."""
+    batch_expr = snapshot_expressions(conn)["batch_date"]
+    sql = f"""
+      SELECT DISTINCT {batch_expr} AS batch_date
+      FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+      WHERE {batch_expr} IS NOT NULL
+        AND (%(start_date)s IS NULL OR {batch_expr} >= %(start_date)s::DATE)
+        AND (%(end_date)s IS NULL OR {batch_expr} <= %(end_date)s::DATE)
+      ORDER BY batch_date DESC
+    """
+    if last_n is not None:
+        sql += "\n      LIMIT %(last_n)s"
+    with conn.cursor() as cur:
+        cur.execute(
+            sql,
+            {
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None,
+                "last_n": last_n,
+            },
+        )
+        rows = cur.fetchall() or []
+    return sorted(_to_date(row[0]) for row in rows)
+
+
+def build_contexts(conn: Any, run_id_prefix: str, batch_dates: list[date]) -> list[ControlContext]:
+    """Create one control context per batch date, chained by prev_batch_date."""
+    contexts: list[ControlContext] = []
+    previous: date | None = None
+    for batch_date in sorted(batch_dates):
+        contexts.append(
+            ControlContext(
+                run_id=f"{run_id_prefix}_{batch_date.isoformat()}",
+                batch_date=batch_date,
+                files={},
+                loaded_counts={},
+                connection=conn,
+                prev_batch_date=previous,
+            )
+        )
+        previous = batch_date
+    return contexts
+
+
+def evaluate_range(
+    conn: Any,
+    batch_dates: list[date],
+    *,
+    run_id_prefix: str,
+    controls: list[ControlDefinition] | None = None,
+    register_path: str = "rules/controls.yaml",
+    sql_dir: str = "pipeline/controls/sql",
+    persist: bool = True,
+) -> list[ControlsSummary]:
+    """Run the register (or given controls) over many batch dates at once."""
+    engine = ControlEngine(
+        repository=ControlRepository(conn, buffered=True),
+        registry=ControlRegistry(register_path, sql_dir=sql_dir),
+        sql_handler=SqlHandler(sql_dir=sql_dir),
+        dq_library_handler=DqLibraryHandler(),
+    )
+    return engine.run_range(
+        build_contexts(conn, run_id_prefix, batch_dates),
+        controls=controls,
+        register_path=register_path,
+        persist=persist,
+    )
+
+
+def _to_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def main() -> int:
+    """CLI entrypoint: re-evaluate controls for every RAW batch in a range."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--register", default="rules/controls.yaml")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without persisting results")
+    args = parser.parse_args()
+
+    start_date = date.fromisoformat(args.start_date)
+    end_date = date.fromisoformat(args.end_date)
+    run_id_prefix = f"backfill_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
+    with get_connection() as conn:
+        batch_dates = raw_batch_dates(conn, start_date=start_date, end_date=end_date)
+        summaries = evaluate_range(
+            conn,
+            batch_dates,
+            run_id_prefix=run_id_prefix,
+            register_path=args.register,
+            persist=not args.dry_run,
+        )
+    for summary in summaries:
+        print(
+            f"{summary.batch_date} {summary.run_id}: total={summary.total} "
+            f"passed={summary.passed} failed={summary.failed} skipped={summary.skipped} "
+            f"errored={summary.errored} blocking_failures={summary.blocking_failures}"
+        )
+    return 1 if any(summary.blocking_failures for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""Rolling metric baselines for statistical controls (CTRL.METRIC_BASELINE)."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+DEFAULT_WINDOW = 30
+
+
+@dataclass(frozen=True)
+class BaselineState:
+    """Welford accumulator for one metric: sample count, mean and M2."""
+
+    metric_id: str
+    sample_count: int
+    mean: float
+    m2: float
+    last_batch_date: date | None = None
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation (0.0 until two samples exist)."""
+        if self.sample_count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.sample_count - 1))
+
+    def z_score(self, value: float) -> float:
+        """Distance of value from the mean in standard deviations."""
+        deviation = value - self.mean
+        if self.stddev == 0.0:
+            return 0.0 if deviation == 0 else math.inf
+        return abs(deviation) / self.stddev
+
+
+def welford_update(
+    state: BaselineState | None,
+    metric_id: str,
+    value: float,
+    batch_date: date,
+    window: int = DEFAULT_WINDOW,
+) -> BaselineState:
+    """Fold one observation into the baseline.
+
+    Once the window is full, the accumulator is first shrunk to window - 1
+    samples with the same mean and variance, so older batches decay instead
+    of being stored and subtracted individually.
+    """
+    if state is None or state.sample_count == 0:
+        return BaselineState(metric_id, 1, float(value), 0.0, batch_date)
+
+    count = state.sample_count
+    m2 = state.m2
+    keep = max(window - 1, 1)
+    if count > keep:
+        m2 = m2 * (keep - 1) / (count - 1) if count > 1 else 0.0
+        count = keep
+
+    count += 1
+    delta = value - state.mean
+    mean = state.mean + delta / count
+    m2 += delta * (value - mean)
+    return BaselineState(metric_id, count, mean, m2, batch_date)
+
+
+class BaselineStore:
+    """Reads and writes baseline rows with one statement per call."""
+
+    def __init__(self, conn: Any) -> None:
+        self._conn = conn
+
+    def fetch(self, metric_id: str) -> BaselineState | None:
+        states = self.fetch_many([metric_id])
+        return states.get(metric_id)
+
+    def fetch_many(self, metric_ids: list[str]) -> dict[str, BaselineState]:
+        if not metric_ids:
+            return {}
+        placeholders = ", ".join(f"%(metric_{idx})s" for idx in range(len(metric_ids)))
+        sql = f"""
+          SELECT metric_id, sample_count, mean, m2, last_batch_date
+          FROM CTRL.METRIC_BASELINE
+          WHERE metric_id IN ({placeholders})
+        """
+        params = {f"metric_{idx}": metric_id for idx, metric_id in enumerate(metric_ids)}
+        with self._conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall() or []
+        return {
+            str(row[0]): BaselineState(
+                metric_id=str(row[0]),
+                sample_count=int(row[1] or 0),
+                mean=float(row[2] or 0.0),
+                m2=float(row[3] or 0.0),
+                last_batch_date=row[4],
+            )
+            for row in rows
+        }
+
+    def update(
+        self,
+        observations: dict[str, float],
+        batch_date: date,
+        windows: dict[str, int] | None = None,
+    ) -> list[BaselineState]:
+        """Fold one batch of observations into the stored baselines.
+
+        Baselines already updated for this (or a later) batch_date are left
+        untouched, so reruns of a batch do not double count it.
+        """
+        current = self.fetch_many(sorted(observations))
+        updated: list[BaselineState] = []
+        for metric_id, value in sorted(observations.items()):
+            state = current.get(metric_id)
+            if state is not None and state.last_batch_date is not None and state.last_batch_date >= batch_date:
+                continue
+            window = int((windows or {}).get(metric_id, DEFAULT_WINDOW))
+            updated.append(welford_update(state, metric_id, value, batch_date, window))
+        if not updated:
+            return []
+
+        rows: list[str] = []
+        params: dict[str, Any] = {}
+        for idx, state in enumerate(updated):
+            rows.append(
+                f"(%(metric_{idx})s, %(count_{idx})s, %(mean_{idx})s, %(m2_{idx})s, %(batch_date_{idx})s)"
+            )
+            params.update(
+                {
+                    f"metric_{idx}": state.metric_id,
+                    f"count_{idx}": state.sample_count,
+                    f"mean_{idx}": state.mean,
+                    f"m2_{idx}": state.m2,
+                    f"batch_date_{idx}": batch_date.isoformat(),
+                }
+            )
+        sql = f"""
+          MERGE INTO CTRL.METRIC_BASELINE AS tgt
+          USING (
+            SELECT
+              column1 AS metric_id,
+              column2 AS sample_count,
+              column3 AS mean,
+              column4 AS m2,
+              column5::DATE AS last_batch_date
+            FROM VALUES {", ".join(rows)}
+          ) AS src
+          ON tgt.metric_id = src.metric_id
+          WHEN MATCHED AND (tgt.last_batch_date IS NULL OR tgt.last_batch_date < src.last_batch_date) THEN UPDATE SET
+            sample_count = src.sample_count,
+            mean = src.mean,
+            m2 = src.m2,
+            last_batch_date = src.last_batch_date,
+            updated_at = CURRENT_TIMESTAMP()
+          WHEN NOT MATCHED THEN INSERT (
+            metric_id,
+            sample_count,
+            mean,
+            m2,
+            last_batch_date,
+            updated_at
+          ) VALUES (
+            src.metric_id,
+            src.sample_count,
+            src.mean,
+            src.m2,
+            src.last_batch_date,
+            CURRENT_TIMESTAMP()
+          )
+        """
+        with self._conn.cursor() as cur:
+            cur.execute(sql, params)
+        return updated
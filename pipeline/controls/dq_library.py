@@ -0,0 +1,103 @@
+"""DQ library loader and batched COUNT_IF query builder (rules/dq_rules.yaml)."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from pipeline.common.utils import load_yaml
+
+RULE_SQL_PATTERN = re.compile(
+    r"^\s*SELECT\s+COUNT\(\*\)\s+AS\s+fail_count\s+FROM\s+([\w.]+)\s+WHERE\s+(.+?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+# Quoted literals are kept verbatim so column names inside strings are not rewritten.
+_LITERAL_OR_IDENTIFIER = re.compile(r"'(?:[^']|'')*'|\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+# Logical field prefix used in the control SQL context for each RAW table.
+TABLE_FIELD_PREFIX = {
+    "RAW.CLAIMS_SNAPSHOT_NIGHTLY": "snapshot",
+    "RAW.CLAIMS_EVENTS_NIGHTLY": "events",
+}
+
+
+@dataclass(frozen=True)
+class DqRule:
+    """One DQ library rule reduced to its table and failing-row predicate."""
+
+    rule_id: str
+    description: str
+    severity: str
+    table: str
+    predicate: str
+
+
+def load_dq_rules(path: str | Path = "rules/dq_rules.yaml") -> list[DqRule]:
+    """Parse DQ library rules into table/predicate pairs."""
+    payload = load_yaml(path)
+    items = payload.get("dq_library", [])
+    if not isinstance(items, list):
+        raise ValueError(f"{path} dq_library must be a list")
+
+    rules: list[DqRule] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        rule_id = str(item.get("rule_id") or "").strip()
+        if not rule_id:
+            continue
+        match = RULE_SQL_PATTERN.match(str(item.get("sql") or ""))
+        if match is None:
+            raise ValueError(
+                f"DQ rule {rule_id} must be 'SELECT COUNT(*) AS fail_count FROM <table> WHERE <predicate>'"
+            )
+        rules.append(
+            DqRule(
+                rule_id=rule_id,
+                description=str(item.get("description", rule_id)),
+                severity=str(item.get("severity", "WARN")).strip().upper(),
+                table=match.group(1).upper(),
+                predicate=" ".join(match.group(2).split()),
+            )
+        )
+    return rules
+
+
+def rewrite_predicate(predicate: str, expressions: dict[str, str]) -> str:
+    """Replace logical column names with layout-specific SQL expressions."""
+    lookup = {key.lower(): value for key, value in expressions.items()}
+
+    def _replace(match: re.Match[str]) -> str:
+        token = match.group(0)
+        if token.startswith("'"):
+            return token
+        expression = lookup.get(token.lower())
+        return f"({expression})" if expression is not None else token
+
+    return _LITERAL_OR_IDENTIFIER.sub(_replace, predicate)
+
+
+def build_batch_query(table: str, rules: list[DqRule], expressions: dict[str, str]) -> str:
+    """Return one batch-scoped scan with a COUNT_IF column per rule."""
+    columns = ["COUNT(*) AS total_count"]
+    for rule in rules:
+        columns.append(
+            f"COUNT_IF({rewrite_predicate(rule.predicate, expressions)}) AS {rule.rule_id}"
+        )
+    select_list = ",\n  ".join(columns)
+    return (
+        f"SELECT\n  {select_list}\n"
+        f"FROM {table}\n"
+        f"WHERE {expressions['batch_date']} = %(batch_date)s::DATE"
+    )
+
+
+def group_rules_by_table(rules: list[DqRule]) -> dict[str, list[DqRule]]:
+    """Group rules by source table, preserving register order."""
+    grouped: dict[str, list[DqRule]] = {}
+    for rule in rules:
+        if rule.table not in TABLE_FIELD_PREFIX:
+            raise ValueError(f"DQ rule {rule.rule_id} targets unsupported table {rule.table}")
+        grouped.setdefault(rule.table, []).append(rule)
+    return grouped
@@ -2,12 +2,49 @@
 
 from __future__ import annotations
 
-from pipeline.controls.handlers import GateHandler, PrecheckHandler, SqlHandler
+import time
+from datetime import date
+
+from pipeline.common.logging import log_context
+from pipeline.common.metrics import CONTROL_DURATION, CONTROL_RESULTS
+from pipeline.common.tracing import span
+from pipeline.controls.handlers import (
+    DqLibraryHandler,
+    GateHandler,
+    PrecheckHandler,
+    SqlHandler,
+    StatisticalHandler,
+)
 from pipeline.controls.models import ControlContext, ControlResult, ControlsSummary
 from pipeline.controls.registry import ControlRegistry
 from pipeline.controls.repository import ControlRepository
 
 
+def build_summary(run_id: str, batch_date: date, results: list[ControlResult]) -> ControlsSummary:
+    """Aggregate result rows into the summary used for gating."""
+    blocking_failures = sum(
+        1 for result in results if result.blocking and result.status in {"FAIL", "ERROR"}
+    )
+    return ControlsSummary(
+        run_id=run_id,
+        batch_date=batch_date,
+        total=len(results),
+        passed=sum(1 for item in results if item.status == "PASS"),
+        failed=sum(1 for item in results if item.status == "FAIL"),
+        skipped=sum(1 for item in results if item.status == "SKIP"),
+        errored=sum(1 for item in results if item.status == "ERROR"),
+        blocking_failures=blocking_failures,
+        results=results,
+    )
+
+
+def _record_metrics(control_id: str, started: float, produced: list[ControlResult]) -> None:
+    """Record one evaluated control's duration and result statuses."""
+    CONTROL_DURATION.observe(time.perf_counter() - started, control_id=control_id)
+    for result in produced:
+        CONTROL_RESULTS.inc(control_id=result.control_id, status=result.status)
+
+
 class ControlEngine:
     """Executes enabled controls in register order and persists all results."""
 
@@ -18,12 +55,16 @@ class ControlEngine:
         precheck_handler: PrecheckHandler | None = None,
         sql_handler: SqlHandler | None = None,
         gate_handler: GateHandler | None = None,
+        dq_library_handler: DqLibraryHandler | None = None,
+        statistical_handler: StatisticalHandler | None = None,
     ) -> None:
         self._registry = registry or ControlRegistry()
         self._repository = repository
         self._precheck_handler = precheck_handler or PrecheckHandler()
         self._sql_handler = sql_handler or SqlHandler()
         self._gate_handler = gate_handler or GateHandler()
+        self._dq_library_handler = dq_library_handler or DqLibraryHandler()
+        self._statistical_handler = statistical_handler or StatisticalHandler()
 
     def run(
         self,
@@ -55,26 +96,29 @@ class ControlEngine:
                 results.append(result)
                 continue
 
+            started = time.perf_counter()
             try:
-                if control.type == "precheck":
-                    result = self._precheck_handler.handle(control, context)
-                else:
-                    result = self._sql_handler.handle(control, context)
+                produced = self._dispatch(control, context)
             except Exception as exc:  # pragma: no cover - defensive runtime guard
-                result = ControlResult(
-                    run_id=context.run_id,
-                    batch_date=context.batch_date,
-                    control_id=control.control_id,
-                    status="ERROR",
-                    blocking=control.blocking,
-                    severity=control.severity,
-                    type=control.type,
-                    fail_count=1,
-                    details=str(exc),
-                )
+                produced = [
+                    ControlResult(
+                        run_id=context.run_id,
+                        batch_date=context.batch_date,
+                        control_id=control.control_id,
+                        status="ERROR",
+                        blocking=control.blocking,
+                        severity=control.severity,
+                        type=control.type,
+                        fail_count=1,
+                        details=str(exc),
+                    )
+                ]
 
-            self._repository.persist(result)
-            results.append(result)
+            _record_metrics(control.control_id, started, produced)
+
+            for result in produced:
+                self._repository.persist(result)
+                results.append(result)
 
         for control in gate_controls:
             if not control.enabled:
@@ -93,8 +137,10 @@ class ControlEngine:
                 results.append(result)
                 continue
 
+            started = time.perf_counter()
             try:
-                result = self._gate_handler.handle(control, context, results)
+                with span(control.control_id, kind="control", control_type="gate"):
+                    result = self._gate_handler.handle(control, context, results)
             except Exception as exc:  # pragma: no cover - defensive runtime guard
                 result = ControlResult(
                     run_id=context.run_id,
@@ -107,23 +153,115 @@ class ControlEngine:
                     fail_count=1,
                     details=str(exc),
                 )
+            _record_metrics(control.control_id, started, [result])
             self._repository.persist(result)
             results.append(result)
 
-        blocking_failures = sum(
-            1 for result in results if result.blocking and result.status in {"FAIL", "ERROR"}
-        )
-        return ControlsSummary(
-            run_id=context.run_id,
-            batch_date=context.batch_date,
-            total=len(results),
-            passed=sum(1 for item in results if item.status == "PASS"),
-            failed=sum(1 for item in results if item.status == "FAIL"),
-            skipped=sum(1 for item in results if item.status == "SKIP"),
-            errored=sum(1 for item in results if item.status == "ERROR"),
-            blocking_failures=blocking_failures,
-            results=results,
-        )
+        # Buffered repositories write every result in one request here.
+        self._repository.flush()
+        return build_summary(context.run_id, context.batch_date, results)
+
+    def _dispatch(self, control, context: ControlContext) -> list[ControlResult]:
+        """Run one non-gate control inside a ``control`` tracing span."""
+        with (
+            log_context(control_id=control.control_id),
+            span(control.control_id, kind="control", control_type=control.type) as control_span,
+        ):
+            if control.type == "precheck":
+                produced = [self._precheck_handler.handle(control, context)]
+            elif control.type == "dq_library":
+                # One library control expands into a result per DQ rule.
+                produced = self._dq_library_handler.handle(control, context)
+            elif control.type == "statistical":
+                produced = [self._statistical_handler.handle(control, context)]
+            else:
+                produced = [self._sql_handler.handle(control, context)]
+            if control_span is not None:
+                control_span.set(
+                    status=",".join(sorted({result.status for result in produced})),
+                    fail_count=sum(result.fail_count for result in produced),
+                )
+            return produced
+
+    def run_range(
+        self,
+        contexts: list[ControlContext],
+        *,
+        controls: list | None = None,
+        register_path: str | None = None,
+        persist: bool = True,
+    ) -> list[ControlsSummary]:
+        """Evaluate controls for many batch dates, one grouped scan per SQL control.
+
+        dq_library controls are not grouped: their rules still run once per
+        batch date. Precheck and statistical controls depend on landed files
+        and the current baseline respectively, so they are recorded as SKIP
+        here. A control or gate that raises is recorded as ERROR for the
+        affected dates instead of aborting the range.
+        """
+        definitions = controls if controls is not None else self._registry.load(register_path)
+        results_by_date: dict[date, list[ControlResult]] = {
+            context.batch_date: [] for context in contexts
+        }
+
+        for control in definitions:
+            if control.type == "gate":
+                continue
+            if not control.enabled or control.type in {"precheck", "statistical"}:
+                reason = (
+                    "Control disabled in register"
+                    if not control.enabled
+                    else "Not evaluated in multi-date mode"
+                )
+                produced = [
+                    _skip_result(context, control, reason) for context in contexts
+                ]
+            else:
+                try:
+                    with span(
+                        control.control_id,
+                        kind="control",
+                        control_type=control.type,
+                        batch_dates=len(contexts),
+                    ) as control_span:
+                        if control.type == "dq_library":
+                            produced = [
+                                result
+                                for context in contexts
+                                for result in self._dq_library_handler.handle(control, context)
+                            ]
+                        else:
+                            produced = self._sql_handler.handle_range(control, contexts, persist=persist)
+                        if control_span is not None:
+                            control_span.set(results=len(produced))
+                except Exception as exc:  # pragma: no cover - defensive runtime guard
+                    produced = [_error_result(context, control, str(exc)) for context in contexts]
+            for result in produced:
+                results_by_date[result.batch_date].append(result)
+
+        gate_controls = [control for control in definitions if control.type == "gate"]
+        for context in contexts:
+            prior = results_by_date[context.batch_date]
+            for control in gate_controls:
+                if not control.enabled:
+                    prior.append(_skip_result(context, control, "Control disabled in register"))
+                    continue
+                try:
+                    result = self._gate_handler.handle(control, context, list(prior))
+                except Exception as exc:
+                    result = _error_result(context, control, str(exc))
+                prior.append(result)
+
+        summaries: list[ControlsSummary] = []
+        for context in contexts:
+            results = results_by_date[context.batch_date]
+            if persist:
+                for result in results:
+                    self._repository.persist(result)
+            summaries.append(build_summary(context.run_id, context.batch_date, results))
+        if persist:
+            self._repository.flush()
+        return summaries
 
     def run_results(
         self,
@@ -132,3 +270,31 @@ class ControlEngine:
     ) -> list[ControlResult]:
         """Compatibility helper that returns only result rows."""
         return self.run(context, controls=controls).results
+
+
+def _error_result(context: ControlContext, control, details: str) -> ControlResult:
+    return ControlResult(
+        run_id=context.run_id,
+        batch_date=context.batch_date,
+        control_id=control.control_id,
+        status="ERROR",
+        blocking=control.blocking,
+        severity=control.severity,
+        type=control.type,
+        fail_count=1,
+        details=details,
+    )
+
+
+def _skip_result(context: ControlContext, control, details: str) -> ControlResult:
+    return ControlResult(
+        run_id=context.run_id,
+        batch_date=context.batch_date,
+        control_id=control.control_id,
+        status="SKIP",
+        blocking=control.blocking,
+        severity=control.severity,
+        type=control.type,
+        fail_count=0,
+        details=details,
+    )
@@ -1,8 +1,10 @@
 """Control handlers by control type."""
 
+from .dq_library_handler import DqLibraryHandler
 from .gate_handler import GateHandler
 from .precheck_handler import PrecheckHandler, PrecheckRowcountHandler
 from .sql_handler import SqlControlHandler, SqlHandler
+from .statistical_handler import StatisticalHandler
 
 __all__ = [
     "PrecheckHandler",
@@ -10,4 +12,6 @@ __all__ = [
     "SqlHandler",
     "SqlControlHandler",
     "GateHandler",
+    "DqLibraryHandler",
+    "StatisticalHandler",
 ]
@@ -4,39 +4,13 @@ from __future__ import annotations
 
 from typing import Any
 
+from pipeline.common.datasets import DATASETS_PATH, load_feeds
 from pipeline.common.snowflake_client import execute_scalar
 from pipeline.common.utils import csv_row_count
 from pipeline.controls.models import ControlContext, ControlDefinition, ControlResult
 from pipeline.ingest.load_to_snowflake import validate_headers
 from pipeline.ingest.schema_validate import validate_csv_against_schema
 
-SNAPSHOT_REQUIRED_HEADERS = [
-    "batch_date",
-    "claim_id",
-    "policy_id",
-    "customer_id",
-    "claim_amount_incurred",
-    "paid_amount_to_date",
-    "reserve_amount",
-    "loss_date",
-    "report_date",
-    "claim_status",
-    "pii_class",
-]
-
-EVENTS_REQUIRED_HEADERS = [
-    "batch_date",
-    "claim_id",
-    "event_ts",
-    "event_type",
-    "old_status",
-    "new_status",
-    "amount_delta",
-    "currency",
-    "source_system",
-    "note",
-]
-
 
 class PrecheckHandler:
     """Executes precheck controls."""
@@ -58,41 +32,24 @@ class PrecheckHandler:
         params = control.params or {}
         errors: list[str] = []
         failed_checks = 0
-        snapshot_file = context.files.get("snapshot")
-        events_file = context.files.get("events")
-        if snapshot_file is None:
-            errors.append("Missing snapshot file reference")
-            failed_checks += 1
-        if events_file is None:
-            errors.append("Missing events file reference")
-            failed_checks += 1
-
-        snapshot_headers = params.get("snapshot_required_headers", SNAPSHOT_REQUIRED_HEADERS)
-        events_headers = params.get("events_required_headers", EVENTS_REQUIRED_HEADERS)
-        snapshot_schema = str(params.get("snapshot_schema", "schemas/claims_snapshot_schema.json"))
-        events_schema = str(params.get("events_schema", "schemas/claims_events_schema.json"))
-
-        if snapshot_file is not None:
-            before = len(errors)
-            try:
-                validate_headers(snapshot_file, list(snapshot_headers))
-            except ValueError as exc:
-                errors.append(str(exc))
-            snapshot_validation = validate_csv_against_schema(snapshot_file, snapshot_schema)
-            if not snapshot_validation.valid:
-                errors.extend(snapshot_validation.errors[:5])
-            if len(errors) > before:
+        feeds = load_feeds(str(params.get("datasets_path", DATASETS_PATH)))
+        for feed in feeds:
+            file_path = context.files.get(feed.name)
+            if file_path is None:
+                errors.append(f"Missing {feed.name} file reference")
                 failed_checks += 1
-
-        if events_file is not None:
+                continue
+            # Register params (<feed>_required_headers, <feed>_schema) override the feed registry.
+            headers = params.get(f"{feed.name}_required_headers", feed.required_headers)
+            schema_path = str(params.get(f"{feed.name}_schema", feed.schema_path))
             before = len(errors)
             try:
-                validate_headers(events_file, list(events_headers))
+                validate_headers(file_path, list(headers))
             except ValueError as exc:
                 errors.append(str(exc))
-            events_validation = validate_csv_against_schema(events_file, events_schema)
-            if not events_validation.valid:
-                errors.extend(events_validation.errors[:5])
+            validation = validate_csv_against_schema(file_path, schema_path)
+            if not validation.valid:
+                errors.extend(validation.errors[:5])
             if len(errors) > before:
                 failed_checks += 1
 
@@ -104,25 +61,27 @@ class PrecheckHandler:
             blocking=control.blocking,
             severity=control.severity,
             type="precheck",
-            total_count=2,
+            total_count=len(feeds),
             fail_count=failed_checks,
             details="; ".join(errors[:5]) if errors else "Headers and schema validation passed",
         )
 
     def _c3_recon_rowcount(self, control: ControlDefinition, context: ControlContext) -> ControlResult:
+        params = control.params or {}
+        feeds = load_feeds(str(params.get("datasets_path", DATASETS_PATH)))
         mismatches: list[str] = []
         total_variance = 0.0
-        for dataset in ("snapshot", "events"):
-            file_path = context.files.get(dataset)
+        for feed in feeds:
+            file_path = context.files.get(feed.name)
             if file_path is None:
-                mismatches.append(f"{dataset}: missing file reference")
+                mismatches.append(f"{feed.name}: missing file reference")
                 continue
             expected = csv_row_count(file_path)
-            actual = int(context.loaded_counts.get(dataset, -1))
+            actual = int(context.loaded_counts.get(feed.name, -1))
             diff = actual - expected
             total_variance += abs(diff)
             if diff != 0:
-                mismatches.append(f"{dataset}: expected {expected}, loaded {actual}")
+                mismatches.append(f"{feed.name}: expected {expected}, loaded {actual}")
 
         return ControlResult(
             run_id=context.run_id,
@@ -132,7 +91,7 @@ class PrecheckHandler:
             blocking=control.blocking,
             severity=control.severity,
             type="precheck",
-            total_count=2,
+            total_count=len(feeds),
             fail_count=len(mismatches),
             variance=total_variance,
             details="; ".join(mismatches) if mismatches else "File/RAW rowcounts reconciled",
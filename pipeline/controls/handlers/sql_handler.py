@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import hashlib
 import re
+from dataclasses import replace
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
 from pipeline.common.raw_columns import events_expressions, snapshot_expressions
 from pipeline.controls.models import ControlContext, ControlDefinition, ControlResult
+from pipeline.controls.multi_date import rewrite_for_date_range
+from pipeline.controls.register_cache import default_register_cache
 
 
 class SqlHandler:
@@ -21,16 +25,7 @@ class SqlHandler:
         sql_template = self._load_sql_text(control)
         sql_context = self._build_sql_context(context.connection)
         rendered_sql = self._render_sql(sql_template, sql_context)
-        params: dict[str, Any] = {
-            "run_id": context.run_id,
-            "batch_date": context.batch_date.isoformat(),
-            "prev_batch_date": context.prev_batch_date.isoformat()
-            if context.prev_batch_date else None,
-            "threshold": control.threshold,
-        }
-        for key, value in (control.params or {}).items():
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                params[key] = value
+        params = self._build_params(control, context)
 
         with context.connection.cursor() as cur:
             cur.execute(rendered_sql, params)
@@ -41,6 +36,100 @@ class SqlHandler:
             raise ValueError(f"Control {control.control_id} returned no rows")
 
         payload = {str(col[0]).lower(): row[idx] for idx, col in enumerate(description)}
+        result = self._result_from_payload(control, context, payload, rendered_sql)
+        if control.exceptions_sql and result.status == "FAIL":
+            self._capture_exceptions(control, context, sql_context, params)
+        return result
+
+    def handle_range(
+        self,
+        control: ControlDefinition,
+        contexts: list[ControlContext],
+        *,
+        persist: bool = True,
+    ) -> list[ControlResult]:
+        """Evaluate one control for many batch dates with a single grouped query.
+
+        Controls whose SQL cannot be rewritten (and have no range_sql_path)
+        fall back to one execution per batch date. Exceptions are sampled per
+        failing date, and only when ``persist`` is set.
+        """
+        if not contexts:
+            return []
+        template = self._load_range_sql_text(control)
+        if template is None:
+            if not persist:
+                # Evidence from an unpersisted evaluation must never land in CTRL.EXCEPTIONS.
+                control = replace(control, exceptions_sql=None)
+            return [self.handle(control, context) for context in contexts]
+
+        first = contexts[0]
+        sql_context = self._build_sql_context(first.connection)
+        rendered_sql = self._render_sql(template, sql_context)
+        batch_dates = sorted(context.batch_date for context in contexts)
+        params = self._build_params(control, first)
+        params["start_date"] = batch_dates[0].isoformat()
+        params["end_date"] = batch_dates[-1].isoformat()
+
+        with first.connection.cursor() as cur:
+            cur.execute(rendered_sql, params)
+            rows = cur.fetchall() or []
+            description = cur.description or []
+
+        payload_by_date: dict[date, dict[str, Any]] = {}
+        for row in rows:
+            payload = {str(col[0]).lower(): row[idx] for idx, col in enumerate(description)}
+            payload_by_date[_as_date(payload["batch_date"])] = payload
+
+        results: list[ControlResult] = []
+        for context in contexts:
+            payload = payload_by_date.get(context.batch_date)
+            if payload is None:
+                results.append(
+                    ControlResult(
+                        run_id=context.run_id,
+                        batch_date=context.batch_date,
+                        control_id=control.control_id,
+                        status="SKIP",
+                        blocking=control.blocking,
+                        severity=control.severity,
+                        type="sql",
+                        total_count=0,
+                        fail_count=0,
+                        details="No RAW rows for batch_date in evaluated range",
+                    )
+                )
+                continue
+            result = self._result_from_payload(control, context, payload, rendered_sql)
+            if persist and control.exceptions_sql and result.status == "FAIL":
+                self._capture_exceptions(control, context, sql_context, self._build_params(control, context))
+            results.append(result)
+        return results
+
+    def execute(self, ctx: ControlContext, control: ControlDefinition) -> ControlResult:
+        """Alias matching the strategy signature in the design spec."""
+        return self.handle(control, ctx)
+
+    def _build_params(self, control: ControlDefinition, context: ControlContext) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "run_id": context.run_id,
+            "batch_date": context.batch_date.isoformat(),
+            "prev_batch_date": context.prev_batch_date.isoformat()
+            if context.prev_batch_date else None,
+            "threshold": control.threshold,
+        }
+        for key, value in (control.params or {}).items():
+            if isinstance(value, (str, int, float, bool)) or value is None:
+                params[key] = value
+        return params
+
+    def _result_from_payload(
+        self,
+        control: ControlDefinition,
+        context: ControlContext,
+        payload: dict[str, Any],
+        rendered_sql: str,
+    ) -> ControlResult:
         total_count_raw = payload.get("total_count")
         total_count = int(total_count_raw) if total_count_raw is not None else None
         fail_count = int(payload.get("fail_count") or payload.get("control_value") or 0)
@@ -65,21 +154,74 @@ class SqlHandler:
             executed_sql_hash=hashlib.sha256(rendered_sql.encode("utf-8")).hexdigest(),
         )
 
-    def execute(self, ctx: ControlContext, control: ControlDefinition) -> ControlResult:
-        """Alias matching the strategy signature in the design spec."""
-        return self.handle(control, ctx)
+    def _capture_exceptions(
+        self,
+        control: ControlDefinition,
+        context: ControlContext,
+        sql_context: dict[str, str],
+        params: dict[str, Any],
+    ) -> None:
+        """Copy a bounded sample of failing rows into CTRL.EXCEPTIONS server-side."""
+        template = self._read_sql_file(str(control.exceptions_sql))
+        # The sample query is embedded as a subquery, so drop its statement terminator.
+        rendered_sql = self._render_sql(template, sql_context).strip().rstrip(";")
+        insert_sql = f"""
+          INSERT INTO CTRL.EXCEPTIONS (
+            run_id,
+            batch_date,
+            control_id,
+            claim_id,
+            src_file_row_number,
+            error_message,
+            severity,
+            recorded_ts
+          )
+          SELECT
+            %(run_id)s,
+            %(batch_date)s::DATE,
+            %(control_id)s,
+            exc.claim_id,
+            exc.src_file_row_number,
+            exc.error_message,
+            %(severity)s,
+            CURRENT_TIMESTAMP()
+          FROM (
+            {rendered_sql}
+          ) AS exc
+          ORDER BY exc.src_file_row_number
+          LIMIT %(exceptions_limit)s
+        """
+        insert_params = {
+            **params,
+            "control_id": control.control_id,
+            "severity": control.severity,
+            "exceptions_limit": int(control.exceptions_limit),
+        }
+        with context.connection.cursor() as cur:
+            cur.execute(insert_sql, insert_params)
 
     def _load_sql_text(self, control: ControlDefinition) -> str:
         if control.sql_path:
-            root = Path(self._sql_dir).resolve()
-            file_path = (root / control.sql_path).resolve()
-            if root not in file_path.parents and file_path != root:
-                raise ValueError(f"Invalid sql_path outside sql_dir: {control.sql_path}")
-            return file_path.read_text(encoding="utf-8")
+            return self._read_sql_file(control.sql_path)
         if control.query:
             return control.query
         raise ValueError(f"SQL control {control.control_id} missing sql_path/query")
 
+    def _load_range_sql_text(self, control: ControlDefinition) -> str | None:
+        if control.range_sql_path:
+            return self._read_sql_file(control.range_sql_path)
+        try:
+            return rewrite_for_date_range(self._load_sql_text(control))
+        except ValueError:
+            return None
+
+    def _read_sql_file(self, sql_path: str) -> str:
+        root = Path(self._sql_dir).resolve()
+        file_path = (root / sql_path).resolve()
+        if root not in file_path.parents and file_path != root:
+            raise ValueError(f"Invalid sql_path outside sql_dir: {sql_path}")
+        return default_register_cache.sql_text(file_path)
+
     def _build_sql_context(self, conn: Any) -> dict[str, str]:
         return {
             **{f"snapshot_{k}": v for k, v in snapshot_expressions(conn).items()},
@@ -98,5 +240,13 @@ class SqlHandler:
         return rendered
 
 
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
 class SqlControlHandler(SqlHandler):
     """Name-compatible class matching the proposed architecture."""
@@ -0,0 +1,74 @@
+"""Statistical drift control handler."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+
+from pipeline.controls.baseline import DEFAULT_WINDOW, BaselineStore
+from pipeline.controls.handlers.sql_handler import SqlHandler
+from pipeline.controls.models import ControlContext, ControlDefinition, ControlResult
+
+
+class StatisticalHandler(SqlHandler):
+    """Compares a batch metric against its precomputed rolling baseline.
+
+    The control SQL returns a single ``metric_value`` for the batch; the
+    baseline (count/mean/M2) is one primary-key lookup, so the check never
+    rescans history. Baselines are advanced at run end, not here.
+    """
+
+    def handle(self, control: ControlDefinition, context: ControlContext) -> ControlResult:
+        params = control.params or {}
+        sigma = float(params.get("sigma", 3.0))
+        min_samples = int(params.get("min_samples", 7))
+        window = int(params.get("window", DEFAULT_WINDOW))
+
+        rendered_sql = self._render_sql(
+            self._load_sql_text(control),
+            self._build_sql_context(context.connection),
+        )
+        with context.connection.cursor() as cur:
+            cur.execute(rendered_sql, {"batch_date": context.batch_date.isoformat()})
+            row = cur.fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"Control {control.control_id} returned no metric_value")
+        metric_value = float(row[0])
+
+        baseline = BaselineStore(context.connection).fetch(control.control_id)
+        samples = baseline.sample_count if baseline is not None else 0
+        notes: list[str] = []
+        if baseline is not None and context.prev_batch_date is not None and (
+            baseline.last_batch_date is None or baseline.last_batch_date < context.prev_batch_date
+        ):
+            notes.append(f"baseline last advanced {baseline.last_batch_date}, expected {context.prev_batch_date}")
+
+        if baseline is None or samples < min_samples:
+            status = "SKIP"
+            variance = None
+            summary = f"metric={metric_value:g}; baseline warming up ({samples}/{min_samples} samples)"
+        else:
+            z_score = baseline.z_score(metric_value)
+            status = "FAIL" if z_score > sigma else "PASS"
+            variance = metric_value - baseline.mean
+            z_text = "inf" if math.isinf(z_score) else f"{z_score:.2f}"
+            summary = (
+                f"metric={metric_value:g}; mean={baseline.mean:g}; stddev={baseline.stddev:g}; "
+                f"z={z_text} vs {sigma:g} sigma over {min(samples, window)} batches"
+            )
+
+        return ControlResult(
+            run_id=context.run_id,
+            batch_date=context.batch_date,
+            control_id=control.control_id,
+            status=status,  # type: ignore[arg-type]
+            blocking=control.blocking,
+            severity=control.severity,
+            type="statistical",
+            total_count=samples,
+            fail_count=1 if status == "FAIL" else 0,
+            variance=variance,
+            details="; ".join([summary, *notes]),
+            executed_sql_hash=hashlib.sha256(rendered_sql.encode("utf-8")).hexdigest(),
+            metric_value=metric_value,
+        )
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Any, Literal
 
 
-ControlType = Literal["precheck", "sql", "gate"]
+ControlType = Literal["precheck", "sql", "gate", "dq_library", "statistical"]
 ControlStatus = Literal["PASS", "FAIL", "ERROR", "SKIP"]
 
 
@@ -26,6 +26,9 @@ class ControlDefinition:
     params: dict[str, Any]
     threshold: float = 0.0
     query: str | None = None
+    exceptions_sql: str | None = None
+    exceptions_limit: int = 100
+    range_sql_path: str | None = None
 
 
 @dataclass(frozen=True)
@@ -57,6 +60,7 @@ class ControlResult:
     details: str | None = None
     executed_sql_hash: str | None = None
     executed_at: datetime = field(default_factory=datetime.utcnow)
+    metric_value: float | None = None
 
 
 @dataclass(frozen=True)
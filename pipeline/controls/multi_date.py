@@ -0,0 +1,47 @@
+"""Rewrite single-batch control SQL into one grouped multi-date query."""
+
+from __future__ import annotations
+
+import re
+
+BATCH_FILTER_PATTERN = re.compile(
+    r"(\{\{\w+_batch_date\}\})\s*=\s*%\(batch_date\)s::DATE",
+    re.IGNORECASE,
+)
+# Shapes the textual rewrite cannot group safely; such controls need range_sql_path.
+_UNSUPPORTED_PATTERN = re.compile(
+    r"\bWITH\b|\bGROUP\s+BY\b|\bQUALIFY\b|\bUNION\b|\bLIMIT\b|\bOVER\s*\(",
+    re.IGNORECASE,
+)
+
+_STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+
+
+def rewrite_for_date_range(template: str) -> str:
+    """Turn a batch-scoped aggregate template into a GROUP BY batch_date query.
+
+    Supported templates are a single ``SELECT <aggregates> FROM ... WHERE``
+    whose only batch filter is ``{{<dataset>_batch_date}} = %(batch_date)s::DATE``.
+    The filter becomes a ``%(start_date)s``/``%(end_date)s`` range and the
+    batch date expression is added as the leading ``batch_date`` column.
+    """
+    lines = [line for line in template.splitlines() if not line.strip().startswith("--")]
+    sql = "\n".join(lines).strip().rstrip(";").strip()
+    if not re.match(r"SELECT\b", sql, re.IGNORECASE):
+        raise ValueError("Only single SELECT control templates can be rewritten")
+    # Keywords inside string literals (e.g. details text) do not change the shape.
+    code = _STRING_LITERAL_PATTERN.sub("''", sql)
+    if len(re.findall(r"\bSELECT\b", code, re.IGNORECASE)) != 1 or _UNSUPPORTED_PATTERN.search(code):
+        raise ValueError("Control template shape is not supported for multi-date rewrite")
+
+    filters = BATCH_FILTER_PATTERN.findall(sql)
+    if len(filters) != 1:
+        raise ValueError("Control template must contain exactly one batch_date filter")
+    batch_expr = filters[0]
+
+    sql = BATCH_FILTER_PATTERN.sub(
+        f"{batch_expr} BETWEEN %(start_date)s::DATE AND %(end_date)s::DATE",
+        sql,
+    )
+    sql = re.sub(r"^SELECT\b", f"SELECT\n  {batch_expr} AS batch_date,", sql, count=1, flags=re.IGNORECASE)
+    return f"{sql}\nGROUP BY {batch_expr}"
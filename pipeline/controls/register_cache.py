@@ -0,0 +1,220 @@
+"""Compiled control register snapshots cached in memory and on disk."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from pipeline.controls.models import ControlDefinition
+
+# Bump when the on-disk snapshot layout changes so stale files are ignored.
+CACHE_FORMAT_VERSION = 3
+
+
+@dataclass(frozen=True)
+class CompiledRegister:
+    """Validated register plus the SQL templates its controls reference."""
+
+    source_path: str
+    content_hash: str
+    payload: dict[str, Any]
+    definitions: tuple[ControlDefinition, ...]
+    sql_texts: dict[str, str]
+
+
+Compiler = Callable[[dict[str, Any]], list[ControlDefinition]]
+_Fingerprint = tuple[tuple[str, int, int], ...]
+
+
+class RegisterCache:
+    """Caches compiled registers keyed by register content hash.
+
+    The in-memory fast path only stats the register and its SQL files; the
+    YAML is re-read and re-validated when any of them change on disk. SQL
+    handlers read templates from the compiled registers through ``sql_text``.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = "artifacts/cache/controls") -> None:
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], tuple[_Fingerprint, CompiledRegister]] = {}
+        # Resolved SQL file path -> template text, across every compiled register.
+        self._sql_index: dict[str, str] = {}
+
+    def get(self, register_path: str | Path, sql_dir: str | Path, compiler: Compiler) -> CompiledRegister:
+        """Return the compiled register, recompiling only when files changed."""
+        register = Path(register_path).resolve()
+        sql_root = Path(sql_dir).resolve()
+        key = (str(register), str(sql_root))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._fingerprint(register, sql_root, entry[1]):
+                return entry[1]
+
+            content = register.read_bytes()
+            content_hash = hashlib.sha256(content).hexdigest()
+            compiled = None
+            if entry is not None and entry[1].content_hash == content_hash:
+                compiled = self._refresh_sql(entry[1], sql_root)
+            if compiled is None:
+                compiled = self._load_snapshot(content_hash, register, sql_root)
+            if compiled is None:
+                compiled = self._compile(register, sql_root, content, content_hash, compiler)
+                self._write_snapshot(compiled)
+            self._entries[key] = (self._fingerprint(register, sql_root, compiled), compiled)
+            self._index_sql()
+            return compiled
+
+    def sql_text(self, path: str | Path) -> str:
+        """Return a SQL template as of its register's last ``get``.
+
+        Files no compiled register references are read from disk.
+        """
+        file_path = Path(path).resolve()
+        with self._lock:
+            text = self._sql_index.get(str(file_path))
+        if text is not None:
+            return text
+        return file_path.read_text(encoding="utf-8")
+
+    def clear(self) -> None:
+        """Drop in-memory entries (on-disk snapshots are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._sql_index.clear()
+
+    def _index_sql(self) -> None:
+        self._sql_index = {
+            str((Path(sql_root) / name).resolve()): text
+            for (_register, sql_root), (_fingerprint, compiled) in self._entries.items()
+            for name, text in compiled.sql_texts.items()
+        }
+
+    def _compile(
+        self,
+        register: Path,
+        sql_root: Path,
+        content: bytes,
+        content_hash: str,
+        compiler: Compiler,
+    ) -> CompiledRegister:
+        payload = yaml.safe_load(content.decode("utf-8")) or {}
+        if not isinstance(payload, dict):
+            raise ValueError("rules/controls.yaml must contain a mapping")
+        definitions = tuple(compiler(payload))
+        sql_texts: dict[str, str] = {}
+        for name in _referenced_sql_files(definitions):
+            file_path = sql_root / name
+            if file_path.is_file():
+                sql_texts[name] = file_path.read_text(encoding="utf-8")
+        return CompiledRegister(
+            source_path=str(register),
+            content_hash=content_hash,
+            payload=payload,
+            definitions=definitions,
+            sql_texts=sql_texts,
+        )
+
+    def _refresh_sql(self, compiled: CompiledRegister, sql_root: Path) -> CompiledRegister | None:
+        """Re-read SQL templates for an unchanged register; None if files went missing."""
+        sql_texts: dict[str, str] = {}
+        for name in compiled.sql_texts:
+            file_path = sql_root / name
+            if not file_path.is_file():
+                return None
+            sql_texts[name] = file_path.read_text(encoding="utf-8")
+        return CompiledRegister(
+            source_path=compiled.source_path,
+            content_hash=compiled.content_hash,
+            payload=compiled.payload,
+            definitions=compiled.definitions,
+            sql_texts=sql_texts,
+        )
+
+    def _fingerprint(self, register: Path, sql_root: Path, compiled: CompiledRegister) -> _Fingerprint:
+        paths = [register, *(sql_root / name for name in sorted(compiled.sql_texts))]
+        fingerprint: list[tuple[str, int, int]] = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                fingerprint.append((str(path), -1, -1))
+                continue
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def _snapshot_path(self, content_hash: str) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f"register_{content_hash}.json"
+
+    def _load_snapshot(self, content_hash: str, register: Path, sql_root: Path) -> CompiledRegister | None:
+        snapshot_path = self._snapshot_path(content_hash)
+        if snapshot_path is None or not snapshot_path.is_file():
+            return None
+        try:
+            snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("format_version") != CACHE_FORMAT_VERSION:
+            return None
+
+        # The register is unchanged, but referenced SQL files may have been edited.
+        sql_texts: dict[str, str] = {}
+        for name, expected_hash in snapshot.get("sql_hashes", {}).items():
+            file_path = sql_root / name
+            if not file_path.is_file():
+                return None
+            text = file_path.read_text(encoding="utf-8")
+            if hashlib.sha256(text.encode("utf-8")).hexdigest() != expected_hash:
+                return None
+            sql_texts[name] = text
+        return CompiledRegister(
+            source_path=str(register),
+            content_hash=content_hash,
+            payload=snapshot["payload"],
+            definitions=tuple(ControlDefinition(**item) for item in snapshot["definitions"]),
+            sql_texts=sql_texts,
+        )
+
+    def _write_snapshot(self, compiled: CompiledRegister) -> None:
+        snapshot_path = self._snapshot_path(compiled.content_hash)
+        if snapshot_path is None:
+            return
+        snapshot = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "content_hash": compiled.content_hash,
+            "payload": compiled.payload,
+            "definitions": [asdict(item) for item in compiled.definitions],
+            "sql_hashes": {
+                name: hashlib.sha256(text.encode("utf-8")).hexdigest()
+                for name, text in compiled.sql_texts.items()
+            },
+        }
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(snapshot, indent=2, default=str), encoding="utf-8")
+            os.replace(tmp_path, snapshot_path)
+        except OSError:
+            # The on-disk snapshot is an optimization; a read-only checkout still works.
+            return
+
+
+def _referenced_sql_files(definitions: tuple[ControlDefinition, ...]) -> list[str]:
+    names: list[str] = []
+    for definition in definitions:
+        for name in (definition.sql_path, definition.exceptions_sql, definition.range_sql_path):
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+default_register_cache = RegisterCache()
@@ -2,32 +2,51 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import copy
 from typing import Any
 
-import yaml
-
 from pipeline.controls.models import ControlDefinition
+from pipeline.controls.register_cache import (
+    CompiledRegister,
+    RegisterCache,
+    default_register_cache,
+)
+
+DEFAULT_EXCEPTIONS_LIMIT = 100
 
 
 class ControlRegistry:
     """Loads and validates control definitions from YAML."""
 
-    def __init__(self, path: str = "rules/controls.yaml") -> None:
+    def __init__(
+        self,
+        path: str = "rules/controls.yaml",
+        sql_dir: str = "pipeline/controls/sql",
+        cache: RegisterCache | None = None,
+    ) -> None:
         self.path = path
+        self.sql_dir = sql_dir
+        self._cache = cache or default_register_cache
+
+    def compiled(self, register_path: str | None = None) -> CompiledRegister:
+        """Return the cached compiled register, reloading when the file changed."""
+        return self._cache.get(register_path or self.path, self.sql_dir, self.parse)
 
     def load_raw(self, register_path: str | None = None) -> dict[str, Any]:
-        with Path(register_path or self.path).open("r", encoding="utf-8") as handle:
-            payload = yaml.safe_load(handle) or {}
-        if not isinstance(payload, dict):
-            raise ValueError("rules/controls.yaml must contain a mapping")
-        return payload
+        # Callers may mutate the payload, so never hand out the cached mapping.
+        return copy.deepcopy(self.compiled(register_path).payload)
 
     def load(self, register_path: str | None = None) -> list[ControlDefinition]:
-        payload = self.load_raw(register_path)
+        return list(self.compiled(register_path).definitions)
+
+    def parse(self, payload: dict[str, Any]) -> list[ControlDefinition]:
+        """Validate a register payload into typed definitions."""
         controls = payload.get("controls", [])
         if not isinstance(controls, list):
             raise ValueError("rules/controls.yaml controls must be a list")
+        default_exceptions_limit = int(
+            payload.get("exceptions_limit", DEFAULT_EXCEPTIONS_LIMIT)
+        )
 
         definitions: list[ControlDefinition] = []
         for item in controls:
@@ -37,7 +56,7 @@ class ControlRegistry:
             if not control_id:
                 continue
             control_type = str(item.get("type", "sql")).strip().lower()
-            if control_type not in {"precheck", "sql", "gate"}:
+            if control_type not in {"precheck", "sql", "gate", "dq_library", "statistical"}:
                 raise ValueError(f"Unsupported control type for {control_id}: {control_type}")
             severity = str(item.get("severity", "BLOCK")).strip().upper()
             definitions.append(
@@ -52,6 +71,11 @@ class ControlRegistry:
                     params=item.get("params") if isinstance(item.get("params"), dict) else {},
                     threshold=float(item.get("threshold", 0)),
                     query=item.get("query"),
+                    exceptions_sql=item.get("exceptions_sql"),
+                    exceptions_limit=int(
+                        item.get("exceptions_limit", default_exceptions_limit)
+                    ),
+                    range_sql_path=item.get("range_sql_path"),
                 )
             )
         return definitions
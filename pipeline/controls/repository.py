@@ -7,26 +7,88 @@ from typing import Any
 from pipeline.controls.models import ControlResult
 
 
+# Columns assumed when INFORMATION_SCHEMA cannot be read.
+_FALLBACK_COLUMNS = {
+    "RUN_ID",
+    "CONTROL_ID",
+    "CONTROL_NAME",
+    "STATUS",
+    "TOTAL_COUNT",
+    "FAIL_COUNT",
+    "SEVERITY",
+    "EXECUTED_TS",
+}
+# Rows per INSERT when flushing a buffered repository.
+FLUSH_CHUNK_SIZE = 200
+# Tables holding a run's control evidence, cleared before it is re-evaluated.
+RUN_EVIDENCE_TABLES = ("CTRL.CONTROL_RESULT", "CTRL.EXCEPTIONS")
+
+
 class ControlRepository:
-    """Writes control outcomes to CTRL.CONTROL_RESULT."""
+    """Writes control outcomes to CTRL.CONTROL_RESULT.
 
-    def __init__(self, conn: Any) -> None:
+    With ``buffered=True`` results are queued and written by ``flush`` as
+    one multi-row INSERT; the table's column set is looked up once.
+    """
+
+    def __init__(self, conn: Any, *, buffered: bool = False) -> None:
         self._conn = conn
+        self._buffered = buffered
+        self._pending: list[ControlResult] = []
+        self._columns: set[str] | None = None
 
     def persist(self, result: ControlResult) -> None:
-        available_columns = self._control_result_columns()
-        if not available_columns:
-            available_columns = {
-                "RUN_ID",
-                "CONTROL_ID",
-                "CONTROL_NAME",
-                "STATUS",
-                "TOTAL_COUNT",
-                "FAIL_COUNT",
-                "SEVERITY",
-                "EXECUTED_TS",
-            }
+        if self._buffered:
+            self._pending.append(result)
+            return
+        self._insert([result])
+
+    def clear_run(self, run_id: str) -> None:
+        """Delete a run's earlier results and exceptions.
+
+        A resumed run re-evaluates its controls under the same run_id; the
+        deletes share the new attempt's transaction, so the run keeps exactly
+        one result set either way.
+        """
+        with self._conn.cursor() as cur:
+            for table in RUN_EVIDENCE_TABLES:
+                cur.execute(f"DELETE FROM {table} WHERE run_id = %(run_id)s", {"run_id": run_id})
+
+    def flush(self) -> None:
+        """Write queued results; a no-op for unbuffered repositories."""
+        while self._pending:
+            chunk = self._pending[:FLUSH_CHUNK_SIZE]
+            self._insert(chunk)
+            del self._pending[: len(chunk)]
+
+    def _insert(self, results: list[ControlResult]) -> None:
+        available_columns = self._available_columns()
+        insert_columns: list[str] = []
+        selects: list[str] = []
+        params: dict[str, Any] = {}
+        for index, result in enumerate(results):
+            row_columns, select_values, row_params = self._row_values(result, available_columns, index)
+            insert_columns = row_columns
+            selects.append(f"SELECT {', '.join(select_values)}")
+            params.update(row_params)
+
+        if not insert_columns:
+            return
 
+        union_all = "\n          UNION ALL\n          ".join(selects)
+        sql = f"""
+          INSERT INTO CTRL.CONTROL_RESULT ({", ".join(insert_columns)})
+          {union_all}
+        """
+        with self._conn.cursor() as cur:
+            cur.execute(sql, params)
+
+    def _row_values(
+        self,
+        result: ControlResult,
+        available_columns: set[str],
+        index: int,
+    ) -> tuple[list[str], list[str], dict[str, Any]]:
         value_by_column = {
             "RUN_ID": result.run_id,
             "BATCH_DATE": result.batch_date.isoformat(),
@@ -41,34 +103,33 @@ class ControlRepository:
             "DETAILS": result.details,
             "EXECUTED_SQL_HASH": result.executed_sql_hash,
         }
+        # Single-row inserts keep the plain parameter names.
+        suffix = f"_{index}" if index else ""
 
         insert_columns: list[str] = []
         select_values: list[str] = []
         params: dict[str, Any] = {}
         for column, value in value_by_column.items():
             if column in available_columns:
-                key = column.lower()
+                key = f"{column.lower()}{suffix}"
                 insert_columns.append(column)
                 select_values.append(f"%({key})s")
                 params[key] = value
 
         if "EXECUTED_AT" in available_columns:
             insert_columns.append("EXECUTED_AT")
-            select_values.append("%(executed_at)s")
-            params["executed_at"] = result.executed_at
+            select_values.append(f"%(executed_at{suffix})s")
+            params[f"executed_at{suffix}"] = result.executed_at
         elif "EXECUTED_TS" in available_columns:
             insert_columns.append("EXECUTED_TS")
             select_values.append("CURRENT_TIMESTAMP()")
+        return insert_columns, select_values, params
 
-        if not insert_columns:
-            return
-
-        sql = f"""
-          INSERT INTO CTRL.CONTROL_RESULT ({", ".join(insert_columns)})
-          SELECT {", ".join(select_values)}
-        """
-        with self._conn.cursor() as cur:
-            cur.execute(sql, params)
+    def _available_columns(self) -> set[str]:
+        if self._columns is None:
+            # Cached for the repository's lifetime: one lookup per run, not per row.
+            self._columns = self._control_result_columns() or set(_FALLBACK_COLUMNS)
+        return self._columns
 
     def save(self, result: ControlResult) -> None:
         """Alias matching the repository API shape in the design spec."""
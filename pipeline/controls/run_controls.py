@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from pipeline.controls.baseline import DEFAULT_WINDOW, BaselineState, BaselineStore
 from pipeline.controls.engine import ControlEngine
-from pipeline.controls.handlers import GateHandler, PrecheckHandler, SqlHandler
+from pipeline.controls.handlers import (
+    DqLibraryHandler,
+    GateHandler,
+    PrecheckHandler,
+    SqlHandler,
+    StatisticalHandler,
+)
 from pipeline.controls.models import (
     ControlContext,
     ControlDefinition,
@@ -39,7 +46,10 @@ def run_controls(
     loaded_counts: dict[str, int] | None = None,
     prev_batch_date: str | None = None,
 ) -> ControlsSummary:
-    """Execute controls from register via ControlEngine and return summary."""
+    """Execute controls from register via ControlEngine and return summary.
+
+    Results an earlier attempt of the same run wrote are replaced, not added to.
+    """
     batch_date_value = datetime.strptime(batch_date, "%Y-%m-%d").date()
     prev_batch_date_value = (
         datetime.strptime(prev_batch_date, "%Y-%m-%d").date()
@@ -54,12 +64,16 @@ def run_controls(
         connection=conn,
         prev_batch_date=prev_batch_date_value,
     )
+    repository = ControlRepository(conn, buffered=True)
+    repository.clear_run(run_id)
     engine = ControlEngine(
-        repository=ControlRepository(conn),
-        registry=ControlRegistry(register_path),
+        repository=repository,
+        registry=ControlRegistry(register_path, sql_dir=sql_dir),
         precheck_handler=PrecheckHandler(),
         sql_handler=SqlHandler(sql_dir=sql_dir),
         gate_handler=GateHandler(),
+        dq_library_handler=DqLibraryHandler(),
+        statistical_handler=StatisticalHandler(sql_dir=sql_dir),
     )
     return engine.run(context, register_path=register_path)
 
@@ -70,3 +84,30 @@ def promotion_gate(results: list[ControlResult]) -> bool:
         result.blocking and result.status in {"FAIL", "ERROR"}
         for result in results
     )
+
+
+def metric_observations(summary: ControlsSummary) -> dict[str, float]:
+    """Return statistical control metric values keyed by control_id."""
+    return {
+        result.control_id: float(result.metric_value)
+        for result in summary.results
+        if result.type == "statistical" and result.metric_value is not None
+    }
+
+
+def update_metric_baselines(
+    conn: Any,
+    observations: dict[str, float],
+    batch_date: date,
+    *,
+    register_path: str = "rules/controls.yaml",
+) -> list[BaselineState]:
+    """Advance CTRL.METRIC_BASELINE with this run's statistical observations."""
+    if not observations:
+        return []
+    windows = {
+        control.control_id: int((control.params or {}).get("window", DEFAULT_WINDOW))
+        for control in ControlRegistry(register_path).load()
+        if control.type == "statistical"
+    }
+    return BaselineStore(conn).update(observations, batch_date, windows)
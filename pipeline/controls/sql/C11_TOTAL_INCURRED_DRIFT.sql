@@ -0,0 +1,5 @@
+-- Statistical control metric contract: metric_value (NUMBER) for the batch.
+SELECT
+  COALESCE(SUM({{snapshot_claim_amount_incurred}}), 0) AS metric_value
+FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+WHERE {{snapshot_batch_date}} = %(batch_date)s::DATE;
@@ -0,0 +1,13 @@
+-- Exception sample contract columns:
+-- claim_id (STRING), src_file_row_number (NUMBER), error_message (STRING)
+SELECT
+  {{snapshot_claim_id}} AS claim_id,
+  {{snapshot_src_file_row_number}} AS src_file_row_number,
+  'Negative financial value detected' AS error_message
+FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+WHERE {{snapshot_batch_date}} = %(batch_date)s::DATE
+  AND (
+    {{snapshot_claim_amount_incurred}} < 0
+    OR {{snapshot_paid_amount_to_date}} < 0
+    OR {{snapshot_reserve_amount}} < 0
+  );
@@ -0,0 +1,9 @@
+-- Exception sample contract columns:
+-- claim_id (STRING), src_file_row_number (NUMBER), error_message (STRING)
+SELECT
+  {{snapshot_claim_id}} AS claim_id,
+  {{snapshot_src_file_row_number}} AS src_file_row_number,
+  'pii_class outside approved taxonomy: ' || COALESCE({{snapshot_pii_class}}, 'NULL') AS error_message
+FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+WHERE {{snapshot_batch_date}} = %(batch_date)s::DATE
+  AND {{snapshot_pii_class}} NOT IN ('NONE', 'LOW', 'MEDIUM', 'HIGH');
@@ -0,0 +1,9 @@
+-- Exception sample contract columns:
+-- claim_id (STRING), src_file_row_number (NUMBER), error_message (STRING)
+SELECT
+  {{events_claim_id}} AS claim_id,
+  {{events_src_file_row_number}} AS src_file_row_number,
+  'event_type outside approved taxonomy: ' || COALESCE({{events_event_type}}, 'NULL') AS error_message
+FROM RAW.CLAIMS_EVENTS_NIGHTLY
+WHERE {{events_batch_date}} = %(batch_date)s::DATE
+  AND {{events_event_type}} NOT IN ('CREATED', 'UPDATED', 'STATUS_CHANGE', 'PAYMENT', 'NOTE');
@@ -0,0 +1,10 @@
+-- Exception sample contract columns:
+-- claim_id (STRING), src_file_row_number (NUMBER), error_message (STRING)
+SELECT
+  {{snapshot_claim_id}} AS claim_id,
+  {{snapshot_src_file_row_number}} AS src_file_row_number,
+  'Duplicate claim_id within batch_date' AS error_message
+FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+WHERE {{snapshot_batch_date}} = %(batch_date)s::DATE
+  AND NULLIF(TRIM({{snapshot_claim_id}}), '') IS NOT NULL
+QUALIFY COUNT(*) OVER (PARTITION BY UPPER(TRIM({{snapshot_claim_id}}))) > 1;
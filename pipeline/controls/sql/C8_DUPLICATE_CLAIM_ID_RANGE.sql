@@ -0,0 +1,43 @@
+-- Multi-date variant of C8_DUPLICATE_CLAIM_ID.sql: one row per batch_date in
+-- [start_date, end_date] with the same contract columns plus batch_date.
+WITH scoped AS (
+  SELECT
+    {{snapshot_batch_date}} AS batch_date,
+    NULLIF(TRIM({{snapshot_claim_id}}), '') AS claim_id_norm
+  FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+  WHERE {{snapshot_batch_date}} BETWEEN %(start_date)s::DATE AND %(end_date)s::DATE
+),
+duplicates AS (
+  SELECT
+    batch_date,
+    UPPER(claim_id_norm) AS claim_key,
+    COUNT(*) AS row_count
+  FROM scoped
+  WHERE claim_id_norm IS NOT NULL
+  GROUP BY batch_date, UPPER(claim_id_norm)
+  HAVING COUNT(*) > 1
+),
+counts AS (
+  SELECT
+    batch_date,
+    COUNT(*) AS total_count
+  FROM scoped
+  GROUP BY batch_date
+)
+SELECT
+  c.batch_date,
+  COALESCE(SUM(d.row_count - 1), 0) AS control_value,
+  c.total_count,
+  COALESCE(SUM(d.row_count - 1), 0) AS fail_count,
+  CAST(COUNT(d.claim_key) AS FLOAT) AS variance,
+  IFF(COALESCE(SUM(d.row_count - 1), 0) <= %(threshold)s, 'PASS', 'FAIL') AS status,
+  IFF(
+    COUNT(d.claim_key) = 0,
+    'No duplicate claim_id rows found',
+    'Duplicate claim_id groups detected: '
+      || LISTAGG(d.claim_key, ', ') WITHIN GROUP (ORDER BY d.claim_key)
+  ) AS details
+FROM counts c
+LEFT JOIN duplicates d
+  ON d.batch_date = c.batch_date
+GROUP BY c.batch_date, c.total_count;
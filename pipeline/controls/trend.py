@@ -0,0 +1,107 @@
+"""Incremental maintenance of the CTRL.CONTROL_TREND_DAILY summary table."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+# The run that owns a batch date's trend rows: its latest RUN_AUDIT row.
+LATEST_RUN_SQL = """
+  SELECT ra.run_id
+  FROM CTRL.RUN_AUDIT ra
+  WHERE ra.batch_date = %(batch_date)s::DATE
+  ORDER BY ra.start_ts DESC
+  LIMIT 1
+"""
+
+# One row per (batch_date, control_id), from the latest run of that batch date.
+# Within the run only a control's latest result per date counts, so an older
+# attempt's rows are never summed with the resumed one's. result_count is the
+# number of results the run recorded for the control, superseded attempts
+# included, so a value above the dates evaluated marks a retried control.
+MERGE_TREND_SQL = f"""
+  MERGE INTO CTRL.CONTROL_TREND_DAILY AS tgt
+  USING (
+    WITH latest AS (
+      SELECT
+        cr.control_id,
+        cr.status,
+        cr.blocking_flag,
+        cr.variance,
+        COUNT(*) OVER (PARTITION BY cr.control_id) AS attempt_count
+      FROM CTRL.CONTROL_RESULT cr
+      WHERE cr.run_id = %(run_id)s
+        AND cr.run_id = ({LATEST_RUN_SQL})
+      QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY cr.control_id, cr.batch_date
+        ORDER BY COALESCE(cr.executed_at, cr.executed_ts) DESC
+      ) = 1
+    )
+    SELECT
+      %(batch_date)s::DATE AS batch_date,
+      latest.control_id,
+      %(run_id)s AS run_id,
+      MAX(latest.attempt_count) AS result_count,
+      COUNT_IF(UPPER(latest.status) IN ('FAIL', 'ERROR')) AS fail_count,
+      COUNT_IF(UPPER(latest.status) IN ('FAIL', 'ERROR') AND COALESCE(latest.blocking_flag, FALSE))
+        AS blocking_fail_count,
+      SUM(latest.variance) AS variance_sum
+    FROM latest
+    GROUP BY latest.control_id
+  ) AS src
+  ON tgt.batch_date = src.batch_date
+    AND tgt.control_id = src.control_id
+  WHEN MATCHED THEN UPDATE SET
+    run_id = src.run_id,
+    result_count = src.result_count,
+    fail_count = src.fail_count,
+    blocking_fail_count = src.blocking_fail_count,
+    variance_sum = src.variance_sum,
+    updated_ts = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    batch_date,
+    control_id,
+    run_id,
+    result_count,
+    fail_count,
+    blocking_fail_count,
+    variance_sum,
+    updated_ts
+  ) VALUES (
+    src.batch_date,
+    src.control_id,
+    src.run_id,
+    src.result_count,
+    src.fail_count,
+    src.blocking_fail_count,
+    src.variance_sum,
+    CURRENT_TIMESTAMP()
+  )
+"""
+
+# Controls an earlier run of the same batch date reported but this run did not.
+DELETE_STALE_SQL = f"""
+  DELETE FROM CTRL.CONTROL_TREND_DAILY
+  WHERE batch_date = %(batch_date)s::DATE
+    AND run_id <> %(run_id)s
+    AND %(run_id)s = ({LATEST_RUN_SQL})
+"""
+
+
+def refresh_control_trend(conn: Any, run_id: str, batch_date: date | str) -> int:
+    """Upsert one run's control results into the daily trend; return rows merged.
+
+    Only the run's batch date is touched, so the cost does not grow with
+    history. Only the batch date's latest run in CTRL.RUN_AUDIT (by start_ts)
+    writes, and its rows replace those of earlier runs. Resuming an older
+    run_id after a newer rerun, or a run with no control results (it failed
+    before the controls stage), leaves the batch date's existing rows alone.
+    """
+    params = {"run_id": run_id, "batch_date": str(batch_date)}
+    with conn.cursor() as cur:
+        cur.execute(MERGE_TREND_SQL, params)
+        merged = cur.rowcount if cur.rowcount and cur.rowcount > 0 else 0
+    if merged:
+        with conn.cursor() as cur:
+            cur.execute(DELETE_STALE_SQL, params)
+    return merged
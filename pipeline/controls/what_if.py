@@ -0,0 +1,74 @@
+"""Evaluate a candidate control over recent batches without persisting results."""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pipeline.common.snowflake_client import get_connection
+from pipeline.controls.backfill import build_contexts, raw_batch_dates
+from pipeline.controls.handlers import SqlHandler
+from pipeline.controls.models import ControlDefinition, ControlResult
+from pipeline.controls.registry import ControlRegistry
+
+
+def candidate_from_sql(sql_file: str | Path, *, threshold: float = 0) -> ControlDefinition:
+    """Wrap an ad-hoc SQL file as a non-blocking SQL control definition."""
+    path = Path(sql_file)
+    return ControlDefinition(
+        control_id=f"WHATIF_{path.stem.upper()}",
+        type="sql",
+        enabled=True,
+        blocking=False,
+        severity="WARN",
+        description=f"What-if candidate from {path.name}",
+        sql_path=None,
+        params={},
+        threshold=threshold,
+        query=path.read_text(encoding="utf-8"),
+    )
+
+
+def main() -> int:
+    """CLI entrypoint for what-if control evaluation."""
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--control-id", help="Existing register control to re-evaluate")
+    source.add_argument("--sql-file", help="Candidate control SQL following the output contract")
+    parser.add_argument("--last-n", type=int, default=30, help="Number of recent RAW batches")
+    parser.add_argument("--threshold", type=float, default=0)
+    parser.add_argument("--register", default="rules/controls.yaml")
+    parser.add_argument("--sql-dir", default="pipeline/controls/sql")
+    args = parser.parse_args()
+
+    if args.control_id:
+        by_id = {item.control_id: item for item in ControlRegistry(args.register, sql_dir=args.sql_dir).load()}
+        if args.control_id not in by_id:
+            raise SystemExit(f"Unknown control_id: {args.control_id}")
+        candidate = by_id[args.control_id]
+        if candidate.type != "sql":
+            raise SystemExit(f"What-if mode supports sql controls only, got {candidate.type}")
+    else:
+        candidate = candidate_from_sql(args.sql_file, threshold=args.threshold)
+
+    run_id_prefix = f"whatif_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
+    with get_connection() as conn:
+        batch_dates = raw_batch_dates(conn, last_n=args.last_n)
+        contexts = build_contexts(conn, run_id_prefix, batch_dates)
+        # Evidence from a trial must never land in CTRL.EXCEPTIONS.
+        handler = SqlHandler(sql_dir=args.sql_dir)
+        results: list[ControlResult] = handler.handle_range(candidate, contexts, persist=False)
+
+    for result in results:
+        print(
+            f"{result.batch_date} {result.status:<5} fail_count={result.fail_count} "
+            f"total_count={result.total_count} {result.details or ''}".rstrip()
+        )
+    failing = sum(1 for result in results if result.status == "FAIL")
+    print(f"{candidate.control_id}: {failing}/{len(results)} batches would fail")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,28 +1,29 @@
-"""Load snapshot and events nightly files into Snowflake RAW tables."""
+"""Load registered nightly feed files into Snowflake RAW tables."""
 
 from __future__ import annotations
 
 import csv
+import time
 from pathlib import Path
-from typing import Literal
 
+from pipeline.common.datasets import Feed, get_feed, load_feeds
+from pipeline.common.metrics import COPY_DURATION, UPLOADED_BYTES
+from pipeline.common.raw_columns import LEGACY_TYPED_COLUMNS, table_columns
 from pipeline.common.snowflake_client import execute_scalar
 
 
 def discover_files(
     batch_date: str,
     input_dir: str = "samples/nightly_drop",
+    feeds: list[Feed] | None = None,
 ) -> dict[str, Path]:
-    """Return expected snapshot and events files for the given batch date."""
-    # Convert YYYY-MM-DD -> YYYYMMDD for filename matching.
-    stamp = batch_date.replace("-", "")
+    """Return the expected file for every registered feed, keyed by feed name."""
     root = Path(input_dir)
-    snapshot = root / f"claims_snapshot_{stamp}.csv"
-    events = root / f"claims_events_{stamp}.csv"
-    missing = [str(path) for path in (snapshot, events) if not path.exists()]
+    files = {feed.name: root / feed.file_name(batch_date) for feed in feeds or load_feeds()}
+    missing = [str(path) for path in files.values() if not path.exists()]
     if missing:
         raise FileNotFoundError(f"Missing input files: {', '.join(missing)}")
-    return {"snapshot": snapshot, "events": events}
+    return files
 
 
 def validate_headers(csv_path: Path, required_headers: list[str]) -> None:
@@ -45,10 +46,16 @@ def copy_file_to_raw(
     stage_name: str,
     table_name: str,
     file_format: str,
-    dataset_kind: Literal["snapshot", "events"],
+    dataset_kind: str,
+    *,
+    business_columns: int | None = None,
+    target_columns: set[str] | None = None,
 ) -> int:
     """PUT a file and COPY it into target RAW table.
 
+    ``target_columns`` is the RAW table's column set; callers loading many
+    files resolve it once (``tables_columns``) instead of once per COPY.
+
     Note: Snowflake SQL bind variables cannot be used for object identifiers,
     so identifier arguments are controlled constants from pipeline config.
     """
@@ -59,16 +66,24 @@ def copy_file_to_raw(
     # 1) Upload local file into Snowflake internal stage.
     with conn.cursor() as cur:
         cur.execute(put_sql)
+    UPLOADED_BYTES.inc(file_path.stat().st_size, feed=dataset_kind)
 
+    if target_columns is None:
+        schema_name, _, bare_table = table_name.rpartition(".")
+        target_columns = table_columns(conn, schema_name or "RAW", bare_table)
     copy_sql = _build_copy_sql(
         table_name=table_name,
         file_format=file_format,
         stage_name=stage_name,
         dataset_kind=dataset_kind,
+        business_columns=business_columns,
+        target_columns=target_columns,
     )
     # 2) Load just this file from stage into RAW table.
+    started = time.perf_counter()
     with conn.cursor() as cur:
         cur.execute(copy_sql, {"pattern": f".*{file_path.name}.*"})
+    COPY_DURATION.observe(time.perf_counter() - started, feed=dataset_kind)
 
     count_sql = f"""
         SELECT COUNT(*)
@@ -83,68 +98,42 @@ def _build_copy_sql(
     table_name: str,
     file_format: str,
     stage_name: str,
-    dataset_kind: Literal["snapshot", "events"],
+    dataset_kind: str,
+    target_columns: set[str] | None = None,
+    *,
+    business_columns: int | None = None,
 ) -> str:
-    """Return COPY SQL with a column mapping aligned to target table layout."""
-    if dataset_kind == "snapshot":
-        # Snapshot files contain 32 business columns.
-        projection = """
-            t.$1,
-            t.$2,
-            t.$3,
-            t.$4,
-            t.$5,
-            t.$6,
-            t.$7,
-            t.$8,
-            t.$9,
-            t.$10,
-            t.$11,
-            t.$12,
-            t.$13,
-            t.$14,
-            t.$15,
-            t.$16,
-            t.$17,
-            t.$18,
-            t.$19,
-            t.$20,
-            t.$21,
-            t.$22,
-            t.$23,
-            t.$24,
-            t.$25,
-            t.$26,
-            t.$27,
-            t.$28,
-            t.$29,
-            t.$30,
-            t.$31,
-            t.$32,
-            METADATA$FILENAME,
-            METADATA$FILE_ROW_NUMBER,
-            CURRENT_TIMESTAMP()
-        """
-    else:
-        # Events files contain 10 business columns.
-        projection = """
-            t.$1,
-            t.$2,
-            t.$3,
-            t.$4,
-            t.$5,
-            t.$6,
-            t.$7,
-            t.$8,
-            t.$9,
-            t.$10,
-            METADATA$FILENAME,
-            METADATA$FILE_ROW_NUMBER,
-            CURRENT_TIMESTAMP()
-        """
+    """Return COPY SQL with a column mapping aligned to target table layout.
+
+    Named layouts are loaded positionally. On the positional COL_* layout the
+    column list is explicit so typed BATCH_DATE/amount columns, when present,
+    are cast once here instead of in every downstream query.
+    """
+    # File width comes from the feed registry unless the caller passes it.
+    if business_columns is None:
+        business_columns = get_feed(dataset_kind).business_columns
+    projection_items = [f"t.${idx}" for idx in range(1, business_columns + 1)]
+    projection_items += [
+        "METADATA$FILENAME",
+        "METADATA$FILE_ROW_NUMBER",
+        "CURRENT_TIMESTAMP()",
+    ]
+
+    column_clause = ""
+    columns = {column.upper() for column in (target_columns or set())}
+    if "COL_1" in columns:
+        load_column = "LOADED_AT" if "LOADED_AT" in columns else "LOAD_TS"
+        column_names = [f"COL_{idx}" for idx in range(1, business_columns + 1)]
+        column_names += ["SRC_FILENAME", "SRC_FILE_ROW_NUMBER", load_column]
+        for column, _sql_type, position, cast in LEGACY_TYPED_COLUMNS.get(dataset_kind, []):
+            if column in columns:
+                column_names.append(column)
+                projection_items.append(cast.format(f"t.${position}"))
+        column_clause = f" ({', '.join(column_names)})"
 
+    projection = ",\n            ".join(projection_items)
     return f"""
-        COPY INTO {table_name}
+        COPY INTO {table_name}{column_clause}
         FROM (
           SELECT
             {projection}
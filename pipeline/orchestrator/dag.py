@@ -0,0 +1,252 @@
+"""Stage DAG runner with JSON checkpoints for resumable pipeline runs."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from pipeline.common.logging import log_context
+from pipeline.common.tracing import span
+
+StageOutputs = dict[str, Any]
+StageFn = Callable[["StageContext"], StageOutputs | None]
+ConnectionFactory = Callable[[], AbstractContextManager[Any]]
+
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+BLOCKED = "BLOCKED"
+RUNNING = "RUNNING"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step and the stages whose outputs it needs."""
+
+    name: str
+    run: StageFn
+    depends_on: tuple[str, ...] = ()
+    needs_connection: bool = True
+
+
+@dataclass
+class StageContext:
+    """What a stage sees: run identity, upstream outputs and its connection."""
+
+    run_id: str
+    batch_date: str
+    params: dict[str, Any]
+    outputs: dict[str, StageOutputs]
+    connection: Any = None
+
+
+class StageBlocked(Exception):
+    """Raised by a stage whose work committed but which must halt the run."""
+
+    def __init__(self, message: str, outputs: StageOutputs | None = None) -> None:
+        super().__init__(message)
+        self.outputs = outputs or {}
+
+
+@dataclass
+class Checkpoint:
+    """Per-run stage status persisted as ``<run_id>.checkpoint.json``."""
+
+    path: Path
+    run_id: str
+    batch_date: str
+    params: dict[str, Any] = field(default_factory=dict)
+    stages: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def create(
+        cls,
+        log_dir: str | Path,
+        run_id: str,
+        batch_date: str,
+        params: dict[str, Any] | None = None,
+    ) -> "Checkpoint":
+        return cls(
+            path=Path(log_dir) / f"{run_id}.checkpoint.json",
+            run_id=run_id,
+            batch_date=batch_date,
+            params=dict(params or {}),
+        )
+
+    @classmethod
+    def load(cls, log_dir: str | Path, run_id: str) -> "Checkpoint":
+        path = Path(log_dir) / f"{run_id}.checkpoint.json"
+        if not path.is_file():
+            raise FileNotFoundError(f"No checkpoint for run_id {run_id}: {path}")
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            path=path,
+            run_id=payload["run_id"],
+            batch_date=payload["batch_date"],
+            params=payload.get("params", {}),
+            stages=payload.get("stages", {}),
+        )
+
+    def completed(self, stage_name: str) -> bool:
+        return self.stages.get(stage_name, {}).get("status") == COMPLETED
+
+    def outputs(self) -> dict[str, StageOutputs]:
+        return {
+            name: dict(entry.get("outputs") or {})
+            for name, entry in self.stages.items()
+            if entry.get("status") == COMPLETED
+        }
+
+    def mark(self, stage_name: str, status: str, **fields: Any) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage_name, {})
+            entry.update(status=status, **fields)
+            self._save()
+
+    def _save(self) -> None:
+        payload = {
+            "run_id": self.run_id,
+            "batch_date": self.batch_date,
+            "params": self.params,
+            "stages": self.stages,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        # Atomic replace so a crash never leaves a half-written checkpoint.
+        os.replace(tmp_path, self.path)
+
+
+@dataclass(frozen=True)
+class DagResult:
+    """Final status of a DAG run."""
+
+    status: str
+    completed: tuple[str, ...]
+    skipped: tuple[str, ...]
+    failed_stage: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == COMPLETED
+
+
+class DagRunner:
+    """Runs stages in dependency order, independent ones in parallel.
+
+    Each stage gets its own connection from ``connect`` and commits when it
+    finishes, so a resumed run can skip stages its checkpoint marks done.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        checkpoint: Checkpoint,
+        connect: ConnectionFactory | None = None,
+        *,
+        max_workers: int = 2,
+    ) -> None:
+        _validate(stages)
+        self._stages = {stage.name: stage for stage in stages}
+        self._order = [stage.name for stage in stages]
+        self._checkpoint = checkpoint
+        self._connect = connect
+        self._max_workers = max_workers
+
+    def run(self) -> DagResult:
+        outputs = self._checkpoint.outputs()
+        skipped = tuple(name for name in self._order if self._checkpoint.completed(name))
+        done = set(skipped)
+        completed: list[str] = []
+        pending = [name for name in self._order if name not in done]
+        running: dict[Future, str] = {}
+        failure: tuple[str, str, str] | None = None
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while pending or running:
+                if failure is None:
+                    for name in list(pending):
+                        if len(running) >= self._max_workers:
+                            break
+                        if all(dep in done for dep in self._stages[name].depends_on):
+                            pending.remove(name)
+                            upstream = {key: dict(value) for key, value in outputs.items()}
+                            # Copy the context so stage spans nest under the run span.
+                            stage_context = contextvars.copy_context()
+                            future = pool.submit(stage_context.run, self._run_stage, name, upstream)
+                            running[future] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    status, stage_outputs, error = future.result()
+                    if status == COMPLETED:
+                        outputs[name] = stage_outputs
+                        done.add(name)
+                        completed.append(name)
+                    elif failure is None:
+                        failure = (name, status, error or "")
+
+        if failure is not None:
+            name, status, error = failure
+            return DagResult(status, tuple(completed), skipped, failed_stage=name, error=error)
+        return DagResult(COMPLETED, tuple(completed), skipped)
+
+    def _run_stage(self, name: str, upstream: dict[str, StageOutputs]) -> tuple[str, StageOutputs, str | None]:
+        stage = self._stages[name]
+        self._checkpoint.mark(name, RUNNING, started_at=_now(), finished_at=None, error=None)
+        connection_scope = (
+            self._connect() if stage.needs_connection and self._connect is not None else nullcontext()
+        )
+        try:
+            with log_context(stage=name), span(name, kind="stage"), connection_scope as conn:
+                context = StageContext(
+                    run_id=self._checkpoint.run_id,
+                    batch_date=self._checkpoint.batch_date,
+                    params=self._checkpoint.params,
+                    outputs=upstream,
+                    connection=conn,
+                )
+                try:
+                    stage_outputs = stage.run(context) or {}
+                except StageBlocked as blocked:
+                    # The stage's writes (e.g. FAILED audit) must still commit.
+                    self._checkpoint.mark(
+                        name, BLOCKED, finished_at=_now(), error=str(blocked), outputs=blocked.outputs
+                    )
+                    return BLOCKED, blocked.outputs, str(blocked)
+        except Exception as exc:
+            self._checkpoint.mark(name, FAILED, finished_at=_now(), error=f"{type(exc).__name__}: {exc}")
+            return FAILED, {}, f"{type(exc).__name__}: {exc}"
+        self._checkpoint.mark(name, COMPLETED, finished_at=_now(), outputs=stage_outputs)
+        return COMPLETED, stage_outputs, None
+
+
+def _validate(stages: list[Stage]) -> None:
+    names = [stage.name for stage in stages]
+    if len(names) != len(set(names)):
+        raise ValueError("Stage names must be unique")
+    seen: set[str] = set()
+    for stage in stages:
+        unknown = [dep for dep in stage.depends_on if dep not in names]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(unknown)}")
+        # Declaration order doubles as a topological order check (no cycles).
+        later = [dep for dep in stage.depends_on if dep not in seen]
+        if later:
+            raise ValueError(f"Stage {stage.name} must be declared after: {', '.join(later)}")
+        seen.add(stage.name)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -3,140 +3,436 @@
 from __future__ import annotations
 
 import argparse
-from datetime import datetime, timezone
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import replace
+from datetime import date, datetime, timezone
+from pathlib import Path
 
-from pipeline.common.snowflake_client import get_connection
+from pipeline.common.datasets import DATASETS_PATH, Feed, load_feeds
+from pipeline.common.logging import configure_logging, get_logger, log_context
+from pipeline.common.metrics import (
+    DEFAULT_METRICS_FILE,
+    LANDING_TO_PROMOTION,
+    LAST_RUN_SUCCESS,
+    LAST_RUN_TIMESTAMP,
+    METRICS_FILE_ENV,
+    PROMOTED_ROWS,
+    ROWS_VALIDATED,
+    RUN_DURATION,
+    VALIDATION_ROWS_PER_SECOND,
+    PeriodicTextfileWriter,
+    write_textfile,
+)
+from pipeline.common.raw_columns import tables_columns
+from pipeline.common.snowflake_client import backend_name, get_connection, get_pool
+from pipeline.common.tracing import span, start_trace
 from pipeline.common.utils import parse_batch_date
+from pipeline.controls.run_controls import (
+    metric_observations,
+    run_controls,
+    update_metric_baselines,
+)
+from pipeline.controls.trend import refresh_control_trend
 from pipeline.ingest.load_to_snowflake import (
     copy_file_to_raw,
     discover_files,
 )
-from pipeline.controls.run_controls import run_controls
-from pipeline.promote.promote_int_gold import promote_snapshot_to_int
+from pipeline.ingest.schema_validate import validate_csv_against_schema
+from pipeline.orchestrator.dag import (
+    BLOCKED,
+    COMPLETED,
+    Checkpoint,
+    DagResult,
+    DagRunner,
+    Stage,
+    StageBlocked,
+    StageContext,
+)
+from pipeline.orchestrator.query_stats import harvest_query_stats
+from pipeline.orchestrator.run_bookkeeping import RunBookkeeper
+from pipeline.orchestrator.warehouse_policy import WarehousePolicy
+from pipeline.promote.promote_int_gold import (
+    PromotionResult,
+    promote_dimensions,
+    promote_events_to_int,
+    promote_int_to_gold,
+    promote_snapshot_to_int,
+)
+
+RUN_LOG_DIR = "artifacts/run_logs"
+INPUT_DIR = "samples/nightly_drop"
+# Upper bound on stages (per-feed validate/load/promote) running at once.
+DEFAULT_MAX_PARALLEL = 4
+PROMOTERS = {
+    "snapshot": promote_snapshot_to_int,
+    "events": promote_events_to_int,
+}
 
 
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--batch-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--batch-date", help="YYYY-MM-DD (required unless --resume)")
     parser.add_argument("--stage", default="@RAW.CLAIMS_NIGHTLY_STAGE")
     parser.add_argument("--file-format", default="RAW.CSV_FF")
-    return parser.parse_args()
+    parser.add_argument("--datasets", default=DATASETS_PATH, help="Dataset registry declaring the feeds")
+    parser.add_argument("--input-dir", default=INPUT_DIR, help="Directory holding the nightly drop files")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help="Maximum number of stages running concurrently",
+    )
+    parser.add_argument("--resume", metavar="RUN_ID", help="Skip stages already completed for this run")
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv(METRICS_FILE_ENV, DEFAULT_METRICS_FILE),
+        help="Prometheus textfile for the node-exporter textfile collector",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=0.0,
+        help="Also rewrite the metrics textfile every N seconds during the run (0 = at run end only)",
+    )
+    args = parser.parse_args()
+    if not args.batch_date and not args.resume:
+        parser.error("--batch-date is required unless --resume is given")
+    if args.max_parallel < 1:
+        parser.error("--max-parallel must be at least 1")
+    if args.metrics_interval < 0:
+        parser.error("--metrics-interval cannot be negative")
+    return args
 
 
-def main() -> int:
-    """Run the pipeline stages: ingest, control, and promotion."""
-    args = parse_args()
-    batch_date = parse_batch_date(args.batch_date)
-    # Unique identifier ties all audit/control records for one execution.
-    run_id = (
-        f"run_{batch_date}_"
-        f"{datetime.now(timezone.utc).strftime('%H%M%S')}"
+def _discover_stage(feeds: list[Feed]):
+    def run(ctx: StageContext) -> dict:
+        """Locate every feed's nightly file and open the run's audit row."""
+        files = discover_files(ctx.batch_date, ctx.params.get("input_dir", INPUT_DIR), feeds=feeds)
+        bookkeeper = RunBookkeeper(ctx.connection, ctx.run_id)
+        # Mark run as started in audit table.
+        bookkeeper.start(
+            "claims_snapshot_events",
+            ctx.batch_date,
+            ",".join(path.name for path in files.values()),
+        )
+        bookkeeper.flush()
+        # Every load's COPY needs its RAW column set; look them all up once here.
+        raw_columns = tables_columns(ctx.connection, [feed.raw_table for feed in feeds])
+        return {
+            "files": {name: str(path) for name, path in files.items()},
+            "raw_columns": {feed.name: sorted(raw_columns[feed.raw_table]) for feed in feeds},
+        }
+
+    return run
+
+
+def _validate_stage(feed: Feed):
+    def run(ctx: StageContext) -> dict:
+        """Check the feed's file against its JSON schema contract before loading."""
+        path = ctx.outputs["discover"]["files"][feed.name]
+        started = time.perf_counter()
+        result = validate_csv_against_schema(path, feed.schema_path)
+        elapsed = time.perf_counter() - started
+        ROWS_VALIDATED.inc(result.row_count, feed=feed.name)
+        if elapsed > 0:
+            VALIDATION_ROWS_PER_SECOND.set(result.row_count / elapsed, feed=feed.name)
+        if not result.valid:
+            raise ValueError(
+                f"{Path(path).name} failed schema validation: {'; '.join(result.errors[:5])}"
+            )
+        return {"row_count": result.row_count}
+
+    return run
+
+
+def _load_stage(feed: Feed):
+    def run(ctx: StageContext) -> dict:
+        # Checkpoints written before raw_columns existed fall back to a lookup.
+        columns = (ctx.outputs["discover"].get("raw_columns") or {}).get(feed.name)
+        loaded = copy_file_to_raw(
+            ctx.connection,
+            Path(ctx.outputs["discover"]["files"][feed.name]),
+            ctx.params["stage"],
+            feed.raw_table,
+            ctx.params["file_format"],
+            feed.name,
+            business_columns=feed.business_columns,
+            target_columns=set(columns) if columns is not None else None,
+        )
+        return {"loaded": loaded}
+
+    return run
+
+
+def _controls_stage(feeds: list[Feed]):
+    def run(ctx: StageContext) -> dict:
+        """Execute metadata-driven controls and block promotion on failures."""
+        summary = run_controls(
+            ctx.connection,
+            ctx.run_id,
+            ctx.batch_date,
+            files={name: Path(path) for name, path in ctx.outputs["discover"]["files"].items()},
+            loaded_counts={feed.name: ctx.outputs[f"load_{feed.name}"]["loaded"] for feed in feeds},
+        )
+        outputs = {
+            "total": summary.total,
+            "failed": summary.failed,
+            "blocking_failures": summary.blocking_failures,
+            "metric_observations": metric_observations(summary),
+        }
+        if summary.blocking_failures > 0:
+            bookkeeper = RunBookkeeper(ctx.connection, ctx.run_id)
+            bookkeeper.finish("FAILED")
+            bookkeeper.flush()
+            raise StageBlocked(f"{summary.blocking_failures} blocking control failure(s)", outputs)
+        return outputs
+
+    return run
+
+
+def _promote_stage(feed: Feed):
+    def run(ctx: StageContext) -> dict:
+        """Promote one feed's RAW batch into INT; its history row is written by refresh_gold."""
+        result = PROMOTERS[feed.promotion](ctx.connection, ctx.batch_date)  # type: ignore[index]
+        PROMOTED_ROWS.inc(result.inserted, feed=feed.name, action="inserted")
+        PROMOTED_ROWS.inc(result.updated, feed=feed.name, action="updated")
+        # The drop file's mtime stands in for when the feed landed.
+        landed = Path(ctx.outputs["discover"]["files"][feed.name])
+        if landed.exists():
+            LANDING_TO_PROMOTION.set(time.time() - landed.stat().st_mtime, feed=feed.name)
+        return _promotion_outputs(result)
+
+    return run
+
+
+def promote_int_stage(ctx: StageContext) -> dict:
+    """Maintain INT dimensions and drift baselines once every feed is promoted."""
+    # Dimension keys come from the INT rows the feed promotions just wrote.
+    dimensions = promote_dimensions(ctx.connection, ctx.batch_date)
+    # Only governed batches feed the drift baselines.
+    update_metric_baselines(
+        ctx.connection,
+        ctx.outputs["controls"]["metric_observations"],
+        date.fromisoformat(ctx.batch_date),
     )
+    return {"dimensions": dimensions}
 
-    # Locate both required nightly files for this batch date.
-    files = discover_files(batch_date)
 
-    with get_connection() as conn:
-        # Mark run as started in audit table.
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO CTRL.RUN_AUDIT (
-                  run_id,
-                  dataset_name,
-                  batch_date,
-                  file_name,
-                  start_ts,
-                  status,
-                  record_count
+def _refresh_gold_stage(feeds: list[Feed]):
+    def run(ctx: StageContext) -> dict:
+        """Refresh GOLD, then write every feed's history row and close the audit row."""
+        snapshots = [ctx.outputs[f"promote_{feed.name}"] for feed in feeds if feed.promotion == "snapshot"]
+        touched = sorted({day for item in snapshots for day in item["touched_batch_dates"]})
+        refreshed = promote_int_to_gold(ctx.connection, touched)
+        # One request for the run's closing bookkeeping. The counts come from the
+        # checkpointed promote outputs, so a resumed run still records them.
+        bookkeeper = RunBookkeeper(ctx.connection, ctx.run_id)
+        for feed in feeds:
+            if feed.promotion is not None:
+                bookkeeper.record_promotion(
+                    feed.history_name, ctx.batch_date, _promotion_result(ctx.outputs[f"promote_{feed.name}"])
                 )
-                SELECT
-                  %(run_id)s,
-                  %(dataset_name)s,
-                  %(batch_date)s::DATE,
-                  %(file_name)s,
-                  CURRENT_TIMESTAMP(),
-                  'STARTED',
-                  0
-                """,
-                {
-                    "run_id": run_id,
-                    "dataset_name": "claims_snapshot_events",
-                    "batch_date": batch_date,
-                    "file_name": f"{files['snapshot'].name},{files['events'].name}",
-                },
-            )
+        bookkeeper.finish(
+            "PASSED",
+            record_count=sum(item["inserted"] + item["updated"] for item in snapshots),
+        )
+        bookkeeper.flush()
+        return {"refreshed_batch_dates": refreshed}
+
+    return run
 
-        snapshot_loaded = copy_file_to_raw(
-            conn,
-            files["snapshot"],
-            args.stage,
-            "RAW.CLAIMS_SNAPSHOT_NIGHTLY",
-            args.file_format,
-            "snapshot",
+
+def _promotion_outputs(result: PromotionResult) -> dict:
+    return {
+        "inserted": result.inserted,
+        "updated": result.updated,
+        "unchanged": result.unchanged,
+        "source_rows": result.source_rows,
+        "dedup_dropped": result.dedup_dropped,
+        "touched_batch_dates": list(result.touched_batch_dates),
+    }
+
+
+def _promotion_result(outputs: dict) -> PromotionResult:
+    return PromotionResult(
+        inserted=outputs["inserted"],
+        updated=outputs["updated"],
+        unchanged=outputs["unchanged"],
+        source_rows=outputs.get("source_rows", 0),
+        dedup_dropped=outputs.get("dedup_dropped", 0),
+        touched_batch_dates=tuple(outputs.get("touched_batch_dates", ())),
+    )
+
+
+def _sized(stage_name: str, run, policy: WarehousePolicy):
+    def sized_run(ctx: StageContext) -> dict | None:
+        with policy.sized(ctx.connection, stage_name, ctx.outputs):
+            return run(ctx)
+
+    return sized_run
+
+
+def build_stages(feeds: list[Feed] | None = None, policy: WarehousePolicy | None = None) -> list[Stage]:
+    """Return the nightly DAG; each feed validates, loads and promotes independently.
+
+    With a warehouse policy, every stage that uses a connection runs on the
+    warehouse size its workload estimate calls for.
+    """
+    feeds = feeds if feeds is not None else load_feeds()
+    promoted = [feed for feed in feeds if feed.promotion is not None]
+    stages = [Stage("discover", _discover_stage(feeds))]
+    for feed in feeds:
+        stages.append(
+            Stage(f"validate_{feed.name}", _validate_stage(feed), depends_on=("discover",), needs_connection=False)
         )
-        events_loaded = copy_file_to_raw(
-            conn,
-            files["events"],
-            args.stage,
-            "RAW.CLAIMS_EVENTS_NIGHTLY",
-            args.file_format,
-            "events",
+    for feed in feeds:
+        stages.append(Stage(f"load_{feed.name}", _load_stage(feed), depends_on=(f"validate_{feed.name}",)))
+    stages.append(
+        Stage("controls", _controls_stage(feeds), depends_on=tuple(f"load_{feed.name}" for feed in feeds))
+    )
+    for feed in promoted:
+        stages.append(Stage(f"promote_{feed.name}", _promote_stage(feed), depends_on=("controls",)))
+    stages.append(
+        Stage(
+            "promote_int",
+            promote_int_stage,
+            depends_on=tuple(f"promote_{feed.name}" for feed in promoted) or ("controls",),
         )
+    )
+    stages.append(Stage("refresh_gold", _refresh_gold_stage(feeds), depends_on=("promote_int",)))
+    if policy is not None:
+        stages = [
+            replace(stage, run=_sized(stage.name, stage.run, policy)) if stage.needs_connection else stage
+            for stage in stages
+        ]
+    return stages
 
-        # Execute metadata-driven controls C1..C7 and block promotion on failures.
-        summary = run_controls(
-            conn,
+
+def run_pipeline(
+    checkpoint: Checkpoint,
+    connect=get_connection,
+    policy: WarehousePolicy | None = None,
+) -> DagResult:
+    """Run (or resume) the nightly DAG for a checkpoint."""
+    feeds = load_feeds(checkpoint.params.get("datasets", DATASETS_PATH))
+    max_workers = int(checkpoint.params.get("max_parallel", DEFAULT_MAX_PARALLEL))
+    if connect is get_connection:
+        # Stages beyond the pool size would only queue for a connection.
+        max_workers = min(max_workers, get_pool().max_size)
+        if policy is None and backend_name() != "local":
+            policy = WarehousePolicy.from_config()
+    return DagRunner(build_stages(feeds, policy), checkpoint, connect, max_workers=max_workers).run()
+
+
+def record_query_stats(checkpoint: Checkpoint, connect=get_connection) -> int:
+    """Harvest the run's tagged query history; failures never fail the run."""
+    started = [entry["started_at"] for entry in checkpoint.stages.values() if entry.get("started_at")]
+    if not started:
+        return 0
+    try:
+        with span("harvest_query_stats", kind="stage"), connect() as conn:
+            return harvest_query_stats(conn, checkpoint.run_id, min(started))
+    except Exception as exc:
+        get_logger(__name__).warning("query stats harvest failed: %s", exc)
+        return 0
+
+
+def record_control_trend(checkpoint: Checkpoint, connect=get_connection) -> int:
+    """Upsert the run's control results into CTRL.CONTROL_TREND_DAILY.
+
+    Runs whose controls stage never finished are skipped, and failures only
+    log, so the trend never fails the run.
+    """
+    if checkpoint.stages.get("controls", {}).get("status") not in (COMPLETED, BLOCKED):
+        return 0
+    try:
+        with span("refresh_control_trend", kind="stage"), connect() as conn:
+            return refresh_control_trend(conn, checkpoint.run_id, checkpoint.batch_date)
+    except Exception as exc:
+        get_logger(__name__).warning("control trend refresh failed: %s", exc)
+        return 0
+
+
+def record_run_metrics(result: DagResult | None, elapsed_seconds: float) -> None:
+    """Set the run-level gauges; a run that raised counts as failed."""
+    RUN_DURATION.set(elapsed_seconds)
+    LAST_RUN_SUCCESS.set(1 if result is not None and result.ok else 0)
+    LAST_RUN_TIMESTAMP.set(time.time())
+
+
+def write_metrics(path: str | Path) -> Path | None:
+    """Write the metrics textfile; a failed write never fails the run."""
+    try:
+        return write_textfile(path)
+    except OSError as exc:
+        get_logger(__name__).warning("metrics textfile write failed (%s): %s", path, exc)
+        return None
+
+
+def main() -> int:
+    """Run the pipeline stages: ingest, control, and promotion."""
+    args = parse_args()
+    if args.resume:
+        checkpoint = Checkpoint.load(RUN_LOG_DIR, args.resume)
+    else:
+        batch_date = parse_batch_date(args.batch_date)
+        # Unique identifier ties all audit/control records for one execution.
+        run_id = (
+            f"run_{batch_date}_"
+            f"{datetime.now(timezone.utc).strftime('%H%M%S')}"
+        )
+        checkpoint = Checkpoint.create(
+            RUN_LOG_DIR,
             run_id,
             batch_date,
-            files=files,
-            loaded_counts={"snapshot": snapshot_loaded, "events": events_loaded},
+            {
+                "stage": args.stage,
+                "file_format": args.file_format,
+                "datasets": args.datasets,
+                "input_dir": args.input_dir,
+                "max_parallel": args.max_parallel,
+            },
         )
-        if summary.blocking_failures > 0:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE CTRL.RUN_AUDIT
-                    SET end_ts = CURRENT_TIMESTAMP(),
-                        status = 'FAILED'
-                    WHERE run_id = %(run_id)s
-                    """,
-                    {"run_id": run_id},
-                )
-            return 1
-
-        # Promote clean snapshot data into INT layer.
-        promoted = promote_snapshot_to_int(conn, batch_date)
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO CTRL.PROMOTION_HISTORY (
-                  run_id,
-                  dataset_name,
-                  status
-                )
-                SELECT
-                  %(run_id)s,
-                  %(dataset_name)s,
-                  %(status)s
-                """,
-                {
-                    "run_id": run_id,
-                    "dataset_name": "CLAIMS_SNAPSHOT",
-                    "status": "PROMOTED",
-                },
-            )
-            cur.execute(
-                """
-                UPDATE CTRL.RUN_AUDIT
-                SET end_ts = CURRENT_TIMESTAMP(),
-                    status = 'PASSED',
-                    record_count = %(record_count)s
-                WHERE run_id = %(run_id)s
-                """,
-                {"record_count": promoted, "run_id": run_id},
-            )
+
+    configure_logging()
+    started = time.perf_counter()
+    periodic = (
+        PeriodicTextfileWriter(args.metrics_file, args.metrics_interval)
+        if args.metrics_interval > 0
+        else nullcontext()
+    )
+    # Every record logged during the run (stage threads included) carries these.
+    with log_context(run_id=checkpoint.run_id, batch_date=checkpoint.batch_date):
+        with start_trace(checkpoint.run_id) as tracer, periodic:
+            result = None
+            try:
+                with span("nightly_job", kind="run", run_id=checkpoint.run_id, batch_date=checkpoint.batch_date):
+                    result = run_pipeline(checkpoint)
+                    record_control_trend(checkpoint)
+                    # The local backend has no query history to harvest.
+                    if backend_name() != "local":
+                        record_query_stats(checkpoint)
+            finally:
+                trace_path = tracer.export(RUN_LOG_DIR)
+                record_run_metrics(result, time.perf_counter() - started)
+                # The periodic writer does its final write on exit instead.
+                if not args.metrics_interval:
+                    write_metrics(args.metrics_file)
+        summary = tracer.summary()
+        get_logger(__name__).info(
+            "critical path: %s (%.0f ms); trace at %s",
+            " > ".join(item["name"] for item in summary["critical_path"]),
+            summary["total_ms"],
+            trace_path,
+        )
+    if result.skipped:
+        print(f"{checkpoint.run_id}: resumed, skipped {', '.join(result.skipped)}")
+    if not result.ok:
+        print(f"{checkpoint.run_id}: {result.status} at {result.failed_stage}: {result.error}")
+        return 1
     return 0
 
 
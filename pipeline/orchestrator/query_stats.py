@@ -0,0 +1,71 @@
+"""Post-run harvest of tagged Snowflake query history into CTRL.RUN_QUERY_STATS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# INFORMATION_SCHEMA.QUERY_HISTORY has no ingestion latency (ACCOUNT_USAGE
+# lags by up to 45 minutes); 10000 is its largest RESULT_LIMIT.
+QUERY_HISTORY_SOURCE = """TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(
+        END_TIME_RANGE_START => %(since)s::TIMESTAMP_LTZ,
+        RESULT_LIMIT => 10000
+      ))"""
+
+
+def harvest_query_stats(
+    conn: Any,
+    run_id: str,
+    since: str,
+    *,
+    history_source: str = QUERY_HISTORY_SOURCE,
+) -> int:
+    """Aggregate a run's tagged queries per stage and control; return rows written.
+
+    Queries carry ``QUERY_TAG = run_id:stage:control_id`` (see
+    ``pipeline.common.tracing``), so one grouped read of the history covers
+    the whole run. Re-harvesting a run replaces its earlier rows.
+    ``history_source`` lets tests point at a stand-in table with the same
+    columns.
+    """
+    insert_sql = f"""
+      INSERT INTO CTRL.RUN_QUERY_STATS (
+        run_id,
+        stage_name,
+        control_id,
+        warehouse_name,
+        warehouse_size,
+        query_count,
+        total_elapsed_ms,
+        execution_ms,
+        queued_ms,
+        bytes_scanned,
+        partitions_scanned,
+        partitions_total
+      )
+      SELECT
+        %(run_id)s,
+        NULLIF(SPLIT_PART(query_tag, ':', 2), '') AS stage_name,
+        NULLIF(SPLIT_PART(query_tag, ':', 3), '') AS control_id,
+        warehouse_name,
+        warehouse_size,
+        COUNT(*),
+        SUM(total_elapsed_time),
+        SUM(execution_time),
+        SUM(
+          COALESCE(queued_provisioning_time, 0)
+          + COALESCE(queued_repair_time, 0)
+          + COALESCE(queued_overload_time, 0)
+        ),
+        SUM(bytes_scanned),
+        SUM(partitions_scanned),
+        SUM(partitions_total)
+      FROM {history_source}
+      WHERE SPLIT_PART(query_tag, ':', 1) = %(run_id)s
+      GROUP BY 2, 3, 4, 5
+    """
+    params = {"run_id": run_id, "since": since}
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM CTRL.RUN_QUERY_STATS WHERE run_id = %(run_id)s", params)
+        cur.execute(insert_sql, params)
+        rowcount = cur.rowcount
+    return rowcount if isinstance(rowcount, int) and rowcount > 0 else 0
@@ -0,0 +1,150 @@
+"""Batched RUN_AUDIT and PROMOTION_HISTORY writes for one pipeline run."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from pipeline.promote.promote_int_gold import PromotionResult
+
+PARAM_PATTERN = re.compile(r"%\((\w+)\)s")
+
+
+class RunBookkeeper:
+    """Queues audit statements and sends them in one request per stage boundary.
+
+    Statements run in queue order inside the caller's transaction, so the
+    audit trail is the same as issuing them one by one.
+    """
+
+    def __init__(self, conn: Any, run_id: str) -> None:
+        self._conn = conn
+        self._run_id = run_id
+        self._queue: list[tuple[str, dict[str, Any]]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of statements waiting for the next flush."""
+        return len(self._queue)
+
+    def queue(self, sql: str, params: dict[str, Any] | None = None) -> None:
+        """Append one statement to the next flush."""
+        self._queue.append((sql.strip().rstrip(";"), dict(params or {})))
+
+    def start(self, dataset_name: str, batch_date: str, file_name: str) -> None:
+        """Queue the STARTED audit row for this run."""
+        self.queue(
+            """
+            INSERT INTO CTRL.RUN_AUDIT (
+              run_id,
+              dataset_name,
+              batch_date,
+              file_name,
+              start_ts,
+              status,
+              record_count
+            )
+            SELECT
+              %(run_id)s,
+              %(dataset_name)s,
+              %(batch_date)s::DATE,
+              %(file_name)s,
+              CURRENT_TIMESTAMP(),
+              'STARTED',
+              0
+            """,
+            {
+                "run_id": self._run_id,
+                "dataset_name": dataset_name,
+                "batch_date": batch_date,
+                "file_name": file_name,
+            },
+        )
+
+    def record_promotion(self, dataset_name: str, batch_date: str, result: PromotionResult) -> None:
+        """Queue one PROMOTION_HISTORY row."""
+        self.queue(
+            """
+            INSERT INTO CTRL.PROMOTION_HISTORY (
+              run_id,
+              dataset_name,
+              status,
+              batch_date,
+              inserted_count,
+              updated_count,
+              unchanged_count,
+              source_row_count,
+              dedup_dropped_count
+            )
+            SELECT
+              %(run_id)s,
+              %(dataset_name)s,
+              %(status)s,
+              %(batch_date)s::DATE,
+              %(inserted_count)s,
+              %(updated_count)s,
+              %(unchanged_count)s,
+              %(source_row_count)s,
+              %(dedup_dropped_count)s
+            """,
+            {
+                "run_id": self._run_id,
+                "dataset_name": dataset_name,
+                "status": "PROMOTED",
+                "batch_date": batch_date,
+                "inserted_count": result.inserted,
+                "updated_count": result.updated,
+                "unchanged_count": result.unchanged,
+                "source_row_count": result.source_rows,
+                "dedup_dropped_count": result.dedup_dropped,
+            },
+        )
+
+    def finish(self, status: str, record_count: int | None = None) -> None:
+        """Queue the final audit update (PASSED keeps record_count, FAILED does not)."""
+        if record_count is None:
+            self.queue(
+                """
+                UPDATE CTRL.RUN_AUDIT
+                SET end_ts = CURRENT_TIMESTAMP(),
+                    status = %(status)s
+                WHERE run_id = %(run_id)s
+                """,
+                {"status": status, "run_id": self._run_id},
+            )
+            return
+        self.queue(
+            """
+            UPDATE CTRL.RUN_AUDIT
+            SET end_ts = CURRENT_TIMESTAMP(),
+                status = %(status)s,
+                record_count = %(record_count)s
+            WHERE run_id = %(run_id)s
+            """,
+            {"status": status, "record_count": record_count, "run_id": self._run_id},
+        )
+
+    def flush(self) -> None:
+        """Send queued statements as a single (multi-statement) request."""
+        if not self._queue:
+            return
+        statements, params = _combine(self._queue)
+        with self._conn.cursor() as cur:
+            if len(statements) == 1:
+                cur.execute(statements[0], params)
+            else:
+                cur.execute(";\n".join(statements), params, num_statements=len(statements))
+        self._queue.clear()
+
+
+def _combine(queue: list[tuple[str, dict[str, Any]]]) -> tuple[list[str], dict[str, Any]]:
+    """Prefix parameter names per statement so one bind mapping serves all."""
+    if len(queue) == 1:
+        return [queue[0][0]], queue[0][1]
+    statements: list[str] = []
+    params: dict[str, Any] = {}
+    for index, (sql, statement_params) in enumerate(queue):
+        prefix = f"s{index}_"
+        statements.append(PARAM_PATTERN.sub(lambda match: f"%({prefix}{match.group(1)})s", sql))
+        params.update({f"{prefix}{key}": value for key, value in statement_params.items()})
+    return statements, params
@@ -0,0 +1,310 @@
+"""Per-stage warehouse sizing from the workload estimates known at run time."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from pipeline.common.logging import get_logger
+from pipeline.common.tracing import span
+from pipeline.common.utils import load_yaml
+
+WAREHOUSE_POLICY_PATH = "config/env.dev.yaml"
+# Env config to read the policy from; environments opt in through their own file.
+WAREHOUSE_POLICY_ENV = "PIPELINE_WAREHOUSE_POLICY_CONFIG"
+# Snowflake warehouse sizes, smallest first.
+WAREHOUSE_SIZES = ("XSMALL", "SMALL", "MEDIUM", "LARGE", "XLARGE", "XXLARGE", "XXXLARGE", "X4LARGE")
+BASES = ("file_bytes", "rows")
+MODES = ("resize", "switch")
+# Warehouse names are spliced into SQL (identifiers cannot be bound).
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
+ConnectionFactory = Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class SizingRule:
+    """Size the stages matching ``stages`` by one workload estimate."""
+
+    stages: tuple[str, ...]
+    basis: str
+    # (inclusive upper bound, size); a None bound closes the list.
+    tiers: tuple[tuple[int | None, str], ...]
+
+    def matches(self, stage_name: str) -> bool:
+        return any(fnmatch.fnmatchcase(stage_name, pattern) for pattern in self.stages)
+
+    def size_for(self, estimate: int) -> str:
+        for up_to, size in self.tiers:
+            if up_to is None or estimate <= up_to:
+                return size
+        return self.tiers[-1][1]
+
+
+@dataclass(frozen=True)
+class SizingDecision:
+    """Warehouse chosen for one stage and the estimate behind it."""
+
+    stage: str
+    size: str
+    warehouse: str
+    basis: str | None = None
+    estimate: int | None = None
+
+
+def workload_estimate(stage_name: str, outputs: dict[str, dict[str, Any]]) -> dict[str, int]:
+    """File bytes and rows for a stage, from upstream discover/validate/load outputs.
+
+    Per-feed stages (``load_snapshot``) count their feed only; run-wide
+    stages (``controls``, ``promote_int``) count every feed.
+    """
+    files = (outputs.get("discover") or {}).get("files") or {}
+    feed = stage_name.partition("_")[2]
+    names = [feed] if feed in files else list(files)
+    file_bytes = 0
+    rows = 0
+    for name in names:
+        path = Path(files[name])
+        if path.is_file():
+            file_bytes += path.stat().st_size
+        loaded = (outputs.get(f"load_{name}") or {}).get("loaded")
+        validated = (outputs.get(f"validate_{name}") or {}).get("row_count")
+        rows += int(loaded if loaded is not None else validated or 0)
+    return {"file_bytes": file_bytes, "rows": rows}
+
+
+class WarehousePolicy:
+    """Resizes (or switches) the warehouse around stages that need more compute.
+
+    ``resize`` mode alters the shared run warehouse through its own autocommit
+    connection, so the DDL never commits a stage's open transaction. Stages
+    run in parallel, so the warehouse holds the largest size any running stage
+    asked for and drops back when none needs it. The size is chosen under a
+    lock but the ALTER runs outside it, serialised so a superseded resize is
+    skipped. The first failed ALTER turns resizing off for the rest of the run.
+    ``switch`` mode instead points the stage's session at the warehouse mapped
+    to the size, then restores the default.
+    """
+
+    def __init__(
+        self,
+        warehouse: str,
+        default_size: str,
+        rules: list[SizingRule],
+        *,
+        mode: str = "resize",
+        warehouses: dict[str, str] | None = None,
+        control_connect: ConnectionFactory | None = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown warehouse policy mode {mode!r}; expected one of {MODES}")
+        self.warehouse = warehouse
+        self.default_size = default_size
+        self.rules = list(rules)
+        self.mode = mode
+        self.warehouses = dict(warehouses or {})
+        self._control_connect = control_connect
+        self._lock = threading.Lock()
+        self._requests: Counter[str] = Counter()
+        # Unknown until the first resize, so a size left over from a crashed run is corrected.
+        self._current: str | None = None
+        # Bumped per planned resize; only the latest plan is applied.
+        self._generation = 0
+        self._resize_lock = threading.Lock()
+        self._disabled = False
+        if mode == "switch":
+            sizes = {default_size} | {size for rule in self.rules for _up_to, size in rule.tiers}
+            unmapped = sorted(sizes - set(self.warehouses))
+            if unmapped:
+                raise ValueError(f"Switch mode needs a warehouse for sizes: {', '.join(unmapped)}")
+
+    @classmethod
+    def from_config(
+        cls,
+        path: str | Path | None = None,
+        *,
+        control_connect: ConnectionFactory | None = None,
+    ) -> "WarehousePolicy | None":
+        """Build the policy from ``warehouse_policy`` in the env config; None when disabled.
+
+        The config is ``path``, else ``PIPELINE_WAREHOUSE_POLICY_CONFIG``, else
+        the dev config, which ships with the policy disabled.
+        """
+        path = path or os.getenv(WAREHOUSE_POLICY_ENV) or WAREHOUSE_POLICY_PATH
+        payload = load_yaml(path)
+        spec = payload.get("warehouse_policy") or {}
+        if not spec.get("enabled", False):
+            return None
+        # The run warehouse: explicit, else the one sessions connect to.
+        warehouse = str(
+            spec.get("warehouse")
+            or os.getenv("SNOWFLAKE_WAREHOUSE")
+            or (payload.get("snowflake") or {}).get("warehouse")
+            or ""
+        )
+        default_size = _size(spec.get("default_size") or payload.get("warehouse_size") or "XSMALL", path)
+        warehouses = {
+            _size(size, path): _identifier(str(name), path)
+            for size, name in (spec.get("warehouses") or {}).items()
+        }
+        rules = [_rule(item, path) for item in spec.get("rules") or []]
+        return cls(
+            _identifier(warehouse, path),
+            default_size,
+            rules,
+            mode=str(spec.get("mode", "resize")),
+            warehouses=warehouses,
+            control_connect=control_connect,
+        )
+
+    def decide(self, stage_name: str, outputs: dict[str, dict[str, Any]]) -> SizingDecision:
+        """Pick the size for a stage; stages no rule matches get the default."""
+        for rule in self.rules:
+            if rule.matches(stage_name):
+                estimate = workload_estimate(stage_name, outputs)[rule.basis]
+                size = rule.size_for(estimate)
+                return SizingDecision(stage_name, size, self._warehouse_for(size), rule.basis, estimate)
+        return SizingDecision(stage_name, self.default_size, self._warehouse_for(self.default_size))
+
+    @contextmanager
+    def sized(self, conn: Any, stage_name: str, outputs: dict[str, dict[str, Any]]) -> Iterator[SizingDecision]:
+        """Run a block on the warehouse size the stage's workload calls for."""
+        decision = self.decide(stage_name, outputs)
+        with span(
+            "warehouse_sizing",
+            stage=stage_name,
+            mode=self.mode,
+            size=decision.size,
+            warehouse=decision.warehouse,
+            basis=decision.basis,
+            estimate=decision.estimate,
+        ) as item:
+            action = self._acquire(conn, decision)
+            if item is not None:
+                item.set(action=action)
+        try:
+            yield decision
+        finally:
+            with span("warehouse_restore", stage=stage_name, mode=self.mode) as item:
+                action = self._release(conn, decision)
+                if item is not None:
+                    item.set(action=action)
+
+    def _warehouse_for(self, size: str) -> str:
+        return self.warehouses[size] if self.mode == "switch" else self.warehouse
+
+    def _acquire(self, conn: Any, decision: SizingDecision) -> str:
+        if self.mode == "switch":
+            if decision.warehouse == self._warehouse_for(self.default_size):
+                return "none"
+            return _apply(conn, f"USE WAREHOUSE {decision.warehouse}", f"use {decision.warehouse}")
+        with self._lock:
+            self._requests[decision.size] += 1
+        return self._resize()
+
+    def _release(self, conn: Any, decision: SizingDecision) -> str:
+        if self.mode == "switch":
+            default = self._warehouse_for(self.default_size)
+            if decision.warehouse == default:
+                return "none"
+            return _apply(conn, f"USE WAREHOUSE {default}", f"use {default}")
+        with self._lock:
+            self._requests[decision.size] -= 1
+            if self._requests[decision.size] <= 0:
+                del self._requests[decision.size]
+        return self._resize()
+
+    def _resize(self) -> str:
+        with self._lock:
+            if self._disabled:
+                return "disabled"
+            # The largest size any running stage asked for, else the default.
+            target = max(self._requests, key=WAREHOUSE_SIZES.index, default=self.default_size)
+            if target == self._current:
+                return "none"
+            upsizing = self._current is None or WAREHOUSE_SIZES.index(target) > WAREHOUSE_SIZES.index(self._current)
+            self._current = target
+            self._generation += 1
+            generation = self._generation
+        sql = f"ALTER WAREHOUSE {self.warehouse} SET WAREHOUSE_SIZE = {target}"
+        if upsizing:
+            # Heavy stages should start on the new size, not on the old one mid-resize.
+            sql += " WAIT_FOR_COMPLETION = TRUE"
+        # Other stages keep planning while the ALTER runs; only ALTERs queue here.
+        with self._resize_lock:
+            if self._disabled:
+                return "disabled"
+            if generation != self._generation:
+                # A later plan covers every running stage and applies after this one.
+                return "superseded"
+            connect = self._control_connect or _autocommit_connection
+            try:
+                with connect() as control:
+                    action = _apply(control, sql, f"resize {target}")
+            except Exception as exc:
+                action = _failed(sql, exc)
+            if action == "failed":
+                # Retrying per stage would only repeat the error (e.g. missing MODIFY).
+                with self._lock:
+                    self._disabled = True
+                get_logger(__name__).warning(
+                    "warehouse resizing disabled for the rest of the run; %s stays at its current size",
+                    self.warehouse,
+                )
+        return action
+
+
+def _autocommit_connection() -> Any:
+    # Imported lazily: the connector is only needed when a policy is active.
+    from pipeline.common.snowflake_client import get_pool
+
+    return get_pool(autocommit=True).connection()
+
+
+def _apply(conn: Any, sql: str, action: str) -> str:
+    """Run one sizing statement; sizing is an optimisation, so failures only log."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+    except Exception as exc:
+        return _failed(sql, exc)
+    return action
+
+
+def _failed(sql: str, exc: Exception) -> str:
+    # A broken session is discarded by the pool; never mask or cause a stage error.
+    get_logger(__name__).warning("warehouse sizing statement failed (%s): %s", sql, exc)
+    return "failed"
+
+
+def _size(value: Any, path: str | Path) -> str:
+    size = str(value).upper().replace("-", "")
+    if size not in WAREHOUSE_SIZES:
+        raise ValueError(f"Unknown warehouse size {value!r} in {path}; expected one of {WAREHOUSE_SIZES}")
+    return size
+
+
+def _identifier(value: str, path: str | Path) -> str:
+    if not IDENTIFIER_PATTERN.match(value or ""):
+        raise ValueError(f"Invalid warehouse name {value!r} in {path}")
+    return value
+
+
+def _rule(item: dict[str, Any], path: str | Path) -> SizingRule:
+    basis = item.get("basis")
+    if basis not in BASES:
+        raise ValueError(f"Warehouse rule basis must be one of {BASES}, got {basis!r} in {path}")
+    tiers = tuple(
+        (int(tier["up_to"]) if tier.get("up_to") is not None else None, _size(tier["size"], path))
+        for tier in item.get("tiers") or []
+    )
+    if not tiers or not item.get("stages"):
+        raise ValueError(f"Warehouse rule needs stages and tiers in {path}")
+    return SizingRule(stages=tuple(item["stages"]), basis=str(basis), tiers=tiers)
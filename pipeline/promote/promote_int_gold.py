@@ -2,11 +2,71 @@
 
 from __future__ import annotations
 
-from pipeline.common.raw_columns import snapshot_expressions
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable
+
+from pipeline.common.raw_columns import events_expressions, snapshot_expressions
+from pipeline.common.utils import load_yaml
+
+EVENT_COLUMNS = (
+    "batch_date",
+    "claim_id",
+    "event_ts",
+    "event_type",
+    "old_status",
+    "new_status",
+    "amount_delta",
+    "currency",
+    "source_system",
+    "note",
+    "loaded_at",
+)
+
+# Business columns compared by row_hash; batch_date and loaded_at change every
+# night without the claim itself changing, so they are deliberately excluded.
+SNAPSHOT_HASH_COLUMNS = (
+    "policy_id",
+    "customer_id",
+    "claim_amount_incurred",
+    "paid_amount_to_date",
+    "reserve_amount",
+    "loss_date",
+    "report_date",
+    "claim_status",
+    "pii_class",
+)
+# Session temporary table holding one batch's MERGE source. Unqualified, so it
+# lands in the session's schema; the next promotion on the session replaces it.
+SNAPSHOT_SOURCE_TABLE = "PROMOTE_SNAPSHOT_SRC"
+
+
+@dataclass(frozen=True)
+class PromotionResult:
+    """Row counts reported by one incremental promotion."""
+
+    inserted: int
+    updated: int
+    unchanged: int
+    # RAW rows read for the batch, and how many of them QUALIFY dedup dropped.
+    source_rows: int = 0
+    dedup_dropped: int = 0
+    # GOLD batch dates whose aggregates this promotion changed.
+    touched_batch_dates: tuple[str, ...] = ()
+
+    @property
+    def promoted(self) -> int:
+        """Rows written to INT (inserted or changed)."""
+        return self.inserted + self.updated
 
 
 def ensure_int_snapshot_table(conn) -> None:
-    """Create INT snapshot table if missing."""
+    """Create INT snapshot table if missing.
+
+    Tables created before hash-diff promotion need
+    ``sql/99_maintenance/upgrade_int_snapshot_row_hash.sql`` run once.
+    """
     ddl = """
       CREATE TABLE IF NOT EXISTS INT.CLAIMS_SNAPSHOT (
         batch_date DATE,
@@ -21,6 +81,7 @@ def ensure_int_snapshot_table(conn) -> None:
         claim_status STRING,
         pii_class STRING,
         loaded_at TIMESTAMP_NTZ,
+        row_hash NUMBER(19,0),
         PRIMARY KEY (claim_id)
       )
     """
@@ -28,54 +89,76 @@ def ensure_int_snapshot_table(conn) -> None:
         cur.execute(ddl)
 
 
-def promote_snapshot_to_int(conn, batch_date: str) -> int:
-    """Merge snapshot records from RAW into INT snapshot table."""
+def _snapshot_source_sql(cols: dict[str, str]) -> str:
+    """Deduplicated, hashed snapshot rows for one batch (MERGE source)."""
+    hash_expr = ",\n          ".join(f"src.{column}" for column in SNAPSHOT_HASH_COLUMNS)
+    return f"""
+      SELECT
+        src.batch_date,
+        src.claim_id,
+        src.policy_id,
+        src.customer_id,
+        src.claim_amount_incurred,
+        src.paid_amount_to_date,
+        src.reserve_amount,
+        src.loss_date,
+        src.report_date,
+        src.claim_status,
+        src.pii_class,
+        src.loaded_at,
+        -- RAW rows behind this claim, so callers can report dedup drops.
+        COUNT(*) OVER (PARTITION BY src.claim_id) AS raw_row_count,
+        HASH(
+          {hash_expr}
+        ) AS row_hash
+      FROM (
+        SELECT
+          {cols["batch_date"]} AS batch_date,
+          {cols["claim_id"]} AS claim_id,
+          {cols["policy_id"]} AS policy_id,
+          {cols["customer_id"]} AS customer_id,
+          {cols["claim_amount_incurred"]} AS claim_amount_incurred,
+          {cols["paid_amount_to_date"]} AS paid_amount_to_date,
+          {cols["reserve_amount"]} AS reserve_amount,
+          {cols["loss_date"]} AS loss_date,
+          {cols["report_date"]} AS report_date,
+          {cols["claim_status"]} AS claim_status,
+          {cols["pii_class"]} AS pii_class,
+          {cols["loaded_at"]} AS loaded_at
+        FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
+        WHERE {cols["batch_date"]} = %(batch_date)s::DATE
+      ) AS src
+      -- Deduplicate source rows so one claim_id maps to one merge row.
+      -- This avoids Snowflake's "duplicate row detected during DML action"
+      -- when the same claim appears multiple times in RAW for a batch.
+      QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY src.claim_id
+        ORDER BY src.loaded_at DESC NULLS LAST
+      ) = 1
+    """
+
+
+def promote_snapshot_to_int(conn, batch_date: str) -> PromotionResult:
+    """Merge snapshot records from RAW into INT snapshot table.
+
+    Matched claims are only rewritten when their row_hash differs, so an
+    unchanged claim keeps the batch_date of the batch that last changed it.
+    The deduplicated source is materialised once in a temporary table that
+    the preview, the MERGE and the dedup counts all read.
+    """
     # Safety net for first-time environments.
     ensure_int_snapshot_table(conn)
     cols = snapshot_expressions(conn)
+    stage_sql = f"""
+      CREATE OR REPLACE TEMPORARY TABLE {SNAPSHOT_SOURCE_TABLE} AS
+      {_snapshot_source_sql(cols)}
+    """
     merge_sql = f"""
       MERGE INTO INT.CLAIMS_SNAPSHOT AS tgt
-      USING (
-        SELECT
-          src.batch_date,
-          src.claim_id,
-          src.policy_id,
-          src.customer_id,
-          src.claim_amount_incurred,
-          src.paid_amount_to_date,
-          src.reserve_amount,
-          src.loss_date,
-          src.report_date,
-          src.claim_status,
-          src.pii_class,
-          src.loaded_at
-        FROM (
-          SELECT
-            {cols["batch_date"]} AS batch_date,
-            {cols["claim_id"]} AS claim_id,
-            {cols["policy_id"]} AS policy_id,
-            {cols["customer_id"]} AS customer_id,
-            {cols["claim_amount_incurred"]} AS claim_amount_incurred,
-            {cols["paid_amount_to_date"]} AS paid_amount_to_date,
-            {cols["reserve_amount"]} AS reserve_amount,
-            {cols["loss_date"]} AS loss_date,
-            {cols["report_date"]} AS report_date,
-            {cols["claim_status"]} AS claim_status,
-            {cols["pii_class"]} AS pii_class,
-            {cols["loaded_at"]} AS loaded_at
-          FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY
-          WHERE {cols["batch_date"]} = %(batch_date)s::DATE
-        ) AS src
-        -- Deduplicate source rows so one claim_id maps to one merge row.
-        -- This avoids Snowflake's "duplicate row detected during DML action"
-        -- when the same claim appears multiple times in RAW for a batch.
-        QUALIFY ROW_NUMBER() OVER (
-          PARTITION BY src.claim_id
-          ORDER BY src.loaded_at DESC NULLS LAST
-        ) = 1
-      ) AS src
+      USING {SNAPSHOT_SOURCE_TABLE} AS src
       ON tgt.claim_id = src.claim_id
-      WHEN MATCHED THEN UPDATE SET
+      -- Rows whose business columns are unchanged are left untouched.
+      WHEN MATCHED AND tgt.row_hash IS DISTINCT FROM src.row_hash THEN UPDATE SET
         batch_date = src.batch_date,
         policy_id = src.policy_id,
         customer_id = src.customer_id,
@@ -86,7 +169,8 @@ def promote_snapshot_to_int(conn, batch_date: str) -> int:
         report_date = src.report_date,
         claim_status = src.claim_status,
         pii_class = src.pii_class,
-        loaded_at = src.loaded_at
+        loaded_at = src.loaded_at,
+        row_hash = src.row_hash
       WHEN NOT MATCHED THEN INSERT (
         batch_date,
         claim_id,
@@ -99,7 +183,8 @@ def promote_snapshot_to_int(conn, batch_date: str) -> int:
         report_date,
         claim_status,
         pii_class,
-        loaded_at
+        loaded_at,
+        row_hash
       ) VALUES (
         src.batch_date,
         src.claim_id,
@@ -112,18 +197,297 @@ def promote_snapshot_to_int(conn, batch_date: str) -> int:
         src.report_date,
         src.claim_status,
         src.pii_class,
-        src.loaded_at
+        src.loaded_at,
+        src.row_hash
+      )
+    """
+    # Preview before merging: the source size, plus the older batch dates
+    # whose GOLD aggregates lose claims that change this run. Only the batch's
+    # claims are joined to INT.
+    preview_sql = f"""
+      SELECT
+        (SELECT COALESCE(SUM(raw_row_count), 0) FROM {SNAPSHOT_SOURCE_TABLE}) AS source_rows,
+        (SELECT COUNT(*) FROM {SNAPSHOT_SOURCE_TABLE}) AS merge_rows,
+        (
+          SELECT ARRAY_AGG(DISTINCT tgt.batch_date)
+          FROM {SNAPSHOT_SOURCE_TABLE} AS src
+          JOIN INT.CLAIMS_SNAPSHOT AS tgt
+            ON tgt.claim_id = src.claim_id
+          WHERE tgt.row_hash IS DISTINCT FROM src.row_hash
+            AND tgt.batch_date <> src.batch_date
+        ) AS displaced_batch_dates
+    """
+    with conn.cursor() as cur:
+        cur.execute(stage_sql, {"batch_date": batch_date})
+        cur.execute(preview_sql)
+        row = cur.fetchone()
+        source_rows = int(row[0] if row and row[0] is not None else 0)
+        merge_rows = int(row[1] if row and row[1] is not None else 0)
+        displaced = _as_date_strings(row[2] if row else None)
+        cur.execute(merge_sql)
+        inserted, updated = _merge_counts(cur)
+
+    touched = {batch_date} if inserted or updated else set()
+    touched.update(displaced)
+    return PromotionResult(
+        inserted=inserted,
+        updated=updated,
+        unchanged=max(merge_rows - inserted - updated, 0),
+        source_rows=source_rows,
+        dedup_dropped=source_rows - merge_rows,
+        touched_batch_dates=tuple(sorted(touched)),
+    )
+
+
+def ensure_int_events_table(conn) -> None:
+    """Create INT events table if missing."""
+    ddl = """
+      CREATE TABLE IF NOT EXISTS INT.CLAIMS_EVENTS (
+        batch_date DATE,
+        claim_id STRING,
+        event_ts TIMESTAMP_NTZ,
+        event_type STRING,
+        old_status STRING,
+        new_status STRING,
+        amount_delta NUMBER(18,2),
+        currency STRING,
+        source_system STRING,
+        note STRING,
+        loaded_at TIMESTAMP_NTZ,
+        PRIMARY KEY (claim_id, event_ts, event_type)
       )
     """
     with conn.cursor() as cur:
-        cur.execute(merge_sql, {"batch_date": batch_date})
+        cur.execute(ddl)
 
-    count_sql = """
-      SELECT COUNT(*)
-      FROM INT.CLAIMS_SNAPSHOT
-      WHERE batch_date = %(batch_date)s::DATE
+
+def event_key_columns(datasets_path: str = "config/datasets.yaml") -> list[str]:
+    """Return the events natural key declared in the dataset registry."""
+    datasets = load_yaml(datasets_path).get("datasets", {})
+    key_columns = (datasets.get("raw_events_claims") or {}).get("key_columns") or []
+    unknown = [column for column in key_columns if column not in EVENT_COLUMNS]
+    if not key_columns or unknown:
+        raise ValueError(f"Invalid raw_events_claims key_columns in {datasets_path}: {key_columns}")
+    return list(key_columns)
+
+
+def promote_events_to_int(
+    conn,
+    batch_date: str,
+    *,
+    datasets_path: str = "config/datasets.yaml",
+) -> PromotionResult:
+    """Insert events from the RAW batch that INT.CLAIMS_EVENTS does not hold yet.
+
+    Events are immutable facts, so the MERGE is insert-only: duplicates within
+    the batch collapse to the latest load and known keys are skipped.
+    """
+    ensure_int_events_table(conn)
+    cols = events_expressions(conn)
+    key_columns = event_key_columns(datasets_path)
+    select_list = ",\n            ".join(f"{cols[column]} AS {column}" for column in EVENT_COLUMNS)
+    partition_by = ", ".join(f"src.{column}" for column in key_columns)
+    # EQUAL_NULL so an event with an unparseable key part is still inserted once.
+    match_on = "\n        AND ".join(
+        f"EQUAL_NULL(tgt.{column}, src.{column})" for column in key_columns
+    )
+    merge_sql = f"""
+      MERGE INTO INT.CLAIMS_EVENTS AS tgt
+      USING (
+        SELECT
+          {", ".join(f"src.{column}" for column in EVENT_COLUMNS)}
+        FROM (
+          SELECT
+            {select_list}
+          FROM RAW.CLAIMS_EVENTS_NIGHTLY
+          WHERE {cols["batch_date"]} = %(batch_date)s::DATE
+        ) AS src
+        QUALIFY ROW_NUMBER() OVER (
+          PARTITION BY {partition_by}
+          ORDER BY src.loaded_at DESC NULLS LAST
+        ) = 1
+      ) AS src
+      ON {match_on}
+      WHEN NOT MATCHED THEN INSERT (
+        {", ".join(EVENT_COLUMNS)}
+      ) VALUES (
+        {", ".join(f"src.{column}" for column in EVENT_COLUMNS)}
+      )
+    """
+    # GROUP BY treats NULL key parts as one group, matching the QUALIFY partition.
+    source_sql = f"""
+      SELECT COALESCE(SUM(key_rows), 0), COUNT(*)
+      FROM (
+        SELECT COUNT(*) AS key_rows
+        FROM RAW.CLAIMS_EVENTS_NIGHTLY
+        WHERE {cols["batch_date"]} = %(batch_date)s::DATE
+        GROUP BY {", ".join(cols[column] for column in key_columns)}
+      )
     """
     with conn.cursor() as cur:
-        cur.execute(count_sql, {"batch_date": batch_date})
+        cur.execute(source_sql, {"batch_date": batch_date})
         row = cur.fetchone()
-    return int(row[0] if row else 0)
+        source_rows = int(row[0] if row and row[0] is not None else 0)
+        merge_rows = int(row[1] if row and len(row) > 1 and row[1] is not None else 0)
+        cur.execute(merge_sql, {"batch_date": batch_date})
+        inserted, _updated = _merge_counts(cur)
+
+    return PromotionResult(
+        inserted=inserted,
+        updated=0,
+        unchanged=max(merge_rows - inserted, 0),
+        source_rows=source_rows,
+        dedup_dropped=source_rows - merge_rows,
+    )
+
+
+# (dimension table, key column, INT fact table, source expression)
+DIMENSIONS = (
+    ("INT.DIM_POLICY", "policy_id", "INT.CLAIMS_SNAPSHOT", "policy_id"),
+    ("INT.DIM_CUSTOMER", "customer_id", "INT.CLAIMS_SNAPSHOT", "customer_id"),
+    ("INT.DIM_ACTOR", "actor", "INT.CLAIMS_EVENTS", "source_system"),
+)
+
+
+def dimension_statements(*, batch_scoped: bool) -> list[str]:
+    """CREATE IF NOT EXISTS plus one anti-join INSERT per dimension.
+
+    Batch-scoped inserts read the ``%(batch_date)s`` slice of INT (the
+    nightly path); otherwise the whole fact table is read, to seed keys that
+    were in INT before dimensions were maintained.
+    """
+    statements: list[str] = []
+    for table, key, _fact_table, _source in DIMENSIONS:
+        # Safety net for first-time environments, as for the fact tables.
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"{key} STRING, first_seen_at TIMESTAMP_NTZ, PRIMARY KEY ({key}))"
+        )
+    batch_filter = "batch_date = %(batch_date)s::DATE\n                AND " if batch_scoped else ""
+    for table, key, fact_table, source in DIMENSIONS:
+        statements.append(
+            f"""
+            INSERT INTO {table} ({key}, first_seen_at)
+            SELECT src.{key}, CURRENT_TIMESTAMP()
+            FROM (
+              SELECT DISTINCT {source} AS {key}
+              FROM {fact_table}
+              WHERE {batch_filter}{source} IS NOT NULL
+            ) AS src
+            WHERE NOT EXISTS (
+              SELECT 1 FROM {table} AS dim WHERE dim.{key} = src.{key}
+            )
+            """
+        )
+    return statements
+
+
+def promote_dimensions(conn, batch_date: str) -> dict[str, int]:
+    """Insert policy, customer and actor keys first seen in this batch.
+
+    Only the INT rows written for ``batch_date`` are scanned: hash-diff
+    promotion stamps changed claims with the current batch, and a new key can
+    only arrive on a changed claim or a new event. Keys already in INT before
+    dimensions were maintained are loaded once by ``scripts.seed_int_dimensions``.
+    All anti-joins go to Snowflake as one multi-statement request. Returns
+    rows inserted per table.
+    """
+    statements = dimension_statements(batch_scoped=True)
+    with conn.cursor() as cur:
+        cur.execute(
+            ";\n".join(statements),
+            {"batch_date": batch_date},
+            num_statements=len(statements),
+        )
+        rows: list[Any] = []
+        while True:
+            rows.append(cur.fetchone())
+            if not cur.nextset():
+                break
+    # Result sets arrive in statement order; the inserts are the last ones.
+    insert_rows = rows[-len(DIMENSIONS):]
+    insert_rows += [None] * (len(DIMENSIONS) - len(insert_rows))
+    return {
+        table: int(row[0]) if row and row[0] is not None else 0
+        for (table, *_rest), row in zip(DIMENSIONS, insert_rows)
+    }
+
+
+def _merge_counts(cur: Any) -> tuple[int, int]:
+    """Read (inserted, updated) from the single-row MERGE result set."""
+    row = cur.fetchone()
+    if not row:
+        return 0, 0
+    names = [str(col[0]).lower() for col in (cur.description or [])]
+    counts = dict(zip(names, row))
+    inserted = counts.get("number of rows inserted", row[0])
+    updated = counts.get("number of rows updated", row[1] if len(row) > 1 else 0)
+    return int(inserted or 0), int(updated or 0)
+
+
+def _as_date_strings(value: Any) -> set[str]:
+    """Normalize an ARRAY_AGG result (JSON text or list) to ISO date strings."""
+    if value is None:
+        return set()
+    items = json.loads(value) if isinstance(value, str) else value
+    return {
+        item.isoformat() if isinstance(item, date) else str(item)[:10]
+        for item in items
+        if item is not None
+    }
+
+
+def promote_int_to_gold(conn, batch_dates: Iterable[str]) -> int:
+    """Recompute GOLD.CLAIMS_MART rows for the given batch dates only.
+
+    Dates left with no INT claims are deleted from the mart. Returns the
+    number of batch dates refreshed.
+    """
+    dates = sorted(set(batch_dates))
+    if not dates:
+        return 0
+    merge_sql = """
+      MERGE INTO GOLD.CLAIMS_MART AS tgt
+      USING (
+        SELECT
+          d.batch_date,
+          COUNT(s.claim_id) AS claim_count,
+          COALESCE(SUM(s.claim_amount_incurred), 0)::NUMBER(18,2) AS total_amount,
+          COUNT_IF(s.claim_status = 'PAID') AS paid_claim_count,
+          COUNT_IF(s.claim_status = 'DENIED') AS denied_claim_count,
+          CURRENT_TIMESTAMP() AS refresh_ts
+        FROM (
+          SELECT value::DATE AS batch_date
+          FROM TABLE(FLATTEN(INPUT => PARSE_JSON(%(batch_dates)s)))
+        ) AS d
+        LEFT JOIN INT.CLAIMS_SNAPSHOT AS s
+          ON s.batch_date = d.batch_date
+        GROUP BY d.batch_date
+      ) AS src
+      ON tgt.batch_date = src.batch_date
+      WHEN MATCHED AND src.claim_count = 0 THEN DELETE
+      WHEN MATCHED THEN UPDATE SET
+        claim_count = src.claim_count,
+        total_amount = src.total_amount,
+        paid_claim_count = src.paid_claim_count,
+        denied_claim_count = src.denied_claim_count,
+        refresh_ts = src.refresh_ts
+      WHEN NOT MATCHED AND src.claim_count > 0 THEN INSERT (
+        batch_date,
+        claim_count,
+        total_amount,
+        paid_claim_count,
+        denied_claim_count,
+        refresh_ts
+      ) VALUES (
+        src.batch_date,
+        src.claim_count,
+        src.total_amount,
+        src.paid_claim_count,
+        src.denied_claim_count,
+        src.refresh_ts
+      )
+    """
+    with conn.cursor() as cur:
+        cur.execute(merge_sql, {"batch_dates": json.dumps(dates)})
+    return len(dates)
@@ -0,0 +1,233 @@
+"""
+Throughput benchmarks for ingest validation, controls and promotion.
+
+Generates a synthetic nightly drop (see ``scripts.synthetic_claims``) per row
+count and times each pipeline step over it:
+
+- schema_validation: ``validate_csv_against_schema`` on both feeds
+- row_count / file_hash: ``csv_row_count`` and ``sha256_for_file`` on both feeds
+- raw_load: PUT/COPY into RAW
+- control_evaluation: the full control register (SQL rendering and execution)
+- promotion: snapshot/events MERGE SQL generation and execution into INT
+
+The database steps run on the DuckDB local backend and are reported as
+skipped when the ``local`` extra is not installed. Each case is run once for
+timing and once under ``tracemalloc`` for the Python heap peak, so tracing
+overhead does not skew rows/sec. Results land in
+``artifacts/benchmarks/benchmark_<UTC timestamp>.json``.
+
+Usage:
+    python -m scripts.benchmark [--rows 10000 --rows 1000000] [--seed 0] \
+        [--negative-rate 0.001] [--duplicate-rate 0.001] [--bad-event-type-rate 0.001] \
+        [--no-memory] [--out-dir artifacts/benchmarks]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from pipeline.common.datasets import DATASETS_PATH, load_feeds
+from pipeline.common.local_backend import LocalDatabase, bootstrap_local, duckdb
+from pipeline.common.raw_columns import tables_columns
+from pipeline.common.utils import csv_row_count, sha256_for_file
+from pipeline.controls.run_controls import run_controls
+from pipeline.ingest import schema_validate
+from pipeline.ingest.load_to_snowflake import copy_file_to_raw
+from pipeline.promote.promote_int_gold import promote_events_to_int, promote_snapshot_to_int
+from scripts.synthetic_claims import AnomalyRates, write_nightly_drop
+
+BENCHMARK_DIR = "artifacts/benchmarks"
+BATCH_DATE = "2026-02-21"
+STAGE = "@RAW.CLAIMS_NIGHTLY_STAGE"
+FILE_FORMAT = "RAW.CSV_FF"
+DB_CASES = ("raw_load", "control_evaluation", "promotion")
+
+
+@dataclass
+class CaseResult:
+    """Timing and memory for one case at one scale."""
+
+    case: str
+    rows: int
+    seconds: float | None = None
+    rows_per_sec: float | None = None
+    peak_memory_mib: float | None = None
+    skipped: str | None = None
+
+
+def run_benchmarks(
+    row_counts: list[int],
+    *,
+    seed: int = 0,
+    rates: AnomalyRates = AnomalyRates(),
+    measure_memory: bool = True,
+    work_dir: str | Path | None = None,
+    datasets_path: str | Path = DATASETS_PATH,
+) -> list[CaseResult]:
+    """Run every case for each row count and return the results in order."""
+    feeds = load_feeds(datasets_path)
+    results: list[CaseResult] = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as scratch:
+        for rows in row_counts:
+            drop = Path(scratch) / f"rows_{rows}"
+            stats = write_nightly_drop(drop, rows, BATCH_DATE, seed=seed, rates=rates, datasets_path=datasets_path)
+            files = {name: item.path for name, item in stats.items()}
+            total_rows = sum(item.rows for item in stats.values())
+
+            timed = _run_cases(files, feeds, trace_memory=False)
+            traced = _run_cases(files, feeds, trace_memory=True) if measure_memory else {}
+            for case, seconds in timed.items():
+                result = CaseResult(case=case, rows=total_rows)
+                if isinstance(seconds, str):
+                    result.skipped = seconds
+                else:
+                    result.seconds = round(seconds, 6)
+                    result.rows_per_sec = round(total_rows / seconds, 1) if seconds > 0 else None
+                    peak = traced.get(case)
+                    if isinstance(peak, int):
+                        result.peak_memory_mib = round(peak / (1024 * 1024), 3)
+                results.append(result)
+    return results
+
+
+def write_report(
+    results: list[CaseResult],
+    out_dir: str | Path = BENCHMARK_DIR,
+    *,
+    settings: dict[str, Any] | None = None,
+) -> Path:
+    """Persist results plus the environment they were measured in."""
+    generated_at = datetime.now(timezone.utc)
+    path = Path(out_dir) / f"benchmark_{generated_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "generated_at": generated_at.isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "schema_validator": "jsonschema" if schema_validate.Draft202012Validator else "required-columns fallback",
+        "duckdb": getattr(duckdb, "__version__", None),
+        "settings": settings or {},
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def _run_cases(files: dict[str, Path], feeds: list, *, trace_memory: bool) -> dict[str, float | int | str]:
+    """Return seconds (or, when tracing, peak bytes) per case; a string marks a skip."""
+    measured: dict[str, float | int | str] = {}
+
+    def measure(case: str, fn: Callable[[], Any]) -> None:
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                fn()
+                measured[case] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        else:
+            started = time.perf_counter()
+            fn()
+            measured[case] = time.perf_counter() - started
+
+    measure("schema_validation", lambda: [_validate(files[feed.name], feed.schema_path) for feed in feeds])
+    measure("row_count", lambda: [csv_row_count(files[feed.name]) for feed in feeds])
+    measure("file_hash", lambda: [sha256_for_file(files[feed.name]) for feed in feeds])
+
+    if duckdb is None:
+        measured.update({case: "duckdb not installed (pip install '.[local]')" for case in DB_CASES})
+        return measured
+
+    conn = LocalDatabase(":memory:").connect()
+    try:
+        bootstrap_local(conn)
+        loaded: dict[str, int] = {}
+
+        def load() -> None:
+            columns = tables_columns(conn, [feed.raw_table for feed in feeds])
+            for feed in feeds:
+                loaded[feed.name] = copy_file_to_raw(
+                    conn,
+                    files[feed.name],
+                    STAGE,
+                    feed.raw_table,
+                    FILE_FORMAT,
+                    feed.name,
+                    business_columns=feed.business_columns,
+                    target_columns=columns[feed.raw_table],
+                )
+            conn.commit()
+
+        def controls() -> None:
+            run_controls(conn, "run_benchmark", BATCH_DATE, files=files, loaded_counts=loaded)
+            conn.commit()
+
+        def promote() -> None:
+            promote_snapshot_to_int(conn, BATCH_DATE)
+            promote_events_to_int(conn, BATCH_DATE)
+            conn.commit()
+
+        measure("raw_load", load)
+        measure("control_evaluation", controls)
+        measure("promotion", promote)
+    finally:
+        conn.close()
+    return measured
+
+
+def _validate(path: Path, schema_path: str) -> None:
+    # Synthetic defects make some rows invalid on purpose; only the cost matters.
+    schema_validate.validate_csv_against_schema(path, schema_path)
+
+
+def main() -> None:
+    """CLI entrypoint: run the suite and write a JSON report."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, action="append", help="Snapshot rows per scale point (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--negative-rate", type=float, default=0.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--bad-pii-rate", type=float, default=0.0)
+    parser.add_argument("--bad-event-type-rate", type=float, default=0.0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--work-dir", help="Where generated files go (default: system temp)")
+    parser.add_argument("--out-dir", default=BENCHMARK_DIR)
+    args = parser.parse_args()
+    row_counts = args.rows or [10_000]
+    if min(row_counts) < 1:
+        parser.error("--rows must be at least 1")
+
+    rates = AnomalyRates(
+        negative_amount=args.negative_rate,
+        duplicate=args.duplicate_rate,
+        bad_pii_class=args.bad_pii_rate,
+        bad_event_type=args.bad_event_type_rate,
+    )
+    results = run_benchmarks(
+        row_counts,
+        seed=args.seed,
+        rates=rates,
+        measure_memory=not args.no_memory,
+        work_dir=args.work_dir,
+    )
+    path = write_report(results, args.out_dir, settings={"rows": row_counts, "seed": args.seed, **asdict(rates)})
+    for result in results:
+        if result.skipped:
+            print(f"{result.case:<20} {result.rows:>12} rows  skipped: {result.skipped}")
+            continue
+        memory = f"{result.peak_memory_mib:>10.1f} MiB" if result.peak_memory_mib is not None else ""
+        print(f"{result.case:<20} {result.rows:>12} rows  {result.rows_per_sec or 0:>14,.0f} rows/s{memory}")
+    print(f"Report: {path}")
+
+
+if __name__ == "__main__":
+    main()
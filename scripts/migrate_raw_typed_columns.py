@@ -0,0 +1,89 @@
+"""
+One-time migration of legacy positional RAW tables to typed batch columns.
+
+Adds typed BATCH_DATE (and snapshot amount) columns to COL_* RAW tables,
+backfills them from the positional strings, and clusters on BATCH_DATE so
+controls and promotion take the prunable BATCH_DATE branch.
+
+Usage:
+    python -m scripts.migrate_raw_typed_columns [--dry-run] [--resort]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from pipeline.common.raw_columns import LEGACY_TYPED_COLUMNS, table_columns
+from pipeline.common.snowflake_client import SnowflakeClient
+
+RAW_TABLES = {
+    "snapshot": "RAW.CLAIMS_SNAPSHOT_NIGHTLY",
+    "events": "RAW.CLAIMS_EVENTS_NIGHTLY",
+}
+
+
+def build_migration_statements(
+    table_name: str,
+    dataset_kind: str,
+    columns: set[str],
+    *,
+    resort: bool = False,
+) -> list[str]:
+    """Return idempotent statements that migrate one RAW table."""
+    if "COL_1" not in columns:
+        # Named layout: columns are already typed, only clustering may be missing.
+        if "BATCH_DATE" not in columns:
+            return []
+        return [f"ALTER TABLE {table_name} CLUSTER BY (BATCH_DATE)"]
+
+    typed_columns = LEGACY_TYPED_COLUMNS[dataset_kind]
+    statements = [
+        f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column} {sql_type}"
+        for column, sql_type, _position, _cast in typed_columns
+    ]
+    assignments = ",\n  ".join(
+        f"{column} = {cast.format(f'COL_{position}')}"
+        for column, _sql_type, position, cast in typed_columns
+    )
+    # Rows loaded after the COPY change already carry BATCH_DATE, so reruns are cheap.
+    statements.append(
+        f"UPDATE {table_name}\nSET\n  {assignments}\nWHERE BATCH_DATE IS NULL\n  AND COL_1 IS NOT NULL"
+    )
+    statements.append(f"ALTER TABLE {table_name} CLUSTER BY (BATCH_DATE)")
+    if resort:
+        # Optional immediate re-sort instead of waiting for automatic clustering.
+        statements.append(
+            f"INSERT OVERWRITE INTO {table_name} SELECT * FROM {table_name} ORDER BY BATCH_DATE"
+        )
+    return statements
+
+
+def main() -> None:
+    """CLI entrypoint for migrating both nightly RAW tables."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="Print statements only")
+    parser.add_argument("--resort", action="store_true", help="Rewrite tables sorted by BATCH_DATE")
+    args = parser.parse_args()
+
+    with SnowflakeClient() as client:
+        for dataset_kind, table_name in RAW_TABLES.items():
+            schema_name, _, bare_table = table_name.partition(".")
+            columns = table_columns(client.connection, schema_name, bare_table)
+            statements = build_migration_statements(
+                table_name,
+                dataset_kind,
+                columns,
+                resort=args.resort,
+            )
+            if not statements:
+                print(f"Skipping {table_name}: no BATCH_DATE column to cluster on")
+                continue
+            for stmt in statements:
+                print(f"Executing:\n{stmt}\n")
+                if not args.dry_run:
+                    client.execute(stmt)
+            print(f"Completed: {table_name}\n")
+
+
+if __name__ == "__main__":
+    main()
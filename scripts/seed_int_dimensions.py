@@ -0,0 +1,36 @@
+"""
+One-time seed of the INT dimensions from the full INT fact tables.
+
+The nightly job only adds keys first seen in the current batch's INT rows, so
+policies, customers and actors already in INT before dimensions were
+maintained are never picked up until their claim changes. This inserts every
+missing key once; it is idempotent, so rerunning it is harmless.
+
+Usage:
+    python -m scripts.seed_int_dimensions [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from pipeline.common.snowflake_client import SnowflakeClient
+from pipeline.promote.promote_int_gold import dimension_statements
+
+
+def main() -> None:
+    """CLI entrypoint for seeding DIM_POLICY, DIM_CUSTOMER and DIM_ACTOR."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="Print statements only")
+    args = parser.parse_args()
+
+    with SnowflakeClient() as client:
+        for stmt in dimension_statements(batch_scoped=False):
+            print(f"Executing:\n{stmt}\n")
+            if not args.dry_run:
+                client.execute(stmt)
+    print("Completed: INT dimensions seeded")
+
+
+if __name__ == "__main__":
+    main()
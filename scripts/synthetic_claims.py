@@ -0,0 +1,326 @@
+"""
+Deterministic synthetic nightly files for scale and throughput testing.
+
+Writes snapshot and events CSVs that follow ``schemas/*.json`` and the feed
+file names in ``config/datasets.yaml``. The same seed always yields the same
+bytes. Anomaly rates inject the defects the controls exist to catch:
+
+- negative amounts (C2): ``paid_amount_to_date`` below zero
+- duplicates (C8): an extra version of the previous claim_id
+- bad pii_class (C4, and schema validation): a class outside the taxonomy
+- bad event types (C5): ``ADJUSTMENT``, schema-valid but outside the
+  approved control taxonomy
+
+Rows are streamed, so 100M-row files only cost disk, not memory.
+
+Usage:
+    python -m scripts.synthetic_claims --batch-date 2026-02-21 --rows 1000000 \
+        [--events-per-claim 1.5] [--seed 7] [--negative-rate 0.001] \
+        [--duplicate-rate 0.001] [--bad-pii-rate 0.0] [--bad-event-type-rate 0.001] \
+        [--out-dir samples/nightly_drop]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+from pipeline.common.datasets import DATASETS_PATH, get_feed
+from pipeline.common.utils import parse_batch_date
+
+SNAPSHOT_HEADER = (
+    "batch_date", "source_system", "claim_id", "claim_version", "policy_id", "customer_id",
+    "employer_id", "provider_id", "claim_type", "lodgement_channel", "jurisdiction", "loss_date",
+    "report_date", "open_date", "liability_decision", "liability_decision_date", "close_date",
+    "claim_status", "status_effective_date", "injury_code", "injury_severity", "r_tw_flag",
+    "r_tw_date", "claim_amount_incurred", "paid_amount_to_date", "reserve_amount", "currency",
+    "sensitive_flag", "pii_class", "record_hash", "ingest_ts", "last_updated_ts",
+)
+EVENTS_HEADER = (
+    "batch_date", "claim_id", "event_ts", "event_type", "old_status", "new_status",
+    "amount_delta", "currency", "source_system", "note",
+)
+
+SOURCE_SYSTEMS = ("GUIDEWIRE", "CLAIMSYS")
+CLAIM_STATUSES = ("OPEN", "PENDING", "PAID", "DENIED", "CLOSED", "REOPENED")
+PII_CLASSES = ("NONE", "LOW", "MEDIUM", "HIGH")
+BAD_PII_CLASS = "RESTRICTED"
+# Event types the C5 control approves; ADJUSTMENT is in the schema enum only.
+EVENT_TYPES = ("CREATED", "UPDATED", "STATUS_CHANGE", "PAYMENT", "NOTE")
+BAD_EVENT_TYPE = "ADJUSTMENT"
+CLAIM_TYPES = ("WORKERS_COMP", "MOTOR_INJURY", "PUBLIC_LIABILITY")
+CHANNELS = ("PORTAL", "PHONE", "EMAIL", "BROKER")
+JURISDICTIONS = ("NSW", "VIC", "QLD", "WA", "SA", "TAS", "ACT", "NT")
+DECISIONS = ("ACCEPTED", "DENIED", "PENDING")
+SEVERITIES = ("MINOR", "MODERATE", "SEVERE")
+NOTES = ("lodged", "reviewed", "payment issued", "status updated", "file note")
+
+# Keyspaces for the foreign keys, so dimensions see realistic reuse.
+POLICY_KEYS = 200_000
+CUSTOMER_KEYS = 500_000
+
+
+@dataclass(frozen=True)
+class AnomalyRates:
+    """Per-row probabilities of each injected defect."""
+
+    negative_amount: float = 0.0
+    duplicate: float = 0.0
+    bad_pii_class: float = 0.0
+    bad_event_type: float = 0.0
+
+    def __post_init__(self) -> None:
+        for name, value in vars(self).items():
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} rate must be between 0 and 1, got {value}")
+
+
+@dataclass(frozen=True)
+class GenerationStats:
+    """What was written, including how many rows carry each defect."""
+
+    path: Path
+    rows: int
+    negative_amounts: int = 0
+    duplicates: int = 0
+    bad_pii_classes: int = 0
+    bad_event_types: int = 0
+
+
+def write_snapshot(
+    path: str | Path,
+    rows: int,
+    batch_date: str,
+    *,
+    seed: int = 0,
+    rates: AnomalyRates = AnomalyRates(),
+) -> GenerationStats:
+    """Write ``rows`` snapshot rows for one batch date."""
+    counts = {"negative": 0, "duplicate": 0, "bad_pii": 0}
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(SNAPSHOT_HEADER)
+        writer.writerows(_snapshot_rows(rows, batch_date, random.Random(f"{seed}:snapshot"), rates, counts))
+    return GenerationStats(
+        path=target,
+        rows=rows,
+        negative_amounts=counts["negative"],
+        duplicates=counts["duplicate"],
+        bad_pii_classes=counts["bad_pii"],
+    )
+
+
+def write_events(
+    path: str | Path,
+    rows: int,
+    batch_date: str,
+    *,
+    claims: int,
+    seed: int = 0,
+    rates: AnomalyRates = AnomalyRates(),
+) -> GenerationStats:
+    """Write ``rows`` event rows referencing the first ``claims`` claim ids."""
+    counts = {"bad_event_type": 0}
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(EVENTS_HEADER)
+        writer.writerows(
+            _event_rows(rows, batch_date, max(claims, 1), random.Random(f"{seed}:events"), rates, counts)
+        )
+    return GenerationStats(path=target, rows=rows, bad_event_types=counts["bad_event_type"])
+
+
+def write_nightly_drop(
+    out_dir: str | Path,
+    rows: int,
+    batch_date: str,
+    *,
+    events_per_claim: float = 1.0,
+    seed: int = 0,
+    rates: AnomalyRates = AnomalyRates(),
+    datasets_path: str | Path = DATASETS_PATH,
+) -> dict[str, GenerationStats]:
+    """Write both feeds under the file names the nightly job discovers."""
+    out = Path(out_dir)
+    snapshot = write_snapshot(
+        out / get_feed("snapshot", datasets_path).file_name(batch_date),
+        rows,
+        batch_date,
+        seed=seed,
+        rates=rates,
+    )
+    events = write_events(
+        out / get_feed("events", datasets_path).file_name(batch_date),
+        round(rows * events_per_claim),
+        batch_date,
+        claims=rows,
+        seed=seed,
+        rates=rates,
+    )
+    return {"snapshot": snapshot, "events": events}
+
+
+def _claim_id(number: int) -> str:
+    return f"CLM{number:09d}"
+
+
+def _snapshot_rows(
+    rows: int,
+    batch_date: str,
+    rng: random.Random,
+    rates: AnomalyRates,
+    counts: dict[str, int],
+) -> Iterator[tuple]:
+    batch = date.fromisoformat(batch_date).toordinal()
+    stamp = f"{batch_date} 12:00:00"
+    previous: tuple[int, int] | None = None
+    for index in range(rows):
+        if previous is not None and rng.random() < rates.duplicate:
+            # A second version of the previous claim: same key, fresh values.
+            number, version = previous[0], previous[1] + 1
+            counts["duplicate"] += 1
+        else:
+            number, version = index + 1, rng.randint(1, 4)
+        previous = (number, version)
+
+        loss = batch - rng.randint(10, 400)
+        report = loss + rng.randint(0, 10)
+        decision = report + rng.randint(0, 14)
+        status = CLAIM_STATUSES[rng.randrange(len(CLAIM_STATUSES))]
+        rtw = rng.random() < 0.4
+        paid_cents = rng.randint(0, 5_000_000)
+        reserve_cents = rng.randint(0, 5_000_000)
+        if rng.random() < rates.negative_amount:
+            paid_cents = -paid_cents - 1
+            counts["negative"] += 1
+        if rng.random() < rates.bad_pii_class:
+            pii_class = BAD_PII_CLASS
+            counts["bad_pii"] += 1
+        else:
+            pii_class = PII_CLASSES[rng.randrange(len(PII_CLASSES))]
+        # incurred = paid + reserve keeps DQ001 satisfied; DQ002/DQ003 dates likewise.
+        yield (
+            batch_date,
+            SOURCE_SYSTEMS[rng.randrange(len(SOURCE_SYSTEMS))],
+            _claim_id(number),
+            version,
+            f"POL{rng.randrange(POLICY_KEYS):07d}",
+            f"CUST{rng.randrange(CUSTOMER_KEYS):07d}",
+            f"EMP{rng.randrange(5_000):05d}",
+            f"PRV{rng.randrange(2_000):05d}",
+            CLAIM_TYPES[rng.randrange(len(CLAIM_TYPES))],
+            CHANNELS[rng.randrange(len(CHANNELS))],
+            JURISDICTIONS[rng.randrange(len(JURISDICTIONS))],
+            date.fromordinal(loss).isoformat(),
+            date.fromordinal(report).isoformat(),
+            date.fromordinal(report).isoformat(),
+            DECISIONS[rng.randrange(len(DECISIONS))],
+            date.fromordinal(decision).isoformat(),
+            date.fromordinal(min(decision + rng.randint(1, 90), batch)).isoformat() if status == "CLOSED" else "",
+            status,
+            batch_date,
+            f"INJ{rng.randrange(1, 100):03d}",
+            SEVERITIES[rng.randrange(len(SEVERITIES))],
+            "TRUE" if rtw else "FALSE",
+            date.fromordinal(min(decision + rng.randint(1, 60), batch)).isoformat() if rtw else "",
+            _money(paid_cents + reserve_cents),
+            _money(paid_cents),
+            _money(reserve_cents),
+            "AUD",
+            "TRUE" if pii_class in {"MEDIUM", "HIGH"} else "FALSE",
+            pii_class,
+            f"{rng.getrandbits(64):016x}",
+            stamp,
+            f"{batch_date} {rng.randrange(12):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}",
+        )
+
+
+def _event_rows(
+    rows: int,
+    batch_date: str,
+    claims: int,
+    rng: random.Random,
+    rates: AnomalyRates,
+    counts: dict[str, int],
+) -> Iterator[tuple]:
+    for _ in range(rows):
+        if rng.random() < rates.bad_event_type:
+            event_type = BAD_EVENT_TYPE
+            counts["bad_event_type"] += 1
+        else:
+            event_type = EVENT_TYPES[rng.randrange(len(EVENT_TYPES))]
+        old_status = "" if event_type == "CREATED" else CLAIM_STATUSES[rng.randrange(len(CLAIM_STATUSES))]
+        new_status = CLAIM_STATUSES[rng.randrange(len(CLAIM_STATUSES))]
+        delta = _money(rng.randint(1, 2_000_000)) if event_type in {"PAYMENT", BAD_EVENT_TYPE} else "0"
+        # Microsecond timestamps keep the (claim_id, event_ts, event_type) key unique in practice.
+        yield (
+            batch_date,
+            _claim_id(rng.randint(1, claims)),
+            f"{batch_date} {rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            f".{rng.randrange(1_000_000):06d}",
+            event_type,
+            old_status,
+            new_status,
+            delta,
+            "AUD",
+            SOURCE_SYSTEMS[rng.randrange(len(SOURCE_SYSTEMS))],
+            NOTES[rng.randrange(len(NOTES))],
+        )
+
+
+def _money(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    whole, part = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{part:02d}"
+
+
+def main() -> None:
+    """CLI entrypoint writing one nightly drop."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--rows", type=int, default=10_000, help="Snapshot rows (claims)")
+    parser.add_argument("--events-per-claim", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--negative-rate", type=float, default=0.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--bad-pii-rate", type=float, default=0.0)
+    parser.add_argument("--bad-event-type-rate", type=float, default=0.0)
+    parser.add_argument("--datasets", default=DATASETS_PATH)
+    parser.add_argument("--out-dir", default="samples/nightly_drop")
+    args = parser.parse_args()
+    if args.rows < 1:
+        parser.error("--rows must be at least 1")
+
+    stats = write_nightly_drop(
+        args.out_dir,
+        args.rows,
+        parse_batch_date(args.batch_date),
+        events_per_claim=args.events_per_claim,
+        seed=args.seed,
+        rates=AnomalyRates(
+            negative_amount=args.negative_rate,
+            duplicate=args.duplicate_rate,
+            bad_pii_class=args.bad_pii_rate,
+            bad_event_type=args.bad_event_type_rate,
+        ),
+        datasets_path=args.datasets,
+    )
+    for name, item in stats.items():
+        print(
+            f"{name}: {item.rows} rows -> {item.path} "
+            f"(negative={item.negative_amounts}, duplicates={item.duplicates}, "
+            f"bad_pii={item.bad_pii_classes}, bad_event_type={item.bad_event_types})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 -- ============================================================
 -- RAW LAYER DDL
 -- Snapshot columns are explicitly typed to align with pipeline SQL consumers.
--- Events table remains generic VARCHAR columns.
+-- Events table keeps generic VARCHAR columns plus a typed BATCH_DATE populated
+-- at COPY time. Both tables cluster on BATCH_DATE so batch filters prune.
 -- ============================================================
 
 USE ROLE ACCOUNTADMIN;
@@ -51,7 +52,8 @@ CREATE OR REPLACE TABLE CLAIMS_SNAPSHOT_NIGHTLY (
     SRC_FILENAME          VARCHAR,
     SRC_FILE_ROW_NUMBER   NUMBER,
     LOADED_AT             TIMESTAMP_NTZ
-);
+)
+CLUSTER BY (BATCH_DATE);
 
 -- ============================================================
 -- EVENTS TABLE
@@ -74,5 +76,9 @@ CREATE OR REPLACE TABLE CLAIMS_EVENTS_NIGHTLY (
     -- Metadata
     SRC_FILENAME          VARCHAR,
     SRC_FILE_ROW_NUMBER   NUMBER,
-    LOAD_TS               TIMESTAMP_NTZ
-);
+    LOAD_TS               TIMESTAMP_NTZ,
+
+    -- Typed columns cast once at COPY time (see _build_copy_sql)
+    BATCH_DATE            DATE
+)
+CLUSTER BY (BATCH_DATE);
@@ -32,16 +32,66 @@ CREATE OR REPLACE TABLE CONTROL_RESULT (
 
 CREATE OR REPLACE TABLE EXCEPTIONS (
   run_id STRING NOT NULL,
+  batch_date DATE,
   control_id STRING NOT NULL,
   claim_id STRING,
+  src_file_row_number NUMBER,
   error_message STRING,
   severity STRING,
   recorded_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
 );
 
+-- Rolling Welford accumulators (count/mean/M2) backing statistical controls.
+CREATE OR REPLACE TABLE METRIC_BASELINE (
+  metric_id STRING NOT NULL,
+  sample_count NUMBER,
+  mean FLOAT,
+  m2 FLOAT,
+  last_batch_date DATE,
+  updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+  PRIMARY KEY (metric_id)
+);
+
 CREATE OR REPLACE TABLE PROMOTION_HISTORY (
   run_id STRING NOT NULL,
   dataset_name STRING NOT NULL,
   promoted_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
-  status STRING
+  status STRING,
+  batch_date DATE,
+  inserted_count NUMBER,
+  updated_count NUMBER,
+  unchanged_count NUMBER,
+  source_row_count NUMBER,
+  dedup_dropped_count NUMBER
+);
+
+-- Per-run warehouse usage, harvested from QUERY_HISTORY by QUERY_TAG
+-- (run_id:stage:control_id) after each nightly run.
+CREATE OR REPLACE TABLE RUN_QUERY_STATS (
+  run_id STRING NOT NULL,
+  stage_name STRING,
+  control_id STRING,
+  warehouse_name STRING,
+  warehouse_size STRING,
+  query_count NUMBER,
+  total_elapsed_ms NUMBER,
+  execution_ms NUMBER,
+  queued_ms NUMBER,
+  bytes_scanned NUMBER,
+  partitions_scanned NUMBER,
+  partitions_total NUMBER,
+  harvested_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+);
+
+-- Daily control trend: one row per batch date and control from the latest
+-- run of that batch date, upserted when each nightly run finishes.
+CREATE OR REPLACE TABLE CONTROL_TREND_DAILY (
+  batch_date DATE NOT NULL,
+  control_id STRING NOT NULL,
+  run_id STRING NOT NULL,
+  result_count NUMBER,
+  fail_count NUMBER,
+  blocking_fail_count NUMBER,
+  variance_sum FLOAT,
+  updated_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
 );
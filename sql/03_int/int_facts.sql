@@ -15,6 +15,8 @@ CREATE TABLE IF NOT EXISTS CLAIMS_SNAPSHOT (
   claim_status STRING,
   pii_class STRING,
   loaded_at TIMESTAMP_NTZ,
+  -- HASH of business columns; promotion rewrites a claim only when it changes.
+  row_hash NUMBER(19,0),
   PRIMARY KEY (claim_id)
 );
 
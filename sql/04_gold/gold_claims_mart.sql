@@ -11,7 +11,8 @@ CREATE TABLE IF NOT EXISTS CLAIMS_MART (
   refresh_ts TIMESTAMP_NTZ
 );
 
--- Upsert one summary row per batch_date from INT snapshot facts.
+-- Full rebuild: upsert one summary row per batch_date from INT snapshot facts.
+-- Nightly runs refresh only touched dates via promote_int_to_gold.
 MERGE INTO GOLD.CLAIMS_MART AS tgt
 USING (
   SELECT
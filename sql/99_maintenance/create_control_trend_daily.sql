@@ -0,0 +1,64 @@
+USE DATABASE CLAIMS_POC;
+USE SCHEMA CTRL;
+
+-- Non-destructive creation of CONTROL_TREND_DAILY on existing environments,
+-- backfilled from the latest run of every batch date already in RUN_AUDIT.
+-- Later nightly runs keep it current.
+CREATE TABLE IF NOT EXISTS CONTROL_TREND_DAILY (
+  batch_date DATE NOT NULL,
+  control_id STRING NOT NULL,
+  run_id STRING NOT NULL,
+  result_count NUMBER,
+  fail_count NUMBER,
+  blocking_fail_count NUMBER,
+  variance_sum FLOAT,
+  updated_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+);
+
+INSERT INTO CONTROL_TREND_DAILY (
+  batch_date,
+  control_id,
+  run_id,
+  result_count,
+  fail_count,
+  blocking_fail_count,
+  variance_sum
+)
+WITH latest_runs AS (
+  SELECT run_id, batch_date
+  FROM RUN_AUDIT
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY batch_date ORDER BY start_ts DESC) = 1
+),
+-- A resumed run may hold several attempts, and only each control's latest counts.
+-- result_count still counts every attempt, so retried controls stand out.
+latest_results AS (
+  SELECT
+    cr.run_id,
+    cr.control_id,
+    cr.status,
+    cr.blocking_flag,
+    cr.variance,
+    COUNT(*) OVER (PARTITION BY cr.run_id, cr.control_id) AS attempt_count
+  FROM CONTROL_RESULT cr
+  JOIN latest_runs lr
+    ON lr.run_id = cr.run_id
+  QUALIFY ROW_NUMBER() OVER (
+    PARTITION BY cr.run_id, cr.control_id, cr.batch_date
+    ORDER BY COALESCE(cr.executed_at, cr.executed_ts) DESC
+  ) = 1
+)
+SELECT
+  lr.batch_date,
+  cr.control_id,
+  lr.run_id,
+  MAX(cr.attempt_count),
+  COUNT_IF(UPPER(cr.status) IN ('FAIL', 'ERROR')),
+  COUNT_IF(UPPER(cr.status) IN ('FAIL', 'ERROR') AND COALESCE(cr.blocking_flag, FALSE)),
+  SUM(cr.variance)
+FROM latest_results cr
+JOIN latest_runs lr
+  ON lr.run_id = cr.run_id
+WHERE NOT EXISTS (
+  SELECT 1 FROM CONTROL_TREND_DAILY t WHERE t.batch_date = lr.batch_date
+)
+GROUP BY lr.batch_date, cr.control_id, lr.run_id;
@@ -0,0 +1,20 @@
+USE DATABASE CLAIMS_POC;
+USE SCHEMA CTRL;
+
+-- Non-destructive creation of RUN_QUERY_STATS on existing environments.
+-- Required before the nightly job harvests per-run query history.
+CREATE TABLE IF NOT EXISTS RUN_QUERY_STATS (
+  run_id STRING NOT NULL,
+  stage_name STRING,
+  control_id STRING,
+  warehouse_name STRING,
+  warehouse_size STRING,
+  query_count NUMBER,
+  total_elapsed_ms NUMBER,
+  execution_ms NUMBER,
+  queued_ms NUMBER,
+  bytes_scanned NUMBER,
+  partitions_scanned NUMBER,
+  partitions_total NUMBER,
+  harvested_ts TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+);
@@ -0,0 +1,7 @@
+USE DATABASE CLAIMS_POC;
+USE SCHEMA CTRL;
+
+-- Non-destructive schema sync for legacy EXCEPTIONS tables.
+-- Required before SQL controls with exceptions_sql sample failing rows.
+ALTER TABLE EXCEPTIONS ADD COLUMN IF NOT EXISTS BATCH_DATE DATE;
+ALTER TABLE EXCEPTIONS ADD COLUMN IF NOT EXISTS SRC_FILE_ROW_NUMBER NUMBER;
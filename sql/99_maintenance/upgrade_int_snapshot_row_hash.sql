@@ -0,0 +1,6 @@
+USE DATABASE CLAIMS_POC;
+USE SCHEMA INT;
+
+-- Non-destructive schema sync for CLAIMS_SNAPSHOT tables created before
+-- hash-diff promotion. Required once before the first hash-diff promote.
+ALTER TABLE CLAIMS_SNAPSHOT ADD COLUMN IF NOT EXISTS ROW_HASH NUMBER(19,0);
@@ -0,0 +1,11 @@
+USE DATABASE CLAIMS_POC;
+USE SCHEMA CTRL;
+
+-- Non-destructive schema sync for legacy PROMOTION_HISTORY tables.
+-- Required before the nightly job records hash-diff promotion counts.
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS BATCH_DATE DATE;
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS INSERTED_COUNT NUMBER;
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS UPDATED_COUNT NUMBER;
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS UNCHANGED_COUNT NUMBER;
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS SOURCE_ROW_COUNT NUMBER;
+ALTER TABLE PROMOTION_HISTORY ADD COLUMN IF NOT EXISTS DEDUP_DROPPED_COUNT NUMBER;
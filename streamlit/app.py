@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+from datetime import date
+
 import pandas as pd
 import streamlit as st
 
 from components import (
     render_control_results_table,
     render_failure_details_panel,
+    render_query_cost_section,
     render_run_summary,
     render_trend_section,
 )
-from db import load_control_metadata, load_control_results, load_runs
+from db import (
+    RUN_STATUSES,
+    TREND_HORIZONS,
+    RunPage,
+    load_control_metadata,
+    load_control_results,
+    load_control_trend,
+    load_query_costs,
+    load_runs,
+    run_labels,
+)
+from pipeline.common.snowflake_client import ConnectionPool, get_pool
 
 
 st.set_page_config(
@@ -22,9 +36,27 @@ st.set_page_config(
 st.title("📊 Claims Data Control Dashboard")
 
 
+@st.cache_resource
+def _connection_pool() -> ConnectionPool:
+    # Opened once per server process and shared by every session and rerun.
+    return get_pool(autocommit=True).open()
+
+
 @st.cache_data(ttl=60)
-def _runs() -> pd.DataFrame:
-    return load_runs()
+def _runs(
+    after: tuple | None,
+    date_from: date | None,
+    date_to: date | None,
+    statuses: tuple[str, ...],
+    run_id_prefix: str,
+) -> RunPage:
+    return load_runs(
+        after=after,
+        date_from=date_from,
+        date_to=date_to,
+        statuses=list(statuses),
+        run_id_prefix=run_id_prefix,
+    )
 
 
 @st.cache_data(ttl=60)
@@ -33,8 +65,13 @@ def _results_for_run(run_id: str) -> pd.DataFrame:
 
 
 @st.cache_data(ttl=300)
-def _results_last_n(last_n: int) -> pd.DataFrame:
-    return load_control_results(last_n=last_n)
+def _control_trend(horizon_days: int) -> pd.DataFrame:
+    return load_control_trend(horizon_days)
+
+
+@st.cache_data(ttl=300)
+def _query_costs(run_id: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return load_query_costs(run_id)
 
 
 @st.cache_data(ttl=300)
@@ -42,24 +79,49 @@ def _metadata() -> pd.DataFrame:
     return load_control_metadata()
 
 
-runs = _runs()
+_connection_pool()
+
+f1, f2, f3 = st.columns(3)
+with f1:
+    date_range = st.date_input("Batch Date Range", value=())
+with f2:
+    run_statuses = st.multiselect("Run Status", list(RUN_STATUSES))
+with f3:
+    run_search = st.text_input("Run ID Prefix")
+date_bounds = tuple(date_range) if isinstance(date_range, (list, tuple)) else (date_range,)
+run_filters = (
+    date_bounds[0] if date_bounds else None,
+    date_bounds[-1] if date_bounds else None,
+    tuple(run_statuses),
+    run_search.strip(),
+)
+
+# Keyset cursors of the pages visited so far; a filter change starts over.
+if st.session_state.get("run_filters") != run_filters:
+    st.session_state["run_filters"] = run_filters
+    st.session_state["run_cursors"] = [None]
+run_cursors = st.session_state["run_cursors"]
+page = _runs(run_cursors[-1], *run_filters)
+runs = page.runs
 if runs.empty:
-    st.warning("No run data found in CTRL.RUN_AUDIT.")
+    st.warning("No runs match the filters." if any(run_filters) else "No run data found in CTRL.RUN_AUDIT.")
     st.stop()
 
-run_options = runs["RUN_ID"].tolist()
-run_labels = {
-    row["RUN_ID"]: (
-        f"{row['RUN_ID']} | {row['BATCH_DATE']} | {row.get('STATUS', 'UNKNOWN')} | "
-        f"{row.get('START_TS', '')}"
-    )
-    for _, row in runs.iterrows()
-}
+labels = run_labels(runs)
 selected_run = st.selectbox(
     "Run Selector",
-    run_options,
-    format_func=lambda run_id: run_labels.get(run_id, str(run_id)),
+    runs["RUN_ID"].tolist(),
+    format_func=lambda run_id: labels.get(run_id, str(run_id)),
 )
+newer, older = st.columns(2)
+with newer:
+    if st.button("← Newer runs", disabled=len(run_cursors) == 1):
+        run_cursors.pop()
+        st.rerun()
+with older:
+    if st.button("Older runs →", disabled=page.next_cursor is None):
+        run_cursors.append(page.next_cursor)
+        st.rerun()
 
 selected_run_row = runs[runs["RUN_ID"] == selected_run].iloc[0]
 run_controls = _results_for_run(selected_run)
@@ -124,14 +186,15 @@ render_run_summary(
 st.divider()
 render_control_results_table(filtered)
 
-trend_data = _results_last_n(7).merge(metadata, on="CONTROL_ID", how="left")
-if "REGISTER_BLOCKING" in trend_data.columns:
-    trend_data["BLOCKING_FLAG"] = trend_data["BLOCKING_FLAG"].fillna(trend_data["REGISTER_BLOCKING"])
-if "BLOCKING_FLAG" not in trend_data.columns:
-    trend_data["BLOCKING_FLAG"] = trend_data["SEVERITY"].fillna("").eq("BLOCK")
-trend_data["STATUS"] = trend_data["STATUS"].astype(str).str.upper()
-
 st.divider()
-render_trend_section(trend_data)
+horizon_days = st.radio(
+    "Trend Horizon",
+    TREND_HORIZONS,
+    format_func=lambda days: f"{days} days",
+    horizontal=True,
+)
+render_trend_section(_control_trend(horizon_days), horizon_days)
 st.divider()
 render_failure_details_panel(frame)
+st.divider()
+render_query_cost_section(*_query_costs(selected_run))
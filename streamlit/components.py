@@ -64,46 +64,51 @@ def render_control_results_table(frame: pd.DataFrame) -> None:
     )
 
 
-def render_trend_section(frame: pd.DataFrame) -> None:
-    """Render control failure and variance trends."""
-    st.subheader("Control Trend (Last 7 Batches)")
+def render_trend_section(frame: pd.DataFrame, horizon_days: int = 7) -> None:
+    """Render daily control failure and variance trends from the pre-aggregated table."""
+    st.subheader(f"Control Trend (Last {horizon_days} Days)")
     if frame.empty:
-        st.info("Trend data is empty.")
+        st.info("Trend data is empty (CTRL.CONTROL_TREND_DAILY).")
         return
 
-    failures = (
-        frame.assign(IS_FAIL=frame["STATUS"].isin(["FAIL", "ERROR"]).astype(int))
-        .groupby("BATCH_DATE", as_index=False)["IS_FAIL"]
-        .sum()
-        .rename(columns={"IS_FAIL": "FAIL_COUNT"})
-        .sort_values("BATCH_DATE")
-    )
+    trend = frame.sort_values("BATCH_DATE").set_index("BATCH_DATE")
     st.caption("Failures over time")
-    st.line_chart(failures.set_index("BATCH_DATE")["FAIL_COUNT"])
-
-    blocking = (
-        frame.assign(
-            IS_BLOCK_FAIL=(
-                frame["STATUS"].isin(["FAIL", "ERROR"])
-                & frame["BLOCKING_FLAG"].fillna(False).astype(bool)
-            ).astype(int)
-        )
-        .groupby("BATCH_DATE", as_index=False)["IS_BLOCK_FAIL"]
-        .sum()
-        .rename(columns={"IS_BLOCK_FAIL": "BLOCKING_FAIL_COUNT"})
-        .sort_values("BATCH_DATE")
-    )
+    st.line_chart(pd.to_numeric(trend["FAIL_COUNT"], errors="coerce"))
+
     st.caption("Blocking failures over time")
-    st.line_chart(blocking.set_index("BATCH_DATE")["BLOCKING_FAIL_COUNT"])
+    st.line_chart(pd.to_numeric(trend["BLOCKING_FAIL_COUNT"], errors="coerce"))
 
-    if "VARIANCE" in frame.columns and frame["VARIANCE"].notna().any():
-        variance = (
-            frame.groupby("BATCH_DATE", as_index=False)["VARIANCE"]
-            .sum(min_count=1)
-            .sort_values("BATCH_DATE")
-        )
+    variance = pd.to_numeric(trend["VARIANCE"], errors="coerce")
+    if variance.notna().any():
         st.caption("Variance trend")
-        st.line_chart(variance.set_index("BATCH_DATE")["VARIANCE"])
+        st.line_chart(variance)
+
+
+def render_query_cost_section(run_stats: pd.DataFrame, run_costs: pd.DataFrame) -> None:
+    """Render warehouse usage for the selected run and cost per recent run."""
+    st.subheader("Warehouse Cost")
+    if run_stats.empty:
+        st.info("No query stats harvested for this run (CTRL.RUN_QUERY_STATS).")
+    else:
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Estimated Credits", f"{run_stats['ESTIMATED_CREDITS'].sum():.4f}")
+        c2.metric("Queries", int(run_stats["QUERY_COUNT"].sum()))
+        c3.metric("Elapsed (s)", f"{run_stats['TOTAL_ELAPSED_MS'].sum() / 1000:.1f}")
+        c4.metric("Queued (s)", f"{run_stats['QUEUED_MS'].sum() / 1000:.1f}")
+        by_stage = (
+            run_stats.fillna({"STAGE_NAME": "(untagged)"})
+            .groupby("STAGE_NAME", as_index=False)["ESTIMATED_CREDITS"]
+            .sum()
+            .sort_values("ESTIMATED_CREDITS", ascending=False)
+        )
+        st.caption("Estimated credits by stage")
+        st.bar_chart(by_stage.set_index("STAGE_NAME")["ESTIMATED_CREDITS"])
+        st.dataframe(run_stats, use_container_width=True, hide_index=True)
+
+    if not run_costs.empty:
+        per_run = run_costs.groupby("RUN_ID", as_index=False, sort=False)["ESTIMATED_CREDITS"].sum()
+        st.caption("Estimated credits per run (execution time x warehouse size rate)")
+        st.bar_chart(per_run.set_index("RUN_ID")["ESTIMATED_CREDITS"])
 
 
 def render_failure_details_panel(frame: pd.DataFrame) -> None:
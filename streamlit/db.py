@@ -2,23 +2,179 @@
 
 from __future__ import annotations
 
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Any
 
 import pandas as pd
-import snowflake.connector
 
-from pipeline.common.snowflake_client import connection_params
+from pipeline.common.snowflake_client import get_pool
 from pipeline.controls.registry import ControlRegistry
 
+# Standard warehouse credits per hour by QUERY_HISTORY warehouse_size.
+WAREHOUSE_CREDITS_PER_HOUR = {
+    "X-SMALL": 1,
+    "SMALL": 2,
+    "MEDIUM": 4,
+    "LARGE": 8,
+    "X-LARGE": 16,
+    "2X-LARGE": 32,
+    "3X-LARGE": 64,
+    "4X-LARGE": 128,
+    "5X-LARGE": 256,
+    "6X-LARGE": 512,
+}
 
-def get_connection() -> snowflake.connector.SnowflakeConnection:
-    """Create a short-lived Snowflake connection for dashboard queries."""
-    return snowflake.connector.connect(autocommit=True, **connection_params())
+RUN_PAGE_SIZE = 50
+# Days of CTRL.CONTROL_TREND_DAILY the trend section can show.
+TREND_HORIZONS = (7, 90, 365)
+# Statuses RunBookkeeper writes to CTRL.RUN_AUDIT.
+RUN_STATUSES = ("STARTED", "PASSED", "FAILED")
 
+# Latest run per batch date, newest N batch dates.
+_LATEST_RUNS_CTE = """
+      latest_runs AS (
+        SELECT
+          run_id,
+          batch_date,
+          start_ts,
+          ROW_NUMBER() OVER (
+            PARTITION BY batch_date
+            ORDER BY start_ts DESC
+          ) AS rn
+        FROM CTRL.RUN_AUDIT
+      ),
+      selected_runs AS (
+        SELECT run_id, batch_date
+        FROM latest_runs
+        WHERE rn = 1
+        ORDER BY batch_date DESC
+        LIMIT %(last_n)s
+      )"""
 
-def load_runs() -> pd.DataFrame:
-    """Load all runs for run selector and summary cards."""
-    sql = """
+# Column order of load_query_stats / load_run_costs frames.
+_QUERY_STATS_COLUMNS = [
+    "RUN_ID",
+    "STAGE_NAME",
+    "CONTROL_ID",
+    "WAREHOUSE_NAME",
+    "WAREHOUSE_SIZE",
+    "QUERY_COUNT",
+    "TOTAL_ELAPSED_MS",
+    "EXECUTION_MS",
+    "QUEUED_MS",
+    "BYTES_SCANNED",
+    "PARTITIONS_SCANNED",
+    "PARTITIONS_TOTAL",
+]
+_RUN_COST_COLUMNS = [
+    "RUN_ID",
+    "BATCH_DATE",
+    "WAREHOUSE_SIZE",
+    "QUERY_COUNT",
+    "TOTAL_ELAPSED_MS",
+    "EXECUTION_MS",
+    "QUEUED_MS",
+    "BYTES_SCANNED",
+]
+# Shared by the single-purpose and the batched query-cost loaders.
+_QUERY_STATS_SELECT = """
+      SELECT
+        run_id,
+        stage_name,
+        control_id,
+        warehouse_name,
+        warehouse_size,
+        query_count,
+        total_elapsed_ms,
+        execution_ms,
+        queued_ms,
+        bytes_scanned,
+        partitions_scanned,
+        partitions_total
+      FROM CTRL.RUN_QUERY_STATS
+      WHERE run_id = %(run_id)s"""
+_RECENT_COST_RUNS_CTE = """
+      recent_runs AS (
+        SELECT run_id, MAX(harvested_ts) AS harvested_ts
+        FROM CTRL.RUN_QUERY_STATS
+        GROUP BY run_id
+        ORDER BY harvested_ts DESC
+        LIMIT %(last_n)s
+      )"""
+_RUN_COSTS_SELECT = """
+      SELECT
+        qs.run_id,
+        ra.batch_date,
+        qs.warehouse_size,
+        SUM(qs.query_count) AS query_count,
+        SUM(qs.total_elapsed_ms) AS total_elapsed_ms,
+        SUM(qs.execution_ms) AS execution_ms,
+        SUM(qs.queued_ms) AS queued_ms,
+        SUM(qs.bytes_scanned) AS bytes_scanned
+      FROM CTRL.RUN_QUERY_STATS qs
+      JOIN recent_runs rr
+        ON rr.run_id = qs.run_id
+      LEFT JOIN CTRL.RUN_AUDIT ra
+        ON ra.run_id = qs.run_id
+      GROUP BY qs.run_id, ra.batch_date, qs.warehouse_size"""
+
+
+def get_connection() -> AbstractContextManager[Any]:
+    """Borrow an autocommit connection from the shared pool for dashboard queries."""
+    return get_pool(autocommit=True).connection()
+
+
+@dataclass(frozen=True)
+class RunPage:
+    """One page of runs, newest first, and the keyset cursor for the next page."""
+
+    runs: pd.DataFrame
+    # (start_ts, run_id) of the last row; None on the last page.
+    next_cursor: tuple[datetime, str] | None
+
+
+def load_runs(
+    *,
+    after: tuple[datetime, str] | None = None,
+    page_size: int = RUN_PAGE_SIZE,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    statuses: list[str] | None = None,
+    run_id_prefix: str | None = None,
+) -> RunPage:
+    """Load one page of runs for the run selector, newest first.
+
+    Pages are keyset-paginated on (start_ts, run_id): pass the previous page's
+    ``next_cursor`` as ``after``. Filters are applied in SQL, so only
+    ``page_size`` rows are fetched however long RUN_AUDIT grows.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    conditions: list[str] = []
+    params: dict[str, Any] = {"limit": page_size + 1}
+    if after is not None:
+        conditions.append(
+            "(start_ts < %(after_ts)s OR (start_ts = %(after_ts)s AND run_id < %(after_run_id)s))"
+        )
+        params.update(after_ts=after[0], after_run_id=after[1])
+    if date_from is not None:
+        conditions.append("batch_date >= %(date_from)s")
+        params["date_from"] = date_from
+    if date_to is not None:
+        conditions.append("batch_date <= %(date_to)s")
+        params["date_to"] = date_to
+    if statuses:
+        names = [f"status_{index}" for index in range(len(statuses))]
+        conditions.append(f"status IN ({', '.join(f'%({name})s' for name in names)})")
+        params.update(zip(names, statuses))
+    if run_id_prefix:
+        conditions.append("run_id LIKE %(run_id_pattern)s ESCAPE '!'")
+        params["run_id_pattern"] = _like_prefix(run_id_prefix.strip())
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
       SELECT
         run_id,
         batch_date,
@@ -27,17 +183,46 @@ def load_runs() -> pd.DataFrame:
         start_ts,
         end_ts
       FROM CTRL.RUN_AUDIT
-      ORDER BY start_ts DESC
+      {where_sql}
+      ORDER BY start_ts DESC, run_id DESC
+      LIMIT %(limit)s
     """
-    return _query_dataframe(sql)
+    frame = _query_dataframe(sql, params)
+    # One extra row tells whether another page exists without a COUNT(*).
+    if len(frame) <= page_size:
+        return RunPage(frame, None)
+    page = frame.iloc[:page_size].reset_index(drop=True)
+    last = page.iloc[-1]
+    return RunPage(page, (last["START_TS"], str(last["RUN_ID"])))
+
+
+def _like_prefix(prefix: str) -> str:
+    # A typed "%" or "_" must match literally, not as a wildcard.
+    escaped = prefix.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"{escaped}%"
+
+
+def run_labels(runs: pd.DataFrame) -> dict[str, str]:
+    """Selector labels keyed by run_id, built column-wise rather than per row."""
+    if runs.empty:
+        return {}
+    labels = (
+        runs["RUN_ID"].astype(str)
+        + " | "
+        + runs["BATCH_DATE"].astype(str)
+        + " | "
+        + runs["STATUS"].fillna("UNKNOWN").astype(str)
+        + " | "
+        + runs["START_TS"].astype(str)
+    )
+    return dict(zip(runs["RUN_ID"], labels))
 
 
 def load_control_results(run_id: str | None = None, last_n: int | None = None) -> pd.DataFrame:
     """Load control evidence rows for one run or latest N batch dates."""
     if run_id is None and last_n is None:
         raise ValueError("Provide either run_id or last_n")
-    columns = _control_result_columns()
-    select_sql = _build_control_result_select(columns)
+    select_sql = _build_control_result_select(_control_result_columns())
 
     if run_id is not None:
         sql = f"""
@@ -52,24 +237,7 @@ def load_control_results(run_id: str | None = None, last_n: int | None = None) -
         return _query_dataframe(sql, {"run_id": run_id})
 
     sql = f"""
-      WITH latest_runs AS (
-        SELECT
-          run_id,
-          batch_date,
-          start_ts,
-          ROW_NUMBER() OVER (
-            PARTITION BY batch_date
-            ORDER BY start_ts DESC
-          ) AS rn
-        FROM CTRL.RUN_AUDIT
-      ),
-      selected_runs AS (
-        SELECT run_id, batch_date
-        FROM latest_runs
-        WHERE rn = 1
-        ORDER BY batch_date DESC
-        LIMIT %(last_n)s
-      )
+      WITH {_LATEST_RUNS_CTE}
       SELECT
         {select_sql}
       FROM CTRL.CONTROL_RESULT cr
@@ -82,6 +250,88 @@ def load_control_results(run_id: str | None = None, last_n: int | None = None) -
     return _query_dataframe(sql, {"last_n": int(last_n or 0)})
 
 
+def load_control_trend(horizon_days: int = 7) -> pd.DataFrame:
+    """Load daily failure, blocking-failure and variance totals from CTRL.CONTROL_TREND_DAILY.
+
+    The horizon ends at the latest summarised batch date. The table holds one
+    row per batch date and control, so any horizon costs the same small scan.
+    """
+    sql = """
+      SELECT
+        batch_date,
+        SUM(fail_count) AS fail_count,
+        SUM(blocking_fail_count) AS blocking_fail_count,
+        SUM(variance_sum) AS variance
+      FROM CTRL.CONTROL_TREND_DAILY
+      WHERE batch_date > (SELECT MAX(batch_date) FROM CTRL.CONTROL_TREND_DAILY) - %(horizon_days)s
+      GROUP BY batch_date
+      ORDER BY batch_date
+    """
+    return _query_dataframe(sql, {"horizon_days": int(horizon_days)})
+
+
+def load_query_stats(run_id: str) -> pd.DataFrame:
+    """Load harvested per-stage/per-control warehouse usage for one run."""
+    sql = f"{_QUERY_STATS_SELECT}\n      ORDER BY execution_ms DESC"
+    return with_estimated_credits(_query_dataframe(sql, {"run_id": run_id}))
+
+
+def load_run_costs(last_n: int = 30) -> pd.DataFrame:
+    """Load per-run warehouse usage for the latest N harvested runs."""
+    sql = f"WITH {_RECENT_COST_RUNS_CTE}{_RUN_COSTS_SELECT}\n      ORDER BY ra.batch_date, qs.run_id"
+    return with_estimated_credits(_query_dataframe(sql, {"last_n": int(last_n)}))
+
+
+def load_query_costs(run_id: str, last_n: int = 30) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Load ``load_query_stats`` and ``load_run_costs`` frames in a single query."""
+    sql = f"""
+      WITH {_RECENT_COST_RUNS_CTE},
+      run_stats AS ({_QUERY_STATS_SELECT}
+      ),
+      run_costs AS ({_RUN_COSTS_SELECT}
+      )
+      SELECT *
+      FROM (
+        SELECT
+          'RUN' AS dataset, run_id, CAST(NULL AS DATE) AS batch_date, stage_name, control_id,
+          warehouse_name, warehouse_size, query_count, total_elapsed_ms, execution_ms, queued_ms,
+          bytes_scanned, partitions_scanned, partitions_total
+        FROM run_stats
+        UNION ALL
+        SELECT
+          'COSTS', run_id, batch_date, NULL, NULL,
+          NULL, warehouse_size, query_count, total_elapsed_ms, execution_ms, queued_ms,
+          bytes_scanned, NULL, NULL
+        FROM run_costs
+      ) batched
+      -- Each dataset keeps the order its single-purpose loader uses.
+      ORDER BY
+        dataset DESC,
+        CASE WHEN dataset = 'RUN' THEN execution_ms END DESC,
+        batch_date,
+        run_id
+    """
+    frame = _query_dataframe(sql, {"run_id": run_id, "last_n": int(last_n)})
+    run_stats, run_costs = _split_datasets(frame, "RUN", "COSTS")
+    return (
+        with_estimated_credits(run_stats.reindex(columns=_QUERY_STATS_COLUMNS)),
+        with_estimated_credits(run_costs.reindex(columns=_RUN_COST_COLUMNS)),
+    )
+
+
+def with_estimated_credits(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add ESTIMATED_CREDITS: execution time priced at the warehouse size's hourly rate.
+
+    An attribution estimate only; billing is per second of warehouse uptime
+    (60s minimum), shared by concurrent queries.
+    """
+    if frame.empty or "EXECUTION_MS" not in frame.columns:
+        return frame.assign(ESTIMATED_CREDITS=pd.Series(dtype=float))
+    rates = frame["WAREHOUSE_SIZE"].astype(str).str.upper().map(WAREHOUSE_CREDITS_PER_HOUR)
+    execution_hours = pd.to_numeric(frame["EXECUTION_MS"], errors="coerce").fillna(0) / 3_600_000
+    return frame.assign(ESTIMATED_CREDITS=execution_hours * rates.fillna(0))
+
+
 def load_control_metadata(register_path: str = "rules/controls.yaml") -> pd.DataFrame:
     """Load control metadata from YAML register as DataFrame."""
     definitions = ControlRegistry(register_path).load()
@@ -109,22 +359,39 @@ def _query_dataframe(sql: str, params: dict[str, Any] | None = None) -> pd.DataF
     return pd.DataFrame(rows, columns=cols)
 
 
-def _control_result_columns() -> set[str]:
+def _split_datasets(frame: pd.DataFrame, *datasets: str) -> tuple[pd.DataFrame, ...]:
+    """Split a batched result on its DATASET column, one frame per dataset."""
+    columns = [col for col in frame.columns if col != "DATASET"]
+    if frame.empty:
+        return tuple(pd.DataFrame(columns=columns) for _ in datasets)
+    return tuple(
+        frame.loc[frame["DATASET"] == name, columns].reset_index(drop=True) for name in datasets
+    )
+
+
+@lru_cache(maxsize=1)
+def ctrl_table_columns() -> dict[str, frozenset[str]]:
+    """Columns of every CTRL table, read once per server process.
+
+    Call ``ctrl_table_columns.cache_clear()`` after a CTRL migration.
+    """
     sql = """
-      SELECT UPPER(column_name) AS COLUMN_NAME
+      SELECT UPPER(table_name) AS TABLE_NAME, UPPER(column_name) AS COLUMN_NAME
       FROM INFORMATION_SCHEMA.COLUMNS
       WHERE table_schema = 'CTRL'
-        AND table_name = 'CONTROL_RESULT'
     """
-    frame = _query_dataframe(sql)
-    if frame.empty:
-        return set()
-    # Defensive: Snowflake/Pandas can expose expression names differently if aliasing changes.
-    if "COLUMN_NAME" in frame.columns:
-        column_series = frame["COLUMN_NAME"]
-    else:
-        column_series = frame.iloc[:, 0]
-    return set(column_series.astype(str).tolist())
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            rows = cur.fetchall() or []
+    columns: dict[str, set[str]] = {}
+    for table_name, column_name in rows:
+        columns.setdefault(str(table_name), set()).add(str(column_name))
+    return {table: frozenset(names) for table, names in columns.items()}
+
+
+def _control_result_columns() -> set[str]:
+    return set(ctrl_table_columns().get("CONTROL_RESULT", ()))
 
 
 def _build_control_result_select(columns: set[str]) -> str:
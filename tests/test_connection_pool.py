@@ -0,0 +1,195 @@
+"""Tests for the shared Snowflake connection pool."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pipeline.common import snowflake_client
+from pipeline.common.snowflake_client import ConnectionPool, SnowflakeClient
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConnection") -> None:
+        self._conn = conn
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql, params=None) -> None:
+        if self._conn.dead:
+            raise RuntimeError("session expired")
+        self._conn.executed.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+
+class _FakeConnection:
+    def __init__(self, ident: int) -> None:
+        self.ident = ident
+        self.dead = False
+        self.closed = False
+        self.commits = 0
+        self.rollbacks = 0
+        self.executed: list[str] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Factory:
+    def __init__(self) -> None:
+        self.opened: list[_FakeConnection] = []
+        self._lock = threading.Lock()
+
+    def __call__(self) -> _FakeConnection:
+        with self._lock:
+            conn = _FakeConnection(len(self.opened))
+            self.opened.append(conn)
+            return conn
+
+
+def test_pool_reuses_connections_and_commits_per_borrow() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, min_size=1, max_size=2)
+
+    pool.open()
+    with pool.connection() as first:
+        first.cursor().execute("SELECT 1")
+    with pool.connection():
+        pass
+
+    assert len(factory.opened) == 1
+    assert factory.opened[0].commits == 2
+    assert pool.size == pool.idle == 1
+
+
+def test_pool_rolls_back_on_error_and_keeps_connection() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, max_size=1)
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("stage failed")
+
+    assert factory.opened[0].rollbacks == 1
+    assert factory.opened[0].commits == 0
+    assert pool.idle == 1
+
+
+def test_pool_replaces_connection_failing_health_check() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, max_size=1, health_check_after=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.dead = True
+
+    replacement = pool.acquire()
+
+    assert replacement is not conn
+    assert conn.closed
+    assert pool.size == 1
+
+
+def test_pool_blocks_at_max_size_and_times_out() -> None:
+    pool = ConnectionPool(_Factory(), max_size=1, acquire_timeout=0.05)
+    held = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(held)
+    assert pool.acquire() is held
+
+
+def test_pool_never_exceeds_max_size_under_concurrency() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, max_size=3, acquire_timeout=5)
+    in_use = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def worker() -> None:
+        nonlocal in_use, peak
+        for _ in range(20):
+            with pool.connection():
+                with lock:
+                    in_use += 1
+                    peak = max(peak, in_use)
+                with lock:
+                    in_use -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak <= 3
+    assert len(factory.opened) <= 3
+
+
+def test_client_borrows_from_pool_and_returns_on_exit() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, max_size=1)
+
+    with SnowflakeClient(pool) as client:
+        client.execute("CREATE SCHEMA IF NOT EXISTS CTRL")
+
+    assert factory.opened[0].executed == ["CREATE SCHEMA IF NOT EXISTS CTRL"]
+    assert factory.opened[0].commits == 1
+    assert pool.idle == 1
+
+
+def test_client_discards_connection_when_commit_fails() -> None:
+    factory = _Factory()
+    pool = ConnectionPool(factory, max_size=1, acquire_timeout=0.05)
+
+    def failing_commit() -> None:
+        raise RuntimeError("commit failed")
+
+    with pytest.raises(RuntimeError, match="commit failed"):
+        with SnowflakeClient(pool) as client:
+            factory.opened[0].commit = failing_commit  # type: ignore[method-assign]
+            client.execute("INSERT INTO CTRL.RUN_AUDIT SELECT 1")
+
+    # The slot is returned and the broken session closed, not pooled.
+    assert factory.opened[0].closed
+    assert (pool.idle, pool.size) == (0, 0)
+    assert pool.acquire() is factory.opened[1]
+
+
+def test_config_file_is_read_once(monkeypatch, tmp_path) -> None:
+    config = tmp_path / "env.yaml"
+    config.write_text(
+        "snowflake:\n  account: A\n  user: U\n  role: R\n  warehouse: W\n"
+        "  database: D\n  schema_gold: GOLD\npool:\n  max_size: 6\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(snowflake_client, "CONFIG_PATH", str(config))
+    snowflake_client._load_config_file.cache_clear()
+
+    first = snowflake_client.connection_params()
+    config.write_text("snowflake: {}\n", encoding="utf-8")
+    second = snowflake_client.connection_params()
+
+    assert first == second
+    assert snowflake_client.pool_config()["max_size"] == 6
+    snowflake_client._load_config_file.cache_clear()
@@ -23,6 +23,9 @@ class _FakeRepo:
     def persist(self, result: ControlResult) -> None:
         self.persisted.append(result)
 
+    def flush(self) -> None:
+        return None
+
 
 class _PassPrecheck:
     def handle(self, control: ControlDefinition, context: ControlContext) -> ControlResult:
@@ -274,3 +277,51 @@ def test_engine_runs_gate_after_non_gate_controls() -> None:
     assert summary.results[-1].control_id == "C7_PROMOTION_GATE"
     assert summary.results[-1].status == "FAIL"
     assert summary.blocking_failures == 2
+
+
+def test_engine_expands_dq_library_results() -> None:
+    """A dq_library control should persist one result per DQ rule."""
+
+    class _DqLibrary:
+        def handle(self, control: ControlDefinition, context: ControlContext) -> list[ControlResult]:
+            return [
+                ControlResult(
+                    run_id=context.run_id,
+                    batch_date=context.batch_date,
+                    control_id=rule_id,
+                    status=status,
+                    blocking=severity == "BLOCK",
+                    severity=severity,
+                    type="dq_library",
+                    fail_count=0 if status == "PASS" else 1,
+                )
+                for rule_id, status, severity in (("DQ001", "FAIL", "WARN"), ("DQ002", "PASS", "BLOCK"))
+            ]
+
+    definitions = [
+        ControlDefinition(
+            control_id="C9_DQ_LIBRARY",
+            type="dq_library",
+            enabled=True,
+            blocking=True,
+            severity="BLOCK",
+            description="dq library",
+            sql_path=None,
+            params={},
+        ),
+    ]
+    repo = _FakeRepo()
+    engine = ControlEngine(
+        registry=_FakeRegistry(definitions),
+        repository=repo,
+        precheck_handler=_PassPrecheck(),
+        sql_handler=_PassSql(),
+        gate_handler=_GateFromPrior(),
+        dq_library_handler=_DqLibrary(),
+    )
+
+    summary = engine.run(_context())
+
+    assert [item.control_id for item in repo.persisted] == ["DQ001", "DQ002"]
+    assert summary.failed == 1
+    assert summary.blocking_failures == 0
@@ -0,0 +1,121 @@
+"""Tests for the incremental CTRL.CONTROL_TREND_DAILY upsert."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+
+from pipeline.controls.trend import refresh_control_trend
+from pipeline.orchestrator import nightly_job
+from pipeline.orchestrator.dag import Checkpoint
+
+
+@pytest.fixture()
+def local_conn():
+    pytest.importorskip("duckdb")
+    from pipeline.common.local_backend import LocalDatabase, bootstrap_local
+
+    conn = LocalDatabase(":memory:").connect()
+    bootstrap_local(conn)
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO CTRL.CONTROL_RESULT (run_id, batch_date, control_id, status, blocking_flag, variance)
+            VALUES
+              ('run_1', '2026-02-19', 'C1', 'FAIL', TRUE, 1.5),
+              ('run_1', '2026-02-18', 'C1', 'PASS', TRUE, 0.5),
+              ('run_1', '2026-02-19', 'C2', 'ERROR', FALSE, NULL),
+              ('run_1', '2026-02-19', 'C3', 'PASS', FALSE, NULL),
+              ('run_2', '2026-02-19', 'C1', 'PASS', TRUE, 0.25),
+              ('run_3', '2026-02-20', 'C1', 'FAIL', TRUE, 2.0)
+            """
+        )
+    return conn
+
+
+def _start(conn, run_id: str, batch_date: str, start_ts: str) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO CTRL.RUN_AUDIT (run_id, dataset_name, batch_date, start_ts, status) "
+            "VALUES (%(run_id)s, 'claims', %(batch_date)s, %(start_ts)s, 'STARTED')",
+            {"run_id": run_id, "batch_date": batch_date, "start_ts": start_ts},
+        )
+
+
+def _trend(conn) -> list[tuple]:
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT CAST(batch_date AS STRING), control_id, run_id, result_count, fail_count, "
+            "blocking_fail_count, variance_sum FROM CTRL.CONTROL_TREND_DAILY ORDER BY batch_date, control_id"
+        )
+        return [tuple(row) for row in cur.fetchall()]
+
+
+def test_refresh_upserts_the_batch_date_and_replaces_earlier_runs(local_conn) -> None:
+    _start(local_conn, "run_1", "2026-02-19", "2026-02-20 01:00:00")
+    _start(local_conn, "run_3", "2026-02-20", "2026-02-21 01:00:00")
+    assert refresh_control_trend(local_conn, "run_1", "2026-02-19") == 3
+    assert refresh_control_trend(local_conn, "run_3", "2026-02-20") == 1
+    assert _trend(local_conn) == [
+        ("2026-02-19", "C1", "run_1", 2, 1, 1, 2.0),
+        ("2026-02-19", "C2", "run_1", 1, 1, 0, None),
+        ("2026-02-19", "C3", "run_1", 1, 0, 0, None),
+        ("2026-02-20", "C1", "run_3", 1, 1, 1, 2.0),
+    ]
+
+    # A rerun of 2026-02-19 replaces that date only, including controls it no longer ran.
+    _start(local_conn, "run_2", "2026-02-19", "2026-02-21 09:00:00")
+    assert refresh_control_trend(local_conn, "run_2", "2026-02-19") == 1
+    # A run without results keeps the existing rows.
+    _start(local_conn, "run_9", "2026-02-19", "2026-02-22 09:00:00")
+    assert refresh_control_trend(local_conn, "run_9", "2026-02-19") == 0
+    assert _trend(local_conn) == [
+        ("2026-02-19", "C1", "run_2", 1, 0, 0, 0.25),
+        ("2026-02-20", "C1", "run_3", 1, 1, 1, 2.0),
+    ]
+
+
+def test_refresh_counts_only_the_latest_attempt_of_a_resumed_run(local_conn) -> None:
+    _start(local_conn, "run_4", "2026-02-21", "2026-02-22 00:30:00")
+    with local_conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO CTRL.CONTROL_RESULT (run_id, batch_date, control_id, status, blocking_flag, variance, executed_at)
+            VALUES
+              ('run_4', '2026-02-21', 'C1', 'FAIL', TRUE, 3.0, '2026-02-22 01:00:00'),
+              ('run_4', '2026-02-21', 'C2', 'FAIL', FALSE, 1.0, '2026-02-22 01:00:00'),
+              ('run_4', '2026-02-21', 'C1', 'PASS', TRUE, 0.5, '2026-02-22 02:00:00'),
+              ('run_4', '2026-02-21', 'C2', 'FAIL', FALSE, 2.0, '2026-02-22 02:00:00')
+            """
+        )
+
+    assert refresh_control_trend(local_conn, "run_4", "2026-02-21") == 2
+    assert _trend(local_conn) == [
+        ("2026-02-21", "C1", "run_4", 2, 0, 0, 0.5),
+        ("2026-02-21", "C2", "run_4", 2, 1, 0, 2.0),
+    ]
+
+
+def test_resuming_an_older_run_leaves_the_newer_reruns_trend_alone(local_conn) -> None:
+    _start(local_conn, "run_1", "2026-02-19", "2026-02-20 01:00:00")
+    _start(local_conn, "run_2", "2026-02-19", "2026-02-21 09:00:00")
+    assert refresh_control_trend(local_conn, "run_2", "2026-02-19") == 1
+
+    # --resume run_1 finishes after run_2, but run_2 still owns 2026-02-19.
+    assert refresh_control_trend(local_conn, "run_1", "2026-02-19") == 0
+    assert _trend(local_conn) == [("2026-02-19", "C1", "run_2", 1, 0, 0, 0.25)]
+
+
+def test_record_control_trend_needs_a_finished_controls_stage(tmp_path, local_conn) -> None:
+    @contextmanager
+    def connect():
+        yield local_conn
+
+    _start(local_conn, "run_1", "2026-02-19", "2026-02-20 01:00:00")
+    checkpoint = Checkpoint.create(tmp_path, "run_1", "2026-02-19")
+    checkpoint.mark("load_snapshot", "FAILED")
+    assert nightly_job.record_control_trend(checkpoint, connect=connect) == 0
+
+    checkpoint.mark("controls", "BLOCKED")
+    assert nightly_job.record_control_trend(checkpoint, connect=connect) == 3
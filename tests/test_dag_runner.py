@@ -0,0 +1,143 @@
+"""Tests for the stage DAG runner and its checkpoint/resume behavior."""
+
+from __future__ import annotations
+
+import json
+import threading
+from contextlib import contextmanager
+
+from pipeline.orchestrator import nightly_job
+from pipeline.orchestrator.dag import (
+    BLOCKED,
+    COMPLETED,
+    FAILED,
+    Checkpoint,
+    DagRunner,
+    Stage,
+    StageBlocked,
+)
+
+
+class _Connections:
+    def __init__(self) -> None:
+        self.opened = 0
+        self.committed = 0
+
+    @contextmanager
+    def connect(self):
+        self.opened += 1
+        yield object()
+        self.committed += 1
+
+
+def test_independent_stages_run_in_parallel_and_checkpoint(tmp_path) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    calls: list[str] = []
+
+    def loader(name):
+        def run(ctx):
+            # Both loads must be in flight at once to pass the barrier.
+            barrier.wait()
+            calls.append(name)
+            return {"loaded": len(name)}
+
+        return run
+
+    stages = [
+        Stage("discover", lambda ctx: {"files": 2}),
+        Stage("load_a", loader("load_a"), depends_on=("discover",)),
+        Stage("load_b", loader("load_b"), depends_on=("discover",)),
+        Stage(
+            "controls",
+            lambda ctx: {"sum": ctx.outputs["load_a"]["loaded"] + ctx.outputs["load_b"]["loaded"]},
+            depends_on=("load_a", "load_b"),
+        ),
+    ]
+    checkpoint = Checkpoint.create(tmp_path, "run_1", "2026-02-21")
+    connections = _Connections()
+
+    result = DagRunner(stages, checkpoint, connections.connect).run()
+
+    assert result.ok
+    assert sorted(calls) == ["load_a", "load_b"]
+    assert connections.committed == 4
+    payload = json.loads((tmp_path / "run_1.checkpoint.json").read_text())
+    assert payload["stages"]["controls"]["status"] == COMPLETED
+    assert payload["stages"]["controls"]["outputs"] == {"sum": 12}
+
+
+def test_resume_skips_completed_stages_and_reuses_outputs(tmp_path) -> None:
+    attempts = {"promote": 0}
+
+    def promote(ctx):
+        attempts["promote"] += 1
+        if attempts["promote"] == 1:
+            raise RuntimeError("warehouse suspended")
+        return {"promoted": ctx.outputs["load"]["loaded"]}
+
+    def stages(load_calls):
+        def load(ctx):
+            load_calls.append(1)
+            return {"loaded": 40}
+
+        return [
+            Stage("load", load),
+            Stage("promote", promote, depends_on=("load",)),
+            Stage("gold", lambda ctx: {"done": True}, depends_on=("promote",)),
+        ]
+
+    first_loads: list[int] = []
+    first = DagRunner(stages(first_loads), Checkpoint.create(tmp_path, "run_2", "2026-02-21")).run()
+    assert first.status == FAILED
+    assert first.failed_stage == "promote"
+    assert "warehouse suspended" in (first.error or "")
+
+    resumed_loads: list[int] = []
+    second = DagRunner(stages(resumed_loads), Checkpoint.load(tmp_path, "run_2")).run()
+
+    assert second.ok
+    assert second.skipped == ("load",)
+    assert second.completed == ("promote", "gold")
+    assert resumed_loads == []
+    assert Checkpoint.load(tmp_path, "run_2").stages["promote"]["outputs"] == {"promoted": 40}
+
+
+def test_blocked_stage_commits_and_halts(tmp_path) -> None:
+    def controls(ctx):
+        raise StageBlocked("1 blocking control failure(s)", {"blocking_failures": 1})
+
+    stages = [
+        Stage("controls", controls),
+        Stage("promote", lambda ctx: {}, depends_on=("controls",)),
+    ]
+    connections = _Connections()
+    checkpoint = Checkpoint.create(tmp_path, "run_3", "2026-02-21")
+
+    result = DagRunner(stages, checkpoint, connections.connect).run()
+
+    assert result.status == BLOCKED
+    assert result.completed == ()
+    assert connections.committed == 1
+    assert checkpoint.stages["controls"]["outputs"] == {"blocking_failures": 1}
+    assert "promote" not in checkpoint.stages
+
+
+def test_nightly_dag_declares_expected_stages() -> None:
+    stages = {stage.name: stage for stage in nightly_job.build_stages()}
+
+    assert list(stages) == [
+        "discover",
+        "validate_snapshot",
+        "validate_events",
+        "load_snapshot",
+        "load_events",
+        "controls",
+        "promote_snapshot",
+        "promote_events",
+        "promote_int",
+        "refresh_gold",
+    ]
+    assert stages["load_snapshot"].depends_on == ("validate_snapshot",)
+    assert stages["load_events"].depends_on == ("validate_events",)
+    assert stages["controls"].depends_on == ("load_snapshot", "load_events")
+    assert stages["promote_int"].depends_on == ("promote_snapshot", "promote_events")
@@ -0,0 +1,165 @@
+"""Tests for the dashboard's keyset-paginated run selector queries."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+RUN_COLUMNS = ("RUN_ID", "BATCH_DATE", "STATUS", "RECORD_COUNT", "START_TS", "END_TS")
+
+
+@pytest.fixture(scope="module")
+def db():
+    # The dashboard modules live beside app.py, outside the pipeline package.
+    spec = importlib.util.spec_from_file_location("dashboard_db", Path("streamlit/db.py"))
+    module = importlib.util.module_from_spec(spec)
+    # Registered first so the module's dataclasses can resolve it.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConn") -> None:
+        self._conn = conn
+        self.description = [(name,) for name in RUN_COLUMNS]
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._conn.executed.append((sql, params))
+
+    def fetchall(self) -> list[tuple]:
+        return self._conn.rows[: self._conn.executed[-1][1]["limit"]]
+
+
+class _FakeConn:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.executed: list[tuple[str, dict]] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+def _run(run_id: str, start_ts: datetime) -> tuple:
+    return (run_id, start_ts.date(), "PASSED", 3, start_ts, start_ts)
+
+
+@pytest.fixture()
+def fake(db, monkeypatch):
+    conn = _FakeConn([_run(f"run_{index}", datetime(2026, 2, 20 - index, 1)) for index in range(5)])
+
+    @contextmanager
+    def connect():
+        yield conn
+
+    monkeypatch.setattr(db, "get_connection", connect)
+    return conn
+
+
+def test_page_fetches_one_row_ahead_and_returns_the_keyset_cursor(db, fake) -> None:
+    page = db.load_runs(page_size=2)
+
+    sql, params = fake.executed[-1]
+    assert params == {"limit": 3}
+    assert "ORDER BY start_ts DESC, run_id DESC" in sql
+    assert page.runs["RUN_ID"].tolist() == ["run_0", "run_1"]
+    assert page.next_cursor == (datetime(2026, 2, 19, 1), "run_1")
+
+    last = db.load_runs(page_size=5)
+    assert len(last.runs) == 5
+    assert last.next_cursor is None
+    with pytest.raises(ValueError):
+        db.load_runs(page_size=0)
+
+
+def test_cursor_predicate_breaks_start_ts_ties_on_run_id(db, fake) -> None:
+    cursor = (datetime(2026, 2, 19, 1), "run_b")
+
+    db.load_runs(after=cursor)
+
+    sql, params = fake.executed[-1]
+    assert "(start_ts < %(after_ts)s OR (start_ts = %(after_ts)s AND run_id < %(after_run_id)s))" in sql
+    assert (params["after_ts"], params["after_run_id"]) == cursor
+
+
+def test_cursor_pages_through_tied_start_ts_without_gaps_or_repeats(db, monkeypatch) -> None:
+    pytest.importorskip("duckdb")
+    from pipeline.common.local_backend import LocalDatabase, bootstrap_local
+
+    conn = LocalDatabase(":memory:").connect()
+    bootstrap_local(conn)
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO CTRL.RUN_AUDIT (run_id, dataset_name, batch_date, status, start_ts) VALUES
+              ('run_a', 'claims', '2026-02-19', 'PASSED', '2026-02-19 01:00'),
+              ('run_b', 'claims', '2026-02-19', 'FAILED', '2026-02-19 01:00'),
+              ('run_c', 'claims', '2026-02-19', 'PASSED', '2026-02-19 01:00'),
+              ('run_d', 'claims', '2026-02-18', 'PASSED', '2026-02-18 01:00')
+            """
+        )
+
+    @contextmanager
+    def connect():
+        yield conn
+
+    monkeypatch.setattr(db, "get_connection", connect)
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = db.load_runs(after=cursor, page_size=2)
+        seen.extend(page.runs["RUN_ID"].tolist())
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == ["run_c", "run_b", "run_a", "run_d"]
+
+
+def test_filters_bind_statuses_and_dates_as_parameters(db, fake) -> None:
+    db.load_runs(statuses=["PASSED", "FAILED"], date_from=date(2026, 2, 1), date_to=date(2026, 2, 28))
+
+    sql, params = fake.executed[-1]
+    assert "status IN (%(status_0)s, %(status_1)s)" in sql
+    assert "batch_date >= %(date_from)s" in sql and "batch_date <= %(date_to)s" in sql
+    assert (params["status_0"], params["status_1"]) == ("PASSED", "FAILED")
+    assert (params["date_from"], params["date_to"]) == (date(2026, 2, 1), date(2026, 2, 28))
+
+
+@pytest.mark.parametrize(
+    ("prefix", "pattern"),
+    [
+        ("run_2026", "run!_2026%"),
+        ("50%", "50!%%"),
+        ("a!b", "a!!b%"),
+        ("  run  ", "run%"),
+    ],
+)
+def test_run_id_prefix_escapes_like_wildcards(db, fake, prefix: str, pattern: str) -> None:
+    db.load_runs(run_id_prefix=prefix)
+
+    sql, params = fake.executed[-1]
+    assert "run_id LIKE %(run_id_pattern)s ESCAPE '!'" in sql
+    assert params["run_id_pattern"] == pattern
+
+
+def test_run_labels_are_keyed_by_run_id(db) -> None:
+    runs = pd.DataFrame([_run("run_1", datetime(2026, 2, 19, 1))], columns=list(RUN_COLUMNS))
+    runs.loc[0, "STATUS"] = None
+
+    assert db.run_labels(runs) == {"run_1": "run_1 | 2026-02-19 | UNKNOWN | 2026-02-19 01:00:00"}
+    assert db.run_labels(runs.iloc[0:0]) == {}
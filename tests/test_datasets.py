@@ -0,0 +1,118 @@
+"""Tests for the feed registry and the stages and prechecks it drives."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from pipeline.common.datasets import get_feed, load_feeds
+from pipeline.controls.handlers import PrecheckHandler
+from pipeline.controls.models import ControlContext, ControlDefinition
+from pipeline.ingest.load_to_snowflake import _build_copy_sql, discover_files
+from pipeline.orchestrator import nightly_job
+
+REGISTRY = """
+datasets:
+  raw_snapshot_claims:
+    table: RAW.CLAIMS_SNAPSHOT_NIGHTLY
+  raw_payments:
+    table: RAW.CLAIM_PAYMENTS_NIGHTLY
+  int_snapshot_claims:
+    table: INT.CLAIMS_SNAPSHOT
+feeds:
+  snapshot:
+    file_pattern: "claims_snapshot_{stamp}.csv"
+    schema: schemas/claims_snapshot_schema.json
+    raw_dataset: raw_snapshot_claims
+    int_dataset: int_snapshot_claims
+    business_columns: 32
+    promotion: snapshot
+  payments:
+    file_pattern: "claim_payments_{stamp}.csv"
+    schema: schemas/claim_payments_schema.json
+    raw_dataset: raw_payments
+    business_columns: 6
+    required_headers: [claim_id, paid_amount]
+"""
+
+
+def _registry(tmp_path: Path, text: str = REGISTRY) -> Path:
+    path = tmp_path / "datasets.yaml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_repo_registry_declares_snapshot_and_events_feeds() -> None:
+    feeds = {feed.name: feed for feed in load_feeds()}
+
+    assert list(feeds) == ["snapshot", "events"]
+    assert feeds["snapshot"].raw_table == "RAW.CLAIMS_SNAPSHOT_NIGHTLY"
+    assert feeds["snapshot"].history_name == "CLAIMS_SNAPSHOT"
+    assert feeds["events"].business_columns == 10
+    assert feeds["events"].file_name("2026-02-21") == "claims_events_20260221.csv"
+
+
+def test_registry_rejects_unknown_promotion(tmp_path: Path) -> None:
+    path = _registry(tmp_path, REGISTRY.replace("promotion: snapshot", "promotion: scd2"))
+
+    with pytest.raises(ValueError, match="unknown promotion"):
+        load_feeds(path)
+
+
+def test_new_feed_drives_discovery_copy_and_dag(tmp_path: Path) -> None:
+    feeds = load_feeds(_registry(tmp_path))
+    drop = tmp_path / "drop"
+    drop.mkdir()
+    (drop / "claims_snapshot_20260221.csv").write_text("batch_date\n", encoding="utf-8")
+    (drop / "claim_payments_20260221.csv").write_text("claim_id\n", encoding="utf-8")
+
+    files = discover_files("2026-02-21", str(drop), feeds=feeds)
+    payments = get_feed("payments", _registry(tmp_path))
+    copy_sql = _build_copy_sql(
+        payments.raw_table,
+        "RAW.CSV_FF",
+        "@RAW.CLAIMS_NIGHTLY_STAGE",
+        payments.name,
+        target_columns={f"COL_{idx}" for idx in range(1, 7)},
+        business_columns=payments.business_columns,
+    )
+    stages = {stage.name: stage for stage in nightly_job.build_stages(feeds)}
+
+    assert set(files) == {"snapshot", "payments"}
+    assert "COL_6, SRC_FILENAME" in copy_sql and "t.$7" not in copy_sql
+    # RAW-only feeds are loaded and reconciled but get no promotion stage.
+    assert stages["controls"].depends_on == ("load_snapshot", "load_payments")
+    assert "promote_payments" not in stages
+    assert stages["promote_int"].depends_on == ("promote_snapshot",)
+
+
+def test_schema_precheck_reports_each_registered_feed(tmp_path: Path) -> None:
+    snapshot = tmp_path / "snapshot.csv"
+    snapshot.write_text("batch_date,claim_id\n2026-02-21,C1\n", encoding="utf-8")
+    control = ControlDefinition(
+        control_id="C1_SCHEMA",
+        type="precheck",
+        enabled=True,
+        blocking=True,
+        severity="BLOCK",
+        description="Schema",
+        sql_path=None,
+        params={"datasets_path": str(_registry(tmp_path))},
+    )
+    ctx = ControlContext(
+        run_id="TEST",
+        batch_date=date(2026, 2, 21),
+        files={"snapshot": snapshot},
+        loaded_counts={},
+        connection=None,
+    )
+
+    result = PrecheckHandler().handle(control, ctx)
+
+    assert result.status == "FAIL"
+    assert result.total_count == 2
+    assert result.fail_count == 2
+    # One failure for the snapshot contract, one for the payments file never discovered.
+    assert result.details.startswith("Missing required columns")
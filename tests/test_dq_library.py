@@ -0,0 +1,107 @@
+"""Tests for the batched DQ library engine."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from pipeline.controls.dq_library import build_batch_query, load_dq_rules, rewrite_predicate
+from pipeline.controls.handlers import dq_library_handler
+from pipeline.controls.handlers.dq_library_handler import DqLibraryHandler
+from pipeline.controls.models import ControlContext, ControlDefinition
+
+LEGACY_EXPRESSIONS = {
+    "batch_date": "TRY_TO_DATE(COL_1)",
+    "claim_status": "COL_18",
+    "close_date": "TRY_TO_DATE(COL_17)",
+    "claim_amount_incurred": "TRY_TO_NUMBER(COL_24, 18, 2)",
+    "paid_amount_to_date": "TRY_TO_NUMBER(COL_25, 18, 2)",
+    "reserve_amount": "TRY_TO_NUMBER(COL_26, 18, 2)",
+    "r_tw_flag": "TRY_TO_BOOLEAN(COL_22)",
+    "r_tw_date": "TRY_TO_DATE(COL_23)",
+}
+
+
+def test_repo_rules_parse_into_snapshot_predicates() -> None:
+    """All register rules should reduce to RAW snapshot predicates."""
+    rules = load_dq_rules("rules/dq_rules.yaml")
+
+    assert [rule.rule_id for rule in rules] == ["DQ001", "DQ002", "DQ003"]
+    assert {rule.table for rule in rules} == {"RAW.CLAIMS_SNAPSHOT_NIGHTLY"}
+    assert rules[1].severity == "BLOCK"
+    assert "batch_date" not in rules[0].predicate.lower()
+
+
+def test_rewrite_predicate_keeps_string_literals() -> None:
+    """Column names inside quoted literals must not be rewritten."""
+    rewritten = rewrite_predicate("claim_status = 'claim_status' AND close_date IS NULL", LEGACY_EXPRESSIONS)
+
+    assert rewritten == "(COL_18) = 'claim_status' AND (TRY_TO_DATE(COL_17)) IS NULL"
+
+
+def test_batch_query_is_single_batch_scoped_scan() -> None:
+    """Every rule becomes a COUNT_IF column over one batch-filtered scan."""
+    rules = load_dq_rules("rules/dq_rules.yaml")
+    sql = build_batch_query("RAW.CLAIMS_SNAPSHOT_NIGHTLY", rules, LEGACY_EXPRESSIONS)
+
+    assert sql.count("FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY") == 1
+    assert sql.count("COUNT_IF(") == 3
+    assert "WHERE TRY_TO_DATE(COL_1) = %(batch_date)s::DATE" in sql
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self.description = [("TOTAL_COUNT",), ("DQ001",), ("DQ002",), ("DQ003",)]
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._conn.calls.append((sql, params))
+
+    def fetchone(self):
+        return (50, 0, 2, 1)
+
+
+class _FakeConn:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict | None]] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+def test_handler_reports_each_rule_with_declared_severity(monkeypatch) -> None:
+    """One scan should yield one result per rule, blocking only BLOCK rules."""
+    monkeypatch.setattr(dq_library_handler, "snapshot_expressions", lambda conn: LEGACY_EXPRESSIONS)
+    conn = _FakeConn()
+    control = ControlDefinition(
+        control_id="C9_DQ_LIBRARY",
+        type="dq_library",
+        enabled=True,
+        blocking=True,
+        severity="BLOCK",
+        description="dq library",
+        sql_path=None,
+        params={"rules_path": "rules/dq_rules.yaml"},
+    )
+    context = ControlContext(
+        run_id="run_1",
+        batch_date=date(2026, 2, 21),
+        files={},
+        loaded_counts={},
+        connection=conn,
+    )
+
+    results = DqLibraryHandler().handle(control, context)
+
+    assert len(conn.calls) == 1
+    assert [(r.control_id, r.status, r.severity, r.blocking) for r in results] == [
+        ("DQ001", "PASS", "WARN", False),
+        ("DQ002", "FAIL", "BLOCK", True),
+        ("DQ003", "FAIL", "WARN", False),
+    ]
+    assert all(r.total_count == 50 for r in results)
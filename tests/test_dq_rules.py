@@ -66,3 +66,12 @@ def test_mini_claims_fixture_has_expected_dq_failures() -> None:
 
     missing_claim_id_rows = [row for row in rows if not row["claim_id"]]
     assert len(missing_claim_id_rows) == 1
+
+
+def test_exception_capture_sql_files_exist() -> None:
+    """Controls with exceptions_sql must point at a versioned sample query."""
+    payload = load_controls("rules/controls.yaml")
+    for control in payload.get("controls", []):
+        if control.get("exceptions_sql"):
+            assert control.get("type") == "sql"
+            assert Path("pipeline/controls/sql", control["exceptions_sql"]).exists()
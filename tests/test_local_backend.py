@@ -0,0 +1,204 @@
+"""Tests for the DuckDB local backend: dialect translation and an end-to-end night."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from pipeline.common.local_backend import LocalDatabase, bootstrap_local, translate_sql  # noqa: E402
+from pipeline.common.snowflake_client import ConnectionPool  # noqa: E402
+from pipeline.orchestrator import nightly_job  # noqa: E402
+from pipeline.orchestrator.dag import BLOCKED, COMPLETED, Checkpoint  # noqa: E402
+
+EVENTS_CSV = """batch_date,claim_id,event_ts,event_type,old_status,new_status,amount_delta,currency,source_system,note
+2026-02-19,CLM1001,2026-02-19 09:00:00,CREATED,,OPEN,0,AUD,GUIDEWIRE,lodged
+2026-02-19,CLM1002,2026-02-19 10:00:00,PAYMENT,OPEN,CLOSED,8000.00,AUD,GUIDEWIRE,"final, paid"
+2026-02-19,CLM1005,2026-02-19 11:00:00,STATUS_CHANGE,OPEN,PENDING,0,AUD,CLAIMSYS,review
+"""
+
+
+def test_translate_rewrites_snowflake_functions_outside_literals() -> None:
+    sql = translate_sql(
+        "SELECT IFF(TRY_TO_NUMBER(COL_24, 18, 2) < 0, 1, 0), TRY_TO_DATE(COL_1), "
+        "EQUAL_NULL(a, b), 'IFF(x) stays' AS note, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ"
+    )
+
+    assert "IF(TRY_CAST(COL_24 AS DECIMAL(18, 2)) < 0, 1, 0)" in sql
+    assert "TRY_CAST(COL_1 AS DATE)" in sql
+    assert "(a IS NOT DISTINCT FROM b)" in sql
+    assert "'IFF(x) stays'" in sql
+    assert "CAST(CURRENT_TIMESTAMP AS TIMESTAMP)::TIMESTAMP" in sql
+
+
+def test_translate_listagg_flatten_and_values() -> None:
+    listagg = translate_sql("SELECT LISTAGG(claim_key, ', ') WITHIN GROUP (ORDER BY claim_key) FROM d")
+    flatten = translate_sql("SELECT value::DATE FROM TABLE(FLATTEN(INPUT => PARSE_JSON(%(dates)s)))")
+    values = translate_sql("SELECT column1, column2::DATE FROM VALUES (%(a)s, %(b)s), (%(c)s, %(d)s)")
+
+    assert "STRING_AGG(claim_key, ', ' ORDER BY claim_key)" in listagg
+    assert "(SELECT UNNEST(CAST(JSON(%(dates)s) AS VARCHAR[])) AS value)" in flatten
+    assert "FROM (VALUES (%(a)s, %(b)s), (%(c)s, %(d)s)) AS _values(column1, column2)" in values
+
+
+def test_merge_reports_snowflake_counts() -> None:
+    conn = LocalDatabase(":memory:").connect()
+    with conn.cursor() as cur:
+        cur.execute("CREATE TABLE INT.T (k STRING, v NUMBER(18,2), PRIMARY KEY (k))")
+        cur.execute("INSERT INTO INT.T SELECT * FROM VALUES ('a', 1), ('b', 2)")
+        cur.execute(
+            """
+            MERGE INTO INT.T AS tgt
+            USING (SELECT column1 AS k, column2 AS v FROM VALUES ('a', 1), ('b', 5), ('c', 3)) AS src
+            ON tgt.k = src.k
+            WHEN MATCHED AND tgt.v IS DISTINCT FROM src.v THEN UPDATE SET v = src.v
+            WHEN NOT MATCHED THEN INSERT (k, v) VALUES (src.k, src.v)
+            """
+        )
+
+        assert [col[0] for col in cur.description] == ["number of rows inserted", "number of rows updated"]
+        assert cur.fetchone() == (1, 1)
+
+
+class _RecordingCursor:
+    """Delegates to a local cursor and records each request's SQL and statement count."""
+
+    def __init__(self, cursor, log: list[tuple[str, int | None]]) -> None:
+        self._cursor = cursor
+        self._log = log
+
+    def __enter__(self) -> "_RecordingCursor":
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return self._cursor.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def execute(self, sql: str, params=None, *, num_statements: int | None = None, **kwargs):
+        self._log.append((sql, num_statements))
+        return self._cursor.execute(sql, params, num_statements=num_statements, **kwargs)
+
+
+class _RecordingConnection:
+    def __init__(self, conn, log: list[tuple[str, int | None]]) -> None:
+        self._conn = conn
+        self._log = log
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def cursor(self) -> _RecordingCursor:
+        return _RecordingCursor(self._conn.cursor(), self._log)
+
+
+def _local_night(tmp_path: Path, *, keep_failing_rows: bool = False) -> tuple[LocalDatabase, ConnectionPool, dict]:
+    """Seed a drop folder and a bootstrapped local database; return it, a pool and the run params."""
+    drop = tmp_path / "drop"
+    drop.mkdir()
+    snapshot_rows = [
+        line
+        for line in Path("tests/fixtures/mini_claims.csv").read_text(encoding="utf-8").splitlines()
+        # Drop the fixture's deliberately bad rows: a missing claim_id fails validation,
+        # and CLM1003's negative amounts fail blocking controls unless kept.
+        if ",GUIDEWIRE,," not in line and (keep_failing_rows or "CLM1003" not in line)
+    ]
+    (drop / "claims_snapshot_20260219.csv").write_text("\n".join(snapshot_rows) + "\n", encoding="utf-8")
+    (drop / "claims_events_20260219.csv").write_text(EVENTS_CSV, encoding="utf-8")
+    database = LocalDatabase(":memory:")
+    bootstrap = database.connect()
+    bootstrap_local(bootstrap)
+    bootstrap.close()
+    params = {
+        "stage": "@RAW.CLAIMS_NIGHTLY_STAGE",
+        "file_format": "RAW.CSV_FF",
+        "input_dir": str(drop),
+        "max_parallel": 4,
+    }
+    return database, ConnectionPool(database.connect, max_size=4), params
+
+
+def test_nightly_job_runs_end_to_end_and_reruns_idempotently(tmp_path: Path) -> None:
+    database, pool, params = _local_night(tmp_path)
+
+    results = [
+        nightly_job.run_pipeline(Checkpoint.create(tmp_path, run_id, "2026-02-19", params), connect=pool.connection)
+        for run_id in ("run_local_1", "run_local_2")
+    ]
+
+    reader = database.connect(autocommit=True)
+    with reader.cursor() as cur:
+        cur.execute(
+            "SELECT run_id, dataset_name, inserted_count, unchanged_count "
+            "FROM CTRL.PROMOTION_HISTORY ORDER BY run_id, dataset_name"
+        )
+        history = cur.fetchall()
+        cur.execute("SELECT batch_date, claim_count, total_amount FROM GOLD.CLAIMS_MART")
+        mart = cur.fetchall()
+        cur.execute("SELECT COUNT(*) FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY")
+        raw_rows = cur.fetchone()[0]
+
+    assert [result.status for result in results] == [COMPLETED, COMPLETED]
+    assert history == [
+        ("run_local_1", "CLAIMS_EVENTS", 3, 0),
+        ("run_local_1", "CLAIMS_SNAPSHOT", 3, 0),
+        ("run_local_2", "CLAIMS_EVENTS", 0, 3),
+        ("run_local_2", "CLAIMS_SNAPSHOT", 0, 3),
+    ]
+    assert [(str(row[0]), row[1], float(row[2])) for row in mart] == [("2026-02-19", 3, 30000.0)]
+    # The rerun's COPY skips the already-loaded file, as Snowflake load metadata does.
+    assert raw_rows == 3
+
+
+def test_resumed_blocked_controls_replace_the_runs_earlier_evidence(tmp_path: Path) -> None:
+    database, pool, params = _local_night(tmp_path, keep_failing_rows=True)
+
+    checkpoint = Checkpoint.create(tmp_path, "run_blocked", "2026-02-19", params)
+    first = nightly_job.run_pipeline(checkpoint, connect=pool.connection)
+    reader = database.connect(autocommit=True)
+
+    def evidence() -> tuple[int, int, int]:
+        with reader.cursor() as cur:
+            cur.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT control_id) FROM CTRL.CONTROL_RESULT WHERE run_id = 'run_blocked'"
+            )
+            results, controls = cur.fetchone()
+            cur.execute("SELECT COUNT(*) FROM CTRL.EXCEPTIONS WHERE run_id = 'run_blocked'")
+            return results, controls, cur.fetchone()[0]
+
+    after_first = evidence()
+    resumed = nightly_job.run_pipeline(Checkpoint.load(tmp_path, "run_blocked"), connect=pool.connection)
+
+    assert (first.status, resumed.status) == (BLOCKED, BLOCKED)
+    assert resumed.failed_stage == "controls"
+    assert after_first[0] == after_first[1] and after_first[2] > 0
+    assert evidence() == after_first
+
+
+def test_nightly_bookkeeping_is_one_request_per_stage_boundary(tmp_path: Path) -> None:
+    database, _pool, params = _local_night(tmp_path)
+    requests: list[tuple[str, int | None]] = []
+    pool = ConnectionPool(lambda: _RecordingConnection(database.connect(), requests), max_size=4)
+
+    result = nightly_job.run_pipeline(
+        Checkpoint.create(tmp_path, "run_books", "2026-02-19", params), connect=pool.connection
+    )
+
+    bookkeeping = [
+        (sql, num_statements)
+        for sql, num_statements in requests
+        if sql.lstrip().startswith(("INSERT", "UPDATE"))
+        and ("CTRL.RUN_AUDIT" in sql or "CTRL.PROMOTION_HISTORY" in sql)
+    ]
+    assert result.status == COMPLETED
+    # discover opens the audit row; refresh_gold writes both feeds' history and closes it.
+    assert len(bookkeeping) == 2
+    assert "INSERT INTO CTRL.RUN_AUDIT" in bookkeeping[0][0] and bookkeeping[0][1] is None
+    closing_sql, closing_statements = bookkeeping[1]
+    assert closing_statements == 3
+    assert closing_sql.count("INSERT INTO CTRL.PROMOTION_HISTORY") == 2
+    assert "UPDATE CTRL.RUN_AUDIT" in closing_sql
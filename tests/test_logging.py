@@ -0,0 +1,128 @@
+"""Tests for queued JSON logging, context propagation and debug rate limiting."""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+from pipeline.common import logging as pipeline_logging
+from pipeline.common.logging import (
+    ContextQueueHandler,
+    DebugRateLimiter,
+    JsonFormatter,
+    log_context,
+)
+
+
+def _drain(log_queue: queue.SimpleQueue, fast: bool = True) -> list[dict]:
+    formatter = JsonFormatter(fast=fast)
+    records = []
+    while not log_queue.empty():
+        records.append(json.loads(formatter.format(log_queue.get_nowait())))
+    return records
+
+
+@pytest.fixture()
+def queued_logger():
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    logger = logging.getLogger("tests.queued")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger, log_queue, handler
+    logger.removeHandler(handler)
+
+
+def test_context_is_bound_on_the_calling_thread_and_inherited_by_copied_contexts(queued_logger) -> None:
+    logger, log_queue, _handler = queued_logger
+    payload = {"rows": 1}
+
+    with log_context(run_id="run_1", batch_date="2026-02-19"):
+        logger.info("loaded %s", payload)
+        # Mutating an argument after logging must not change the queued message.
+        payload["rows"] = 2
+        with log_context(stage="load_snapshot"):
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(logger.warning, "in stage"))
+            worker.start()
+            worker.join()
+        logger.info("explicit", extra={"run_id": "run_override"})
+    logger.info("outside")
+
+    first, in_stage, explicit, outside = _drain(log_queue)
+    assert first["message"] == "loaded {'rows': 1}"
+    assert (first["run_id"], first["batch_date"]) == ("run_1", "2026-02-19")
+    assert (in_stage["run_id"], in_stage["stage"]) == ("run_1", "load_snapshot")
+    assert explicit["run_id"] == "run_override"
+    assert "run_id" not in outside
+
+
+def test_exceptions_are_rendered_before_crossing_threads(queued_logger) -> None:
+    logger, log_queue, _handler = queued_logger
+
+    try:
+        raise ValueError("bad batch")
+    except ValueError:
+        logger.exception("control failed")
+
+    (record,) = _drain(log_queue, fast=False)
+    assert record["message"] == "control failed"
+    assert "ValueError: bad batch" in record["exc"]
+
+
+def test_debug_records_are_rate_limited_per_call_site_and_report_suppression(queued_logger) -> None:
+    logger, log_queue, handler = queued_logger
+    clock = [0.0]
+    handler.addFilter(DebugRateLimiter(rate_per_second=1.0, burst=3, clock=lambda: clock[0]))
+
+    for index in range(12):
+        if index == 10:
+            logger.info("kept")
+            clock[0] += 5.0
+        logger.debug("row batch %s", index)
+
+    messages = [(item["message"], item.get("suppressed")) for item in _drain(log_queue)]
+    assert messages == [
+        ("row batch 0", None),
+        ("row batch 1", None),
+        ("row batch 2", None),
+        ("kept", None),
+        ("row batch 10", 7),
+        ("row batch 11", None),
+    ]
+
+
+def test_debug_sampling_keeps_one_in_n() -> None:
+    limiter = DebugRateLimiter(rate_per_second=1000, burst=1000, sample_every=4)
+    record = logging.LogRecord("tests", logging.DEBUG, __file__, 1, "tick", None, None)
+
+    kept = [limiter.filter(record) for _ in range(8)]
+
+    assert kept == [True, False, False, False, True, False, False, False]
+    with pytest.raises(ValueError):
+        DebugRateLimiter(sample_every=0)
+
+
+def test_configure_logging_writes_rotating_json_file_via_listener(tmp_path, monkeypatch) -> None:
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    level = root.level
+    try:
+        pipeline_logging.configure_logging(log_dir=tmp_path, max_bytes=400, backup_count=2)
+        with log_context(run_id="run_9"):
+            for index in range(20):
+                logging.getLogger("tests.file").info("stage done %s", index)
+    finally:
+        pipeline_logging.shutdown_logging()
+        root.setLevel(level)
+
+    lines = (tmp_path / "pipeline.log").read_text(encoding="utf-8").splitlines()
+    assert (tmp_path / "pipeline.log.1").exists()
+    assert not (tmp_path / "pipeline.log.3").exists()
+    assert json.loads(lines[-1])["message"] == "stage done 19"
+    assert json.loads(lines[-1])["run_id"] == "run_9"
@@ -0,0 +1,150 @@
+"""Tests for the metrics registry, Prometheus text rendering and the textfile writer."""
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from pipeline.common import metrics
+from pipeline.common.metrics import MetricsRegistry, PeriodicTextfileWriter, write_textfile
+from pipeline.controls.engine import ControlEngine
+from pipeline.controls.models import ControlContext, ControlDefinition
+
+
+def test_registry_renders_prometheus_text_families_in_name_order() -> None:
+    registry = MetricsRegistry()
+    rows = registry.counter("pipe_rows", "Rows seen.", ("feed",))
+    latency = registry.gauge("pipe_latency_seconds", 'Latency "now".')
+    copy = registry.histogram("pipe_copy_seconds", "COPY time.", ("feed",), buckets=(1.0, 5.0))
+
+    rows.inc(3, feed="events")
+    rows.inc(2, feed="events")
+    latency.set(12.5)
+    for value in (0.5, 1.0, 7.0):
+        copy.observe(value, feed="snapshot")
+
+    assert registry.render().splitlines() == [
+        "# HELP pipe_copy_seconds COPY time.",
+        "# TYPE pipe_copy_seconds histogram",
+        'pipe_copy_seconds_bucket{feed="snapshot",le="1.0"} 2',
+        'pipe_copy_seconds_bucket{feed="snapshot",le="5.0"} 2',
+        'pipe_copy_seconds_bucket{feed="snapshot",le="+Inf"} 3',
+        'pipe_copy_seconds_count{feed="snapshot"} 3',
+        'pipe_copy_seconds_sum{feed="snapshot"} 8.5',
+        '# HELP pipe_latency_seconds Latency \\"now\\".',
+        "# TYPE pipe_latency_seconds gauge",
+        "pipe_latency_seconds 12.5",
+        "# HELP pipe_rows_total Rows seen.",
+        "# TYPE pipe_rows_total counter",
+        'pipe_rows_total{feed="events"} 5',
+    ]
+
+
+def test_every_sample_belongs_to_the_family_its_type_line_declares() -> None:
+    """Prometheus 0.0.4 ingests a sample outside its TYPE'd family as a separate untyped metric."""
+    registry = MetricsRegistry()
+    registry.counter("pipe_bytes", "Bytes.", ("feed",)).inc(10, feed="events")
+    registry.gauge("pipe_rate", "Rate.").set(2.5)
+    registry.histogram("pipe_seconds", "Time.").observe(3.0)
+    families: dict[str, str] = {}
+    samples: list[tuple[str, str]] = []
+    for line in registry.render().splitlines():
+        if line.startswith("# TYPE "):
+            _hash, _type, name, kind = line.split(" ")
+            families[name] = kind
+        elif not line.startswith("#"):
+            samples.append((line.split("{", 1)[0].split(" ", 1)[0], line))
+
+    assert families == {"pipe_bytes_total": "counter", "pipe_rate": "gauge", "pipe_seconds": "histogram"}
+    for name, line in samples:
+        family = name
+        if name not in families:
+            family = name.rsplit("_", 1)[0]
+            assert families.get(family) == "histogram", line
+        if name.endswith("_bucket"):
+            bound = line.split('le="', 1)[1].split('"', 1)[0]
+            assert bound == "+Inf" or float(bound) == float(bound) and "." in bound, line
+    assert metrics.ROWS_VALIDATED.family == "claims_pipeline_rows_validated_total"
+
+
+def test_registry_rejects_bad_labels_decrements_and_conflicting_families() -> None:
+    registry = MetricsRegistry()
+    rows = registry.counter("pipe_rows", "Rows seen.", ("feed",))
+
+    assert registry.counter("pipe_rows", "Rows seen.", ("feed",)) is rows
+    with pytest.raises(ValueError, match="expects labels"):
+        rows.inc(1, table="x")
+    with pytest.raises(ValueError, match="only increase"):
+        rows.inc(-1, feed="events")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("pipe_rows", "Rows seen.", ("feed",))
+
+
+def test_textfile_is_replaced_atomically_and_periodic_writer_ends_with_final_values(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    gauge = registry.gauge("pipe_progress", "Progress.")
+    target = tmp_path / "textfile" / "claims_pipeline.prom"
+
+    gauge.set(1)
+    write_textfile(target, registry)
+    assert "pipe_progress 1\n" in target.read_text(encoding="utf-8")
+
+    written = threading.Event()
+    with PeriodicTextfileWriter(target, 0.01, registry) as writer:
+        original = writer._write
+
+        def spy() -> None:
+            original()
+            written.set()
+
+        writer._write = spy  # type: ignore[method-assign]
+        gauge.set(2)
+        assert written.wait(5)
+        gauge.set(3)
+
+    assert "pipe_progress 3\n" in target.read_text(encoding="utf-8")
+    # Only the target remains; no temporary file is left for the collector to see.
+    assert [path.name for path in target.parent.iterdir()] == ["claims_pipeline.prom"]
+
+
+class _MemoryRepository:
+    def __init__(self) -> None:
+        self.results = []
+
+    def persist(self, result) -> None:
+        self.results.append(result)
+
+    def flush(self) -> None:
+        return None
+
+
+def test_control_engine_records_duration_and_status_per_control() -> None:
+    control = ControlDefinition(
+        control_id="C_METRICS_GATE",
+        type="gate",
+        enabled=True,
+        blocking=True,
+        severity="HIGH",
+        description="Promotion gate",
+        sql_path=None,
+        params={},
+    )
+    before = metrics.CONTROL_RESULTS.value(control_id="C_METRICS_GATE", status="PASS")
+    runs = metrics.CONTROL_DURATION.count(control_id="C_METRICS_GATE")
+
+    ControlEngine(_MemoryRepository()).run(
+        ControlContext(
+            run_id="run_1",
+            batch_date=date(2026, 2, 19),
+            files={},
+            loaded_counts={},
+            connection=None,
+        ),
+        controls=[control],
+    )
+
+    assert metrics.CONTROL_RESULTS.value(control_id="C_METRICS_GATE", status="PASS") == before + 1
+    assert metrics.CONTROL_DURATION.count(control_id="C_METRICS_GATE") == runs + 1
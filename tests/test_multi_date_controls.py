@@ -0,0 +1,251 @@
+"""Tests for multi-date (grouped) control evaluation."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from pipeline.controls.engine import ControlEngine, _skip_result
+from pipeline.controls.handlers import sql_handler
+from pipeline.controls.handlers.sql_handler import SqlHandler
+from pipeline.controls.models import ControlContext, ControlDefinition
+from pipeline.controls.multi_date import rewrite_for_date_range
+from pipeline.controls.registry import ControlRegistry
+
+_DESCRIPTION = [
+    ("BATCH_DATE",),
+    ("CONTROL_VALUE",),
+    ("TOTAL_COUNT",),
+    ("FAIL_COUNT",),
+    ("VARIANCE",),
+    ("STATUS",),
+    ("DETAILS",),
+]
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self.description = _DESCRIPTION
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._conn.calls.append((sql, params))
+
+    def fetchall(self):
+        return self._conn.rows
+
+    def fetchone(self):
+        return self._conn.rows[0]
+
+
+class _FakeConn:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.calls: list[tuple[str, dict | None]] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+class _FakeRepository:
+    def __init__(self) -> None:
+        self.persisted = []
+
+    def persist(self, result) -> None:
+        self.persisted.append(result)
+
+    def flush(self) -> None:
+        return None
+
+
+def _patch_expressions(monkeypatch) -> None:
+    monkeypatch.setattr(
+        sql_handler,
+        "snapshot_expressions",
+        lambda conn: {
+            "batch_date": "BATCH_DATE",
+            "claim_id": "CLAIM_ID",
+            "claim_amount_incurred": "CLAIM_AMOUNT_INCURRED",
+            "paid_amount_to_date": "PAID_AMOUNT_TO_DATE",
+            "reserve_amount": "RESERVE_AMOUNT",
+            "src_file_row_number": "SRC_FILE_ROW_NUMBER",
+        },
+    )
+    monkeypatch.setattr(sql_handler, "events_expressions", lambda conn: {})
+
+
+def _control(**overrides) -> ControlDefinition:
+    values = {
+        "control_id": "C2_DQ_NON_NEGATIVE",
+        "type": "sql",
+        "enabled": True,
+        "blocking": True,
+        "severity": "BLOCK",
+        "description": "dq",
+        "sql_path": "C2_DQ_NON_NEGATIVE.sql",
+        "params": {},
+    }
+    values.update(overrides)
+    return ControlDefinition(**values)
+
+
+def _contexts(conn, *days: int) -> list[ControlContext]:
+    return [
+        ControlContext(
+            run_id=f"backfill_2026-01-{day:02d}",
+            batch_date=date(2026, 1, day),
+            files={},
+            loaded_counts={},
+            connection=conn,
+        )
+        for day in days
+    ]
+
+
+def test_rewrite_groups_single_batch_template_by_date() -> None:
+    template = Path("pipeline/controls/sql/C2_DQ_NON_NEGATIVE.sql").read_text(encoding="utf-8")
+
+    rewritten = rewrite_for_date_range(template)
+
+    assert "%(batch_date)s" not in rewritten
+    assert (
+        "{{snapshot_batch_date}} BETWEEN %(start_date)s::DATE AND %(end_date)s::DATE"
+        in rewritten
+    )
+    assert "{{snapshot_batch_date}} AS batch_date," in rewritten
+    assert rewritten.rstrip().endswith("GROUP BY {{snapshot_batch_date}}")
+
+
+def test_rewrite_rejects_templates_with_ctes() -> None:
+    template = Path("pipeline/controls/sql/C8_DUPLICATE_CLAIM_ID.sql").read_text(encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        rewrite_for_date_range(template)
+
+
+def test_handle_range_runs_one_query_and_maps_rows_by_date(monkeypatch) -> None:
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(
+        rows=[
+            ("2026-01-01", 0, 10, 0, None, "PASS", "ok"),
+            (date(2026, 1, 3), 2, 12, 2, None, "FAIL", "negatives"),
+        ]
+    )
+
+    results = SqlHandler().handle_range(_control(), _contexts(conn, 1, 2, 3))
+
+    assert len(conn.calls) == 1
+    sql, params = conn.calls[0]
+    assert "GROUP BY BATCH_DATE" in sql
+    assert params["start_date"] == "2026-01-01"
+    assert params["end_date"] == "2026-01-03"
+    assert [result.status for result in results] == ["PASS", "SKIP", "FAIL"]
+    assert [result.run_id for result in results] == [
+        "backfill_2026-01-01",
+        "backfill_2026-01-02",
+        "backfill_2026-01-03",
+    ]
+    assert results[2].fail_count == 2
+
+
+@pytest.mark.parametrize("persist", [True, False])
+def test_handle_range_samples_exceptions_per_failing_date_only_when_persisting(monkeypatch, persist: bool) -> None:
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(
+        rows=[
+            ("2026-01-01", 0, 10, 0, None, "PASS", "ok"),
+            ("2026-01-03", 2, 12, 2, None, "FAIL", "negatives"),
+        ]
+    )
+    control = _control(exceptions_sql="C2_DQ_NON_NEGATIVE_EXCEPTIONS.sql")
+
+    SqlHandler().handle_range(control, _contexts(conn, 1, 2, 3), persist=persist)
+
+    inserts = [params for sql, params in conn.calls if "INSERT INTO CTRL.EXCEPTIONS" in sql]
+    if persist:
+        assert [(params["run_id"], params["batch_date"]) for params in inserts] == [
+            ("backfill_2026-01-03", "2026-01-03")
+        ]
+    else:
+        assert inserts == []
+    assert len(conn.calls) == 1 + len(inserts)
+
+
+def test_handle_range_fallback_skips_exceptions_when_not_persisting(monkeypatch) -> None:
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(rows=[("2026-01-01", 2, 12, 2, None, "FAIL", "negatives")])
+    control = _control(
+        sql_path=None,
+        # A CTE cannot be rewritten, so each date runs on its own.
+        query="WITH t AS (SELECT 1) SELECT * FROM t WHERE %(batch_date)s IS NOT NULL",
+        exceptions_sql="C2_DQ_NON_NEGATIVE_EXCEPTIONS.sql",
+    )
+
+    results = SqlHandler().handle_range(control, _contexts(conn, 1, 2), persist=False)
+
+    assert [result.status for result in results] == ["FAIL", "FAIL"]
+    assert not any("INSERT INTO CTRL.EXCEPTIONS" in sql for sql, _params in conn.calls)
+    assert len(conn.calls) == 2
+
+
+def test_range_sql_path_is_registered_for_duplicate_control() -> None:
+    definitions = {item.control_id: item for item in ControlRegistry().load()}
+
+    assert definitions["C8_DUPLICATE_CLAIM_ID"].range_sql_path == "C8_DUPLICATE_CLAIM_ID_RANGE.sql"
+    template = Path("pipeline/controls/sql/C8_DUPLICATE_CLAIM_ID_RANGE.sql").read_text(encoding="utf-8")
+    assert "%(start_date)s" in template
+    assert "%(batch_date)s" not in template
+
+
+def test_run_range_skips_prechecks_and_gates_each_date(monkeypatch) -> None:
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(
+        rows=[
+            ("2026-01-01", 0, 10, 0, None, "PASS", "ok"),
+            ("2026-01-02", 1, 10, 1, None, "FAIL", "negatives"),
+        ]
+    )
+    repository = _FakeRepository()
+    controls = [
+        _control(control_id="C1_PRECHECK", type="precheck", sql_path=None),
+        _control(),
+        _control(control_id="C7_GATE", type="gate", sql_path=None),
+    ]
+
+    summaries = ControlEngine(repository=repository).run_range(
+        _contexts(conn, 1, 2),
+        controls=controls,
+    )
+
+    assert len(conn.calls) == 1
+    assert [summary.blocking_failures for summary in summaries] == [0, 2]
+    assert summaries[0].results[0].status == "SKIP"
+    assert summaries[1].results[-1].details == "Blocking failures: C2_DQ_NON_NEGATIVE"
+    assert len(repository.persisted) == 6
+
+
+def test_run_range_records_a_failing_gate_as_error_and_keeps_going(monkeypatch) -> None:
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(rows=[("2026-01-01", 0, 10, 0, None, "PASS", "ok")])
+
+    class _FlakyGate:
+        def handle(self, control, context, prior):
+            if context.batch_date == date(2026, 1, 1):
+                raise RuntimeError("gate lookup failed")
+            return _skip_result(context, control, "gate ok")
+
+    summaries = ControlEngine(repository=_FakeRepository(), gate_handler=_FlakyGate()).run_range(
+        _contexts(conn, 1, 2),
+        controls=[_control(), _control(control_id="C7_GATE", type="gate", sql_path=None)],
+    )
+
+    assert [summary.results[-1].status for summary in summaries] == ["ERROR", "SKIP"]
+    assert summaries[0].results[-1].details == "gate lookup failed"
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from pipeline.promote import promote_int_gold
 
 
@@ -20,45 +22,223 @@ class _FakeCursor:
         self._last_sql = sql
         self._conn.calls.append((sql, params))
 
+    @property
+    def description(self):
+        if "MERGE INTO" in self._last_sql:
+            names = ["number of rows inserted", "number of rows updated"]
+            return [(name,) for name in names[: len(self._conn.merge_counts)]]
+        return [("COUNT",)]
+
     def fetchone(self):
-        if "SELECT COUNT(*)" in self._last_sql:
-            return (0,)
+        if "MERGE INTO" in self._last_sql:
+            return self._conn.merge_counts
+        if "key_rows" in self._last_sql:
+            return (self._conn.source_rows, self._conn.source_claims)
+        if "displaced_batch_dates" in self._last_sql:
+            return (self._conn.source_rows, self._conn.source_claims, self._conn.displaced)
         return None
 
 
 class _FakeConn:
-    def __init__(self) -> None:
+    def __init__(self, source_claims: int = 0, merge_counts: tuple[int, ...] = (0, 0)) -> None:
         self.calls: list[tuple[str, dict | None]] = []
+        self.source_claims = source_claims
+        self.merge_counts = merge_counts
+        self.displaced = None
+        self.source_rows = source_claims
 
     def cursor(self) -> _FakeCursor:
         return _FakeCursor(self)
 
 
+_LEGACY_EXPRESSIONS = {
+    "batch_date": "TRY_TO_DATE(COL_1)",
+    "claim_id": "COL_3",
+    "policy_id": "COL_5",
+    "customer_id": "COL_6",
+    "claim_amount_incurred": "TRY_TO_NUMBER(COL_24, 18, 2)",
+    "paid_amount_to_date": "TRY_TO_NUMBER(COL_25, 18, 2)",
+    "reserve_amount": "TRY_TO_NUMBER(COL_26, 18, 2)",
+    "loss_date": "TRY_TO_DATE(COL_12)",
+    "report_date": "TRY_TO_DATE(COL_13)",
+    "claim_status": "COL_18",
+    "pii_class": "COL_29",
+    "loaded_at": "LOAD_TS",
+}
+
+
 def test_promote_sql_deduplicates_by_claim_id(monkeypatch) -> None:
     """Merge source should deduplicate RAW rows per claim_id."""
+    monkeypatch.setattr(promote_int_gold, "snapshot_expressions", lambda conn: _LEGACY_EXPRESSIONS)
+
+    conn = _FakeConn()
+    promote_int_gold.promote_snapshot_to_int(conn, "2026-02-21")
+
+    source_sql = next(sql for sql, _ in conn.calls if "CREATE OR REPLACE TEMPORARY TABLE" in sql)
+    assert "QUALIFY ROW_NUMBER() OVER" in source_sql
+    assert "PARTITION BY src.claim_id" in source_sql
+    assert "ORDER BY src.loaded_at DESC NULLS LAST" in source_sql
+
+
+def test_promote_materialises_the_source_once_for_preview_and_merge(monkeypatch) -> None:
+    """RAW is scanned once; the preview and MERGE read the temporary source table."""
+    monkeypatch.setattr(promote_int_gold, "snapshot_expressions", lambda conn: _LEGACY_EXPRESSIONS)
+
+    conn = _FakeConn(source_claims=10, merge_counts=(1, 2))
+    promote_int_gold.promote_snapshot_to_int(conn, "2026-02-21")
+
+    raw_scans = [sql for sql, _ in conn.calls if "FROM RAW.CLAIMS_SNAPSHOT_NIGHTLY" in sql]
+    assert len(raw_scans) == 1
+    assert "CREATE OR REPLACE TEMPORARY TABLE PROMOTE_SNAPSHOT_SRC AS" in raw_scans[0]
+    preview_sql = next(sql for sql, _ in conn.calls if "displaced_batch_dates" in sql)
+    merge_sql = next(sql for sql, _ in conn.calls if "MERGE INTO INT.CLAIMS_SNAPSHOT" in sql)
+    assert "FROM PROMOTE_SNAPSHOT_SRC" in preview_sql
+    assert "LEFT JOIN" not in preview_sql
+    assert "USING PROMOTE_SNAPSHOT_SRC AS src" in merge_sql
+    # Schema upgrades live in sql/99_maintenance, not on the nightly path.
+    assert not any(sql.lstrip().startswith("ALTER") for sql, _ in conn.calls)
+
+
+def test_promote_updates_only_changed_rows_and_reports_counts(monkeypatch) -> None:
+    """Matched claims are rewritten only when the business-column hash differs."""
+    monkeypatch.setattr(promote_int_gold, "snapshot_expressions", lambda conn: _LEGACY_EXPRESSIONS)
+
+    conn = _FakeConn(source_claims=100, merge_counts=(5, 12))
+    conn.source_rows = 103
+    result = promote_int_gold.promote_snapshot_to_int(conn, "2026-02-21")
+
+    merge_sql = next(sql for sql, _ in conn.calls if "MERGE INTO INT.CLAIMS_SNAPSHOT" in sql)
+    source_sql = next(sql for sql, _ in conn.calls if "CREATE OR REPLACE TEMPORARY TABLE" in sql)
+    assert "WHEN MATCHED AND tgt.row_hash IS DISTINCT FROM src.row_hash" in merge_sql
+    hash_args = source_sql.split("HASH(", 1)[1].split(")", 1)[0]
+    assert "src.claim_status" in hash_args
+    assert "batch_date" not in hash_args
+    assert "loaded_at" not in hash_args
+    assert (result.inserted, result.updated, result.unchanged) == (5, 12, 83)
+    assert (result.source_rows, result.dedup_dropped) == (103, 3)
+    assert result.promoted == 17
+    assert not any("FROM INT.CLAIMS_SNAPSHOT\n      WHERE batch_date" in sql for sql, _ in conn.calls)
+
+
+def test_promotion_tracks_touched_gold_dates(monkeypatch) -> None:
+    """Updated claims displace their previous batch date from GOLD."""
+    monkeypatch.setattr(promote_int_gold, "snapshot_expressions", lambda conn: _LEGACY_EXPRESSIONS)
+
+    conn = _FakeConn(source_claims=10, merge_counts=(1, 2))
+    conn.displaced = '[\n  "2026-02-19",\n  "2026-02-20"\n]'
+    result = promote_int_gold.promote_snapshot_to_int(conn, "2026-02-21")
+
+    assert result.touched_batch_dates == ("2026-02-19", "2026-02-20", "2026-02-21")
+
+
+def test_gold_refresh_merges_only_touched_dates() -> None:
+    """GOLD refresh is scoped to the given dates and drops emptied ones."""
+    conn = _FakeConn()
+
+    refreshed = promote_int_gold.promote_int_to_gold(conn, ["2026-02-21", "2026-02-19", "2026-02-21"])
+
+    assert refreshed == 2
+    sql, params = conn.calls[0]
+    assert "MERGE INTO GOLD.CLAIMS_MART" in sql
+    assert "WHEN MATCHED AND src.claim_count = 0 THEN DELETE" in sql
+    assert params == {"batch_dates": '["2026-02-19", "2026-02-21"]'}
+    assert promote_int_gold.promote_int_to_gold(conn, []) == 0
+    assert len(conn.calls) == 1
+
+
+def test_events_promotion_is_insert_only_on_registry_keys(monkeypatch) -> None:
+    """Events MERGE dedups on the datasets.yaml key and never updates."""
     monkeypatch.setattr(
         promote_int_gold,
-        "snapshot_expressions",
+        "events_expressions",
         lambda conn: {
-            "batch_date": "TRY_TO_DATE(COL_1)",
-            "claim_id": "COL_3",
-            "policy_id": "COL_5",
-            "customer_id": "COL_6",
-            "claim_amount_incurred": "TRY_TO_NUMBER(COL_24, 18, 2)",
-            "paid_amount_to_date": "TRY_TO_NUMBER(COL_25, 18, 2)",
-            "reserve_amount": "TRY_TO_NUMBER(COL_26, 18, 2)",
-            "loss_date": "TRY_TO_DATE(COL_12)",
-            "report_date": "TRY_TO_DATE(COL_13)",
-            "claim_status": "COL_18",
-            "pii_class": "COL_29",
+            "batch_date": "BATCH_DATE",
+            "claim_id": "COL_2",
+            "event_ts": "TRY_TO_TIMESTAMP_NTZ(COL_3)",
+            "event_type": "COL_4",
+            "old_status": "COL_5",
+            "new_status": "COL_6",
+            "amount_delta": "TRY_TO_NUMBER(COL_7, 18, 2)",
+            "currency": "COL_8",
+            "source_system": "COL_9",
+            "note": "COL_10",
             "loaded_at": "LOAD_TS",
         },
     )
 
+    conn = _FakeConn(source_claims=9, merge_counts=(7,))
+    conn.source_rows = 10
+    result = promote_int_gold.promote_events_to_int(conn, "2026-02-21")
+
+    merge_sql = next(sql for sql, _ in conn.calls if "MERGE INTO INT.CLAIMS_EVENTS" in sql)
+    assert "PARTITION BY src.claim_id, src.event_ts, src.event_type" in merge_sql
+    assert "EQUAL_NULL(tgt.event_type, src.event_type)" in merge_sql
+    assert "WHEN MATCHED" not in merge_sql
+    assert "TRY_TO_TIMESTAMP_NTZ(COL_3) AS event_ts" in merge_sql
+    assert (result.inserted, result.updated, result.unchanged) == (7, 0, 2)
+    assert (result.source_rows, result.dedup_dropped) == (10, 1)
+
+
+class _MultiStatementCursor(_FakeCursor):
+    def __init__(self, conn) -> None:
+        super().__init__(conn)
+        self._results: list[tuple] = []
+
+    def execute(self, sql: str, params: dict | None = None, num_statements: int | None = None) -> None:
+        super().execute(sql, params)
+        self._conn.num_statements = num_statements
+        self._results = [("Table already exists",)] * 3 + [(2,), (0,), (1,)]
+
+    def fetchone(self):
+        return self._results[0]
+
+    def nextset(self):
+        self._results = self._results[1:]
+        return bool(self._results) or None
+
+
+def test_dimension_promotion_uses_one_multi_statement_request() -> None:
+    """Unseen dimension keys are inserted via anti-joins in one round trip."""
     conn = _FakeConn()
-    promote_int_gold.promote_snapshot_to_int(conn, "2026-02-21")
+    conn.cursor = lambda: _MultiStatementCursor(conn)  # type: ignore[method-assign]
 
-    merge_sql = next(sql for sql, _ in conn.calls if "MERGE INTO INT.CLAIMS_SNAPSHOT" in sql)
-    assert "QUALIFY ROW_NUMBER() OVER" in merge_sql
-    assert "PARTITION BY src.claim_id" in merge_sql
-    assert "ORDER BY src.loaded_at DESC NULLS LAST" in merge_sql
+    inserted = promote_int_gold.promote_dimensions(conn, "2026-02-21")
+
+    assert len(conn.calls) == 1
+    sql, params = conn.calls[0]
+    assert conn.num_statements == 6
+    assert params == {"batch_date": "2026-02-21"}
+    assert "SELECT 1 FROM INT.DIM_ACTOR AS dim WHERE dim.actor = src.actor" in sql
+    assert "SELECT DISTINCT source_system AS actor" in sql
+    assert inserted == {"INT.DIM_POLICY": 2, "INT.DIM_CUSTOMER": 0, "INT.DIM_ACTOR": 1}
+
+
+def test_dimension_seed_reads_all_of_int_while_nightly_reads_the_batch() -> None:
+    """Keys on claims unchanged since an older batch only arrive through the seed."""
+    pytest.importorskip("duckdb")
+    from pipeline.common.local_backend import LocalDatabase, bootstrap_local
+
+    conn = LocalDatabase(":memory:").connect(autocommit=True)
+    bootstrap_local(conn)
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO INT.CLAIMS_SNAPSHOT (batch_date, claim_id, policy_id, customer_id) "
+            "VALUES ('2026-02-19', 'CLM1', 'POL1', 'CUST1'), ('2026-02-21', 'CLM2', 'POL2', 'CUST1')"
+        )
+        cur.execute(
+            "INSERT INTO INT.CLAIMS_EVENTS (batch_date, claim_id, event_ts, event_type, source_system) "
+            "VALUES ('2026-02-19', 'CLM1', '2026-02-19 09:00:00', 'CREATED', 'GUIDEWIRE')"
+        )
+
+    nightly = promote_int_gold.promote_dimensions(conn, "2026-02-21")
+    with conn.cursor() as cur:
+        for statement in promote_int_gold.dimension_statements(batch_scoped=False):
+            cur.execute(statement)
+        cur.execute(
+            "SELECT (SELECT COUNT(*) FROM INT.DIM_POLICY), (SELECT COUNT(*) FROM INT.DIM_CUSTOMER), "
+            "(SELECT COUNT(*) FROM INT.DIM_ACTOR)"
+        )
+        seeded = cur.fetchone()
+
+    assert nightly == {"INT.DIM_POLICY": 1, "INT.DIM_CUSTOMER": 1, "INT.DIM_ACTOR": 0}
+    assert tuple(seeded) == (2, 1, 1)
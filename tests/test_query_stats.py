@@ -0,0 +1,155 @@
+"""Tests for QUERY_TAG propagation and the post-run query stats harvest."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+
+from pipeline.common.snowflake_client import ConnectionPool
+from pipeline.common.tracing import current_query_tag, span, start_trace, traced
+from pipeline.orchestrator import nightly_job
+from pipeline.orchestrator.dag import Checkpoint
+from pipeline.orchestrator.query_stats import harvest_query_stats
+
+
+class _RecordingCursor:
+    def __init__(self, log: list) -> None:
+        self._log = log
+        self.rowcount = -1
+        self.sfqid = None
+
+    def __enter__(self) -> "_RecordingCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._log.append((sql, params))
+
+
+class _RecordingConn:
+    def __init__(self) -> None:
+        self.log: list = []
+
+    def cursor(self) -> _RecordingCursor:
+        return _RecordingCursor(self.log)
+
+
+def test_session_query_tag_follows_run_stage_and_control_scopes() -> None:
+    raw = _RecordingConn()
+    conn = traced(raw)
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT 0")
+        # No tracer: scopes still tag, so untraced callers are attributable too.
+        with span("nightly_job", kind="run", run_id="run_1"):
+            with span("controls", kind="stage"):
+                cur.execute("SELECT 1")
+                cur.execute("SELECT 2")
+                with span("C2_DQ_NON_NEGATIVE", kind="control"), span("render"):
+                    assert current_query_tag() == "run_1:controls:C2_DQ_NON_NEGATIVE"
+                    cur.execute("SELECT 3")
+                cur.execute("SELECT 4")
+    assert current_query_tag() == ""
+
+    tags = [params["query_tag"] for sql, params in raw.log if sql.startswith("ALTER SESSION")]
+    statements = [sql for sql, _params in raw.log if not sql.startswith("ALTER SESSION")]
+    assert tags == ["run_1:controls:", "run_1:controls:C2_DQ_NON_NEGATIVE", "run_1:controls:"]
+    assert statements == ["SELECT 0", "SELECT 1", "SELECT 2", "SELECT 3", "SELECT 4"]
+
+
+def test_run_span_without_run_id_uses_the_tracer_run_id() -> None:
+    raw = _RecordingConn()
+
+    with start_trace("run_7"), span("nightly_job", kind="run"), span("discover", kind="stage"):
+        with traced(raw).cursor() as cur:
+            cur.execute("SELECT 1")
+
+    assert raw.log[0] == ("ALTER SESSION SET QUERY_TAG = %(query_tag)s", {"query_tag": "run_7:discover:"})
+
+
+def test_harvest_aggregates_stand_in_history_per_stage_and_control() -> None:
+    pytest.importorskip("duckdb")
+    from pipeline.common.local_backend import LocalDatabase, bootstrap_local
+
+    conn = LocalDatabase(":memory:").connect()
+    bootstrap_local(conn)
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE CTRL.QUERY_HISTORY_STUB (
+              query_tag STRING, warehouse_name STRING, warehouse_size STRING,
+              total_elapsed_time NUMBER, execution_time NUMBER, queued_provisioning_time NUMBER,
+              queued_repair_time NUMBER, queued_overload_time NUMBER, bytes_scanned NUMBER,
+              partitions_scanned NUMBER, partitions_total NUMBER
+            )
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO CTRL.QUERY_HISTORY_STUB VALUES
+              ('run_1:load_snapshot:', 'WH', 'X-Small', 900, 800, 50, 0, 25, 4096, 2, 10),
+              ('run_1:controls:C2', 'WH', 'X-Small', 300, 250, 0, NULL, 10, 1024, 1, 10),
+              ('run_1:controls:C2', 'WH', 'X-Small', 200, 150, 0, 0, 0, 1024, 1, 10),
+              ('run_1:controls:', 'WH', 'X-Small', 40, 30, 0, 0, 0, 0, 0, 0),
+              ('run_10:controls:C2', 'WH', 'X-Small', 999, 999, 0, 0, 0, 9, 9, 9),
+              (NULL, 'WH', 'X-Small', 999, 999, 0, 0, 0, 9, 9, 9)
+            """
+        )
+
+    for _ in range(2):
+        written = harvest_query_stats(
+            conn, "run_1", "2026-02-19T00:00:00+00:00", history_source="CTRL.QUERY_HISTORY_STUB"
+        )
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT stage_name, control_id, query_count, total_elapsed_ms, execution_ms, queued_ms, "
+            "bytes_scanned, partitions_scanned, partitions_total "
+            "FROM CTRL.RUN_QUERY_STATS WHERE run_id = 'run_1' ORDER BY stage_name, control_id NULLS FIRST"
+        )
+        rows = cur.fetchall()
+
+    assert written == 3
+    assert [tuple(row) for row in rows] == [
+        ("controls", None, 1, 40, 30, 0, 0, 0, 0),
+        ("controls", "C2", 2, 500, 400, 10, 2048, 2, 20),
+        ("load_snapshot", None, 1, 900, 800, 75, 4096, 2, 10),
+    ]
+
+
+def test_record_query_stats_never_fails_the_run(tmp_path) -> None:
+    checkpoint = Checkpoint.create(tmp_path, "run_1", "2026-02-19")
+    checkpoint.mark("discover", "COMPLETED", started_at="2026-02-19T01:00:00+00:00")
+
+    @contextmanager
+    def broken_connect():
+        raise RuntimeError("warehouse suspended")
+        yield
+
+    assert nightly_job.record_query_stats(checkpoint, connect=broken_connect) == 0
+    assert nightly_job.record_query_stats(Checkpoint.create(tmp_path, "run_2", "2026-02-19")) == 0
+
+
+def test_pooled_sessions_keep_their_tag_across_borrows_and_unset_it_after_the_run() -> None:
+    raw = _RecordingConn()
+    pool = ConnectionPool(lambda: raw, autocommit=True, max_size=1)
+
+    with span("nightly_job", kind="run", run_id="run_1"), span("controls", kind="stage"):
+        for _ in range(3):
+            with pool.connection() as conn, conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT 2")
+        cur.execute("SELECT 3")
+
+    assert [sql for sql, _params in raw.log] == [
+        "ALTER SESSION SET QUERY_TAG = %(query_tag)s",
+        "SELECT 1",
+        "SELECT 1",
+        "SELECT 1",
+        "ALTER SESSION UNSET QUERY_TAG",
+        "SELECT 2",
+        "SELECT 3",
+    ]
@@ -14,7 +14,7 @@ def _patch_table_columns(
     def fake_table_columns(conn, schema_name: str, table_name: str) -> set[str]:
         return resolver(schema_name, table_name)
 
-    monkeypatch.setattr(raw_columns, "_table_columns", fake_table_columns)
+    monkeypatch.setattr(raw_columns, "table_columns", fake_table_columns)
 
 
 def test_snapshot_expressions_named_columns_with_loaded_at(monkeypatch) -> None:
@@ -105,3 +105,44 @@ def test_events_expressions_legacy_columns(monkeypatch) -> None:
 
     assert cols["batch_date"] == "TRY_TO_DATE(COL_1)"
     assert cols["event_type"] == "COL_4"
+    assert cols["event_ts"] == "TRY_TO_TIMESTAMP_NTZ(COL_3)"
+    assert cols["amount_delta"] == "TRY_TO_NUMBER(COL_7, 18, 2)"
+    assert cols["loaded_at"] == "CURRENT_TIMESTAMP()"
+
+
+class _ColumnsCursor:
+    def __init__(self, log: list) -> None:
+        self._log = log
+
+    def __enter__(self) -> "_ColumnsCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict) -> None:
+        self._log.append(params)
+
+    def fetchall(self) -> list[tuple[str, str]]:
+        return [("RAW.CLAIMS_SNAPSHOT_NIGHTLY", "COL_1"), ("RAW.CLAIMS_SNAPSHOT_NIGHTLY", "BATCH_DATE")]
+
+
+class _ColumnsConn:
+    def __init__(self) -> None:
+        self.log: list = []
+
+    def cursor(self) -> _ColumnsCursor:
+        return _ColumnsCursor(self.log)
+
+
+def test_tables_columns_resolves_every_table_in_one_query() -> None:
+    """Feed RAW tables are looked up together, keyed by the names given."""
+    conn = _ColumnsConn()
+
+    columns = raw_columns.tables_columns(conn, ["RAW.claims_snapshot_nightly", "RAW.CLAIMS_EVENTS_NIGHTLY"])
+
+    assert conn.log == [{"table_0": "RAW.CLAIMS_SNAPSHOT_NIGHTLY", "table_1": "RAW.CLAIMS_EVENTS_NIGHTLY"}]
+    assert columns == {
+        "RAW.claims_snapshot_nightly": {"COL_1", "BATCH_DATE"},
+        "RAW.CLAIMS_EVENTS_NIGHTLY": set(),
+    }
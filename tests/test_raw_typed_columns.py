@@ -0,0 +1,68 @@
+"""Tests for typed batch columns on the positional RAW layout."""
+
+from __future__ import annotations
+
+from pipeline.common import raw_columns
+from pipeline.ingest.load_to_snowflake import _build_copy_sql
+from scripts.migrate_raw_typed_columns import build_migration_statements
+
+LEGACY_SNAPSHOT = {f"COL_{idx}" for idx in range(1, 33)} | {"SRC_FILENAME", "SRC_FILE_ROW_NUMBER", "LOAD_TS"}
+TYPED_SNAPSHOT = LEGACY_SNAPSHOT | {
+    "BATCH_DATE",
+    "CLAIM_AMOUNT_INCURRED",
+    "PAID_AMOUNT_TO_DATE",
+    "RESERVE_AMOUNT",
+}
+
+
+def test_copy_populates_typed_columns_on_positional_layout() -> None:
+    """COPY should cast batch_date and amounts once into typed columns."""
+    sql = _build_copy_sql(
+        "RAW.CLAIMS_SNAPSHOT_NIGHTLY",
+        "RAW.CSV_FF",
+        "@RAW.CLAIMS_NIGHTLY_STAGE",
+        "snapshot",
+        target_columns=TYPED_SNAPSHOT,
+    )
+
+    assert "LOAD_TS, BATCH_DATE, CLAIM_AMOUNT_INCURRED, PAID_AMOUNT_TO_DATE, RESERVE_AMOUNT)" in sql
+    assert "TRY_TO_DATE(t.$1)" in sql
+    assert "TRY_TO_NUMBER(t.$24, 18, 2)" in sql
+
+
+def test_copy_keeps_positional_load_for_named_layout() -> None:
+    """Named layouts keep the original positional COPY without a column list."""
+    sql = _build_copy_sql(
+        "RAW.CLAIMS_SNAPSHOT_NIGHTLY",
+        "RAW.CSV_FF",
+        "@RAW.CLAIMS_NIGHTLY_STAGE",
+        "snapshot",
+        target_columns={"BATCH_DATE", "CLAIM_ID", "LOADED_AT"},
+    )
+
+    assert "COPY INTO RAW.CLAIMS_SNAPSHOT_NIGHTLY\n" in sql
+    assert "TRY_TO_DATE" not in sql
+    assert "t.$32" in sql
+
+
+def test_typed_legacy_snapshot_uses_typed_batch_columns(monkeypatch) -> None:
+    """Migrated positional tables should take the prunable BATCH_DATE branch."""
+    monkeypatch.setattr(raw_columns, "table_columns", lambda conn, schema, table: TYPED_SNAPSHOT)
+
+    cols = raw_columns.snapshot_expressions(conn=None)
+
+    assert cols["batch_date"] == "BATCH_DATE"
+    assert cols["claim_amount_incurred"] == "CLAIM_AMOUNT_INCURRED"
+    assert cols["claim_id"] == "COL_3"
+
+
+def test_migration_backfills_and_clusters_legacy_table() -> None:
+    """Migration adds, backfills and clusters typed columns idempotently."""
+    statements = build_migration_statements("RAW.CLAIMS_SNAPSHOT_NIGHTLY", "snapshot", LEGACY_SNAPSHOT)
+
+    assert statements[0] == "ALTER TABLE RAW.CLAIMS_SNAPSHOT_NIGHTLY ADD COLUMN IF NOT EXISTS BATCH_DATE DATE"
+    update = next(stmt for stmt in statements if stmt.startswith("UPDATE"))
+    assert "BATCH_DATE = TRY_TO_DATE(COL_1)" in update
+    assert "RESERVE_AMOUNT = TRY_TO_NUMBER(COL_26, 18, 2)" in update
+    assert "WHERE BATCH_DATE IS NULL" in update
+    assert statements[-1] == "ALTER TABLE RAW.CLAIMS_SNAPSHOT_NIGHTLY CLUSTER BY (BATCH_DATE)"
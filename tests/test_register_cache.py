@@ -0,0 +1,102 @@
+"""Tests for the compiled control register cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from pipeline.controls.register_cache import RegisterCache
+from pipeline.controls.registry import ControlRegistry
+
+REGISTER = """
+exceptions_limit: 10
+controls:
+  - id: C2_DQ_NON_NEGATIVE
+    type: sql
+    severity: BLOCK
+    sql_path: C2.sql
+"""
+
+
+def _setup(tmp_path: Path) -> tuple[Path, Path]:
+    sql_dir = tmp_path / "sql"
+    sql_dir.mkdir()
+    (sql_dir / "C2.sql").write_text("SELECT {{snapshot_claim_id}}, {{snapshot_batch_date}}", encoding="utf-8")
+    register = tmp_path / "controls.yaml"
+    register.write_text(REGISTER, encoding="utf-8")
+    return register, sql_dir
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_compiled_register_is_reused_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    """Repeated loads should parse once and reload after an edit."""
+    register, sql_dir = _setup(tmp_path)
+    registry = ControlRegistry(str(register), sql_dir=str(sql_dir), cache=RegisterCache(cache_dir=None))
+    calls: list[int] = []
+    original_parse = registry.parse
+    monkeypatch.setattr(registry, "parse", lambda payload: calls.append(1) or original_parse(payload))
+
+    first = registry.compiled()
+    assert registry.compiled() is first
+    assert len(calls) == 1
+    assert first.definitions[0].exceptions_limit == 10
+    assert first.sql_texts == {"C2.sql": "SELECT {{snapshot_claim_id}}, {{snapshot_batch_date}}"}
+
+    register.write_text(REGISTER.replace("exceptions_limit: 10", "exceptions_limit: 20"), encoding="utf-8")
+    _bump_mtime(register)
+
+    assert registry.load()[0].exceptions_limit == 20
+    assert len(calls) == 2
+
+
+def test_sql_template_edit_refreshes_without_reparsing(tmp_path: Path, monkeypatch) -> None:
+    """Editing a referenced SQL file should refresh templates but not the YAML."""
+    register, sql_dir = _setup(tmp_path)
+    registry = ControlRegistry(str(register), sql_dir=str(sql_dir), cache=RegisterCache(cache_dir=None))
+    registry.compiled()
+    monkeypatch.setattr(registry, "parse", lambda payload: (_ for _ in ()).throw(AssertionError))
+
+    sql_file = sql_dir / "C2.sql"
+    sql_file.write_text("SELECT {{events_event_type}}", encoding="utf-8")
+    _bump_mtime(sql_file)
+
+    assert registry.compiled().sql_texts["C2.sql"] == "SELECT {{events_event_type}}"
+
+
+def test_sql_text_is_served_from_the_compiled_register(tmp_path: Path) -> None:
+    """Handlers read the templates the register was compiled with, until the next load."""
+    register, sql_dir = _setup(tmp_path)
+    cache = RegisterCache(cache_dir=None)
+    registry = ControlRegistry(str(register), sql_dir=str(sql_dir), cache=cache)
+    registry.load()
+    sql_file = sql_dir / "C2.sql"
+    sql_file.write_text("SELECT 2", encoding="utf-8")
+    _bump_mtime(sql_file)
+    adhoc = sql_dir / "ADHOC.sql"
+    adhoc.write_text("SELECT 3", encoding="utf-8")
+
+    assert cache.sql_text(sql_file) == "SELECT {{snapshot_claim_id}}, {{snapshot_batch_date}}"
+    registry.load()
+    assert cache.sql_text(sql_file) == "SELECT 2"
+    # Files no register references are read from disk.
+    assert cache.sql_text(adhoc) == "SELECT 3"
+
+
+def test_disk_snapshot_is_shared_across_processes(tmp_path: Path, monkeypatch) -> None:
+    """A fresh cache instance should load the on-disk snapshot without parsing."""
+    register, sql_dir = _setup(tmp_path)
+    cache_dir = tmp_path / "cache"
+    ControlRegistry(str(register), sql_dir=str(sql_dir), cache=RegisterCache(cache_dir)).load()
+    assert len(list(cache_dir.glob("register_*.json"))) == 1
+
+    registry = ControlRegistry(str(register), sql_dir=str(sql_dir), cache=RegisterCache(cache_dir))
+    monkeypatch.setattr(registry, "parse", lambda payload: (_ for _ in ()).throw(AssertionError))
+
+    definitions = registry.load()
+
+    assert [item.control_id for item in definitions] == ["C2_DQ_NON_NEGATIVE"]
+    assert registry.load_raw()["exceptions_limit"] == 10
@@ -0,0 +1,107 @@
+"""Tests for batched run bookkeeping and buffered control persistence."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from pipeline.controls.models import ControlResult
+from pipeline.controls.repository import ControlRepository
+from pipeline.orchestrator.run_bookkeeping import RunBookkeeper
+from pipeline.promote.promote_int_gold import PromotionResult
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None, num_statements: int | None = None) -> None:
+        self._conn.calls.append((sql, params, num_statements))
+
+    def fetchall(self):
+        return [(column,) for column in self._conn.columns]
+
+
+class _FakeConn:
+    def __init__(self, columns: list[str] | None = None) -> None:
+        self.calls: list[tuple[str, dict | None, int | None]] = []
+        self.columns = columns or []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+def _result(control_id: str) -> ControlResult:
+    return ControlResult(
+        run_id="run_1",
+        batch_date=date(2026, 2, 21),
+        control_id=control_id,
+        status="PASS",
+        blocking=True,
+        severity="BLOCK",
+        type="sql",
+        fail_count=0,
+    )
+
+
+def test_bookkeeper_sends_queued_statements_in_one_request() -> None:
+    conn = _FakeConn()
+    bookkeeper = RunBookkeeper(conn, "run_1")
+
+    bookkeeper.record_promotion(
+        "CLAIMS_SNAPSHOT",
+        "2026-02-21",
+        PromotionResult(inserted=1, updated=2, unchanged=3, source_rows=7, dedup_dropped=1),
+    )
+    bookkeeper.record_promotion("CLAIMS_EVENTS", "2026-02-21", PromotionResult(4, 0, 0))
+    bookkeeper.finish("PASSED", record_count=3)
+    assert conn.calls == []
+    bookkeeper.flush()
+
+    assert len(conn.calls) == 1
+    sql, params, num_statements = conn.calls[0]
+    assert num_statements == 3
+    assert "%(s0_dataset_name)s" in sql and "%(s2_record_count)s" in sql
+    assert params["s0_dataset_name"] == "CLAIMS_SNAPSHOT"
+    assert params["s1_inserted_count"] == 4
+    assert params["s2_status"] == "PASSED"
+    assert bookkeeper.pending == 0
+
+
+def test_bookkeeper_single_statement_keeps_plain_params() -> None:
+    conn = _FakeConn()
+    bookkeeper = RunBookkeeper(conn, "run_1")
+
+    bookkeeper.finish("FAILED")
+    bookkeeper.flush()
+    bookkeeper.flush()
+
+    assert len(conn.calls) == 1
+    sql, params, num_statements = conn.calls[0]
+    assert num_statements is None
+    assert params == {"status": "FAILED", "run_id": "run_1"}
+
+
+def test_buffered_repository_writes_one_multi_row_insert() -> None:
+    conn = _FakeConn(columns=["RUN_ID", "BATCH_DATE", "CONTROL_ID", "STATUS", "EXECUTED_TS"])
+    repository = ControlRepository(conn, buffered=True)
+
+    for control_id in ("C1", "C2", "C3"):
+        repository.persist(_result(control_id))
+    assert conn.calls == []
+    repository.flush()
+    repository.persist(_result("C4"))
+    repository.flush()
+
+    column_lookups = [call for call in conn.calls if "INFORMATION_SCHEMA" in call[0]]
+    inserts = [call for call in conn.calls if "INSERT INTO CTRL.CONTROL_RESULT" in call[0]]
+    assert len(column_lookups) == 1
+    assert len(inserts) == 2
+    sql, params, _ = inserts[0]
+    assert sql.count("UNION ALL") == 2
+    assert [params["control_id"], params["control_id_1"], params["control_id_2"]] == ["C1", "C2", "C3"]
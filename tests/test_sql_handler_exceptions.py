@@ -0,0 +1,114 @@
+"""Tests for server-side exception sampling in the SQL control handler."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+
+from pipeline.controls.handlers import sql_handler
+from pipeline.controls.handlers.sql_handler import SqlHandler
+from pipeline.controls.models import ControlContext, ControlDefinition
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self.description = [
+            ("CONTROL_VALUE",),
+            ("TOTAL_COUNT",),
+            ("FAIL_COUNT",),
+            ("VARIANCE",),
+            ("STATUS",),
+            ("DETAILS",),
+        ]
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._conn.calls.append((sql, params))
+
+    def fetchone(self):
+        return (self._conn.fail_count, 10, self._conn.fail_count, None, None, "details")
+
+
+class _FakeConn:
+    def __init__(self, fail_count: int) -> None:
+        self.fail_count = fail_count
+        self.calls: list[tuple[str, dict | None]] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+def _patch_expressions(monkeypatch) -> None:
+    monkeypatch.setattr(
+        sql_handler,
+        "snapshot_expressions",
+        lambda conn: {
+            "batch_date": "BATCH_DATE",
+            "claim_id": "CLAIM_ID",
+            "claim_amount_incurred": "CLAIM_AMOUNT_INCURRED",
+            "paid_amount_to_date": "PAID_AMOUNT_TO_DATE",
+            "reserve_amount": "RESERVE_AMOUNT",
+            "src_file_row_number": "SRC_FILE_ROW_NUMBER",
+        },
+    )
+    monkeypatch.setattr(sql_handler, "events_expressions", lambda conn: {})
+
+
+def _control() -> ControlDefinition:
+    return ControlDefinition(
+        control_id="C2_DQ_NON_NEGATIVE",
+        type="sql",
+        enabled=True,
+        blocking=True,
+        severity="BLOCK",
+        description="dq",
+        sql_path="C2_DQ_NON_NEGATIVE.sql",
+        params={},
+        exceptions_sql="C2_DQ_NON_NEGATIVE_EXCEPTIONS.sql",
+        exceptions_limit=25,
+    )
+
+
+def _context(conn: _FakeConn) -> ControlContext:
+    return ControlContext(
+        run_id="run_1",
+        batch_date=date(2026, 2, 21),
+        files={},
+        loaded_counts={},
+        connection=conn,
+    )
+
+
+def test_failing_control_samples_exceptions_in_one_statement(monkeypatch) -> None:
+    """A failing control should issue one bounded INSERT ... SELECT."""
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(fail_count=3)
+
+    result = SqlHandler().handle(_control(), _context(conn))
+
+    assert result.status == "FAIL"
+    inserts = [(sql, params) for sql, params in conn.calls if "INSERT INTO CTRL.EXCEPTIONS" in sql]
+    assert len(inserts) == 1
+    insert_sql, params = inserts[0]
+    assert "LIMIT %(exceptions_limit)s" in insert_sql
+    assert "SRC_FILE_ROW_NUMBER AS src_file_row_number" in insert_sql
+    assert ";" not in insert_sql
+    assert params["exceptions_limit"] == 25
+    assert params["run_id"] == "run_1"
+
+
+def test_passing_control_skips_exception_capture(monkeypatch) -> None:
+    """No exception sampling should run when the control passes."""
+    _patch_expressions(monkeypatch)
+    conn = _FakeConn(fail_count=0)
+
+    SqlHandler().handle(_control(), _context(conn))
+    SqlHandler().handle(replace(_control(), exceptions_sql=None), _context(conn))
+
+    assert not any("INSERT INTO CTRL.EXCEPTIONS" in sql for sql, _ in conn.calls)
@@ -0,0 +1,149 @@
+"""Tests for statistical drift controls and rolling baselines."""
+
+from __future__ import annotations
+
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from pipeline.controls.baseline import BaselineState, BaselineStore, welford_update
+from pipeline.controls.handlers import statistical_handler
+from pipeline.controls.handlers.statistical_handler import StatisticalHandler
+from pipeline.controls.models import ControlContext, ControlDefinition
+
+
+def test_welford_matches_sample_statistics() -> None:
+    """Incremental mean/stddev should match a full recomputation."""
+    values = [100.0, 104.0, 98.0, 101.0, 97.0, 103.0]
+    state = None
+    for offset, value in enumerate(values):
+        state = welford_update(state, "m", value, date(2026, 2, 1) + timedelta(days=offset), window=30)
+
+    assert state is not None
+    assert state.sample_count == len(values)
+    assert state.mean == pytest.approx(statistics.mean(values))
+    assert state.stddev == pytest.approx(statistics.stdev(values))
+
+
+def test_welford_window_caps_sample_count() -> None:
+    """Once the window is full, the effective sample count stays bounded."""
+    state = None
+    for offset in range(50):
+        state = welford_update(state, "m", float(offset % 5), date(2026, 1, 1) + timedelta(days=offset), window=10)
+
+    assert state is not None
+    assert state.sample_count == 10
+
+
+class _FakeCursor:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self._last_sql = ""
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._last_sql = sql
+        self._conn.calls.append((sql, params))
+
+    def fetchone(self):
+        return (self._conn.metric_value,)
+
+    def fetchall(self):
+        if "FROM CTRL.METRIC_BASELINE" in self._last_sql:
+            return self._conn.baseline_rows
+        return []
+
+
+class _FakeConn:
+    def __init__(self, metric_value: float, baseline_rows: list[tuple]) -> None:
+        self.metric_value = metric_value
+        self.baseline_rows = baseline_rows
+        self.calls: list[tuple[str, dict | None]] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+
+def _control() -> ControlDefinition:
+    return ControlDefinition(
+        control_id="C10_CLAIM_COUNT_DRIFT",
+        type="statistical",
+        enabled=True,
+        blocking=False,
+        severity="WARN",
+        description="drift",
+        sql_path="C10_CLAIM_COUNT_DRIFT.sql",
+        params={"sigma": 3, "min_samples": 5},
+    )
+
+
+def _context(conn: _FakeConn) -> ControlContext:
+    return ControlContext(
+        run_id="run_1",
+        batch_date=date(2026, 2, 21),
+        files={},
+        loaded_counts={},
+        connection=conn,
+        prev_batch_date=date(2026, 2, 20),
+    )
+
+
+@pytest.mark.parametrize(
+    ("metric_value", "expected_status"),
+    [(1000.0, "PASS"), (1100.0, "FAIL")],
+)
+def test_handler_checks_metric_against_baseline(monkeypatch, metric_value: float, expected_status: str) -> None:
+    """Values beyond sigma standard deviations should fail."""
+    monkeypatch.setattr(statistical_handler.SqlHandler, "_build_sql_context", lambda self, conn: {"snapshot_batch_date": "BATCH_DATE"})
+    # 30 samples, mean 1000, stddev 10 -> m2 = 100 * 29.
+    conn = _FakeConn(metric_value, [("C10_CLAIM_COUNT_DRIFT", 30, 1000.0, 2900.0, date(2026, 2, 20))])
+
+    result = StatisticalHandler().handle(_control(), _context(conn))
+
+    assert result.status == expected_status
+    assert result.metric_value == metric_value
+    assert len(conn.calls) == 2
+
+
+def test_handler_skips_until_baseline_warms_up(monkeypatch) -> None:
+    """Insufficient history should not fail the control."""
+    monkeypatch.setattr(statistical_handler.SqlHandler, "_build_sql_context", lambda self, conn: {"snapshot_batch_date": "BATCH_DATE"})
+    conn = _FakeConn(5000.0, [("C10_CLAIM_COUNT_DRIFT", 2, 10.0, 1.0, date(2026, 2, 20))])
+
+    result = StatisticalHandler().handle(_control(), _context(conn))
+
+    assert result.status == "SKIP"
+
+
+def test_store_update_is_idempotent_per_batch_date() -> None:
+    """Rerunning a batch must not fold the same observation twice."""
+    conn = _FakeConn(0.0, [("C10_CLAIM_COUNT_DRIFT", 5, 10.0, 4.0, date(2026, 2, 21))])
+
+    updated = BaselineStore(conn).update({"C10_CLAIM_COUNT_DRIFT": 12.0}, date(2026, 2, 21))
+
+    assert updated == []
+    assert not any("MERGE INTO CTRL.METRIC_BASELINE" in sql for sql, _ in conn.calls)
+
+
+def test_store_update_merges_all_metrics_in_one_statement() -> None:
+    """New and existing baselines are written with a single MERGE."""
+    conn = _FakeConn(0.0, [("C10_CLAIM_COUNT_DRIFT", 5, 10.0, 4.0, date(2026, 2, 20))])
+
+    updated = BaselineStore(conn).update(
+        {"C10_CLAIM_COUNT_DRIFT": 12.0, "C11_TOTAL_INCURRED_DRIFT": 500.0},
+        date(2026, 2, 21),
+    )
+
+    merges = [sql for sql, _ in conn.calls if "MERGE INTO CTRL.METRIC_BASELINE" in sql]
+    assert len(merges) == 1
+    assert {state.metric_id: state.sample_count for state in updated} == {
+        "C10_CLAIM_COUNT_DRIFT": 6,
+        "C11_TOTAL_INCURRED_DRIFT": 1,
+    }
+    assert isinstance(updated[0], BaselineState)
@@ -0,0 +1,94 @@
+"""Tests for the synthetic nightly file generator and the benchmark suite."""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from pipeline.ingest.schema_validate import validate_csv_against_schema
+from scripts import benchmark
+from scripts.synthetic_claims import (
+    BAD_EVENT_TYPE,
+    EVENTS_HEADER,
+    SNAPSHOT_HEADER,
+    AnomalyRates,
+    write_nightly_drop,
+    write_snapshot,
+)
+
+
+def test_same_seed_writes_identical_files(tmp_path: Path) -> None:
+    first = write_nightly_drop(tmp_path / "a", 500, "2026-02-21", seed=7, rates=AnomalyRates(duplicate=0.05))
+    second = write_nightly_drop(tmp_path / "b", 500, "2026-02-21", seed=7, rates=AnomalyRates(duplicate=0.05))
+    other = write_snapshot(tmp_path / "c.csv", 500, "2026-02-21", seed=8)
+
+    for name in ("snapshot", "events"):
+        assert first[name].path.read_bytes() == second[name].path.read_bytes()
+    assert first["snapshot"].path.read_bytes() != other.path.read_bytes()
+    assert first["snapshot"].path.name == "claims_snapshot_20260221.csv"
+
+
+def test_clean_drop_follows_schemas_and_dq_rules(tmp_path: Path) -> None:
+    stats = write_nightly_drop(tmp_path, 300, "2026-02-21", events_per_claim=2.0)
+
+    snapshot = validate_csv_against_schema(stats["snapshot"].path, "schemas/claims_snapshot_schema.json")
+    events = validate_csv_against_schema(stats["events"].path, "schemas/claims_events_schema.json")
+    with stats["snapshot"].path.open(encoding="utf-8", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+
+    assert (snapshot.valid, snapshot.row_count) == (True, 300)
+    assert (events.valid, events.row_count) == (True, 600)
+    assert tuple(rows[0]) == SNAPSHOT_HEADER
+    assert len({row["claim_id"] for row in rows}) == 300
+    for row in rows:
+        incurred = float(row["claim_amount_incurred"])
+        assert incurred == pytest.approx(float(row["paid_amount_to_date"]) + float(row["reserve_amount"]))
+        assert (row["claim_status"] == "CLOSED") == bool(row["close_date"])
+        assert (row["r_tw_flag"] == "TRUE") == bool(row["r_tw_date"])
+
+
+def test_anomaly_rates_inject_counted_defects(tmp_path: Path) -> None:
+    rates = AnomalyRates(negative_amount=0.1, duplicate=0.1, bad_pii_class=0.1, bad_event_type=0.1)
+    stats = write_nightly_drop(tmp_path, 2000, "2026-02-21", seed=3, rates=rates)
+
+    with stats["snapshot"].path.open(encoding="utf-8", newline="") as fh:
+        snapshot = list(csv.DictReader(fh))
+    with stats["events"].path.open(encoding="utf-8", newline="") as fh:
+        events = list(csv.DictReader(fh))
+
+    negatives = sum(float(row["paid_amount_to_date"]) < 0 for row in snapshot)
+    duplicates = len(snapshot) - len({row["claim_id"] for row in snapshot})
+    bad_pii = sum(row["pii_class"] not in {"NONE", "LOW", "MEDIUM", "HIGH"} for row in snapshot)
+    bad_events = sum(row["event_type"] == BAD_EVENT_TYPE for row in events)
+
+    assert tuple(events[0]) == EVENTS_HEADER
+    assert negatives == stats["snapshot"].negative_amounts
+    assert duplicates == stats["snapshot"].duplicates
+    assert bad_pii == stats["snapshot"].bad_pii_classes
+    assert bad_events == stats["events"].bad_event_types
+    for count in (negatives, duplicates, bad_pii, bad_events):
+        assert 140 <= count <= 260
+
+
+def test_rates_outside_unit_interval_are_rejected() -> None:
+    with pytest.raises(ValueError, match="duplicate"):
+        AnomalyRates(duplicate=1.5)
+
+
+def test_benchmark_reports_rows_per_second_and_memory(tmp_path: Path) -> None:
+    results = benchmark.run_benchmarks([200], rates=AnomalyRates(negative_amount=0.05), work_dir=tmp_path)
+    path = benchmark.write_report(results, tmp_path / "reports", settings={"rows": [200]})
+    payload = json.loads(path.read_text(encoding="utf-8"))
+
+    by_case = {item["case"]: item for item in payload["results"]}
+    assert list(by_case)[:3] == ["schema_validation", "row_count", "file_hash"]
+    assert set(benchmark.DB_CASES) <= set(by_case)
+    for item in by_case.values():
+        assert item["rows"] == 400
+        if item["skipped"] is None:
+            assert item["rows_per_sec"] > 0
+            assert item["peak_memory_mib"] is not None
+    assert path.name.startswith("benchmark_")
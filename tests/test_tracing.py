@@ -0,0 +1,102 @@
+"""Tests for tracing spans, the traced cursor and trace export."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pipeline.common.tracing import span, start_trace, traced
+from pipeline.orchestrator.dag import Checkpoint, DagRunner, Stage
+
+
+class _FakeCursor:
+    def __init__(self) -> None:
+        self.rowcount = -1
+        self.sfqid = None
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        if "BROKEN" in sql:
+            raise RuntimeError("SQL compilation error")
+        self.rowcount = 3
+        self.sfqid = "01b2-query"
+
+    def fetchone(self):
+        return (3,)
+
+
+class _FakeConn:
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor()
+
+    def commit(self) -> None:
+        return None
+
+
+def test_spans_nest_and_sql_spans_record_rows_and_query_id() -> None:
+    conn = traced(_FakeConn())
+
+    with start_trace("run_1") as tracer:
+        with span("nightly_job", kind="run"):
+            with span("controls", kind="stage"):
+                with conn.cursor() as cur:
+                    cur.execute("SELECT   COUNT(*)\n FROM RAW.T")
+                    assert cur.fetchone() == (3,)
+                    with pytest.raises(RuntimeError):
+                        cur.execute("SELECT BROKEN")
+
+    by_name = {}
+    for item in tracer.spans:
+        by_name.setdefault(item.name, []).append(item)
+    run_span = by_name["nightly_job"][0]
+    stage_span = by_name["controls"][0]
+    ok_sql, failed_sql = sorted(by_name["sql"], key=lambda item: item.start_ns)
+    assert stage_span.parent_id == run_span.span_id
+    assert ok_sql.parent_id == stage_span.span_id
+    assert ok_sql.attributes == {
+        "statement": "SELECT COUNT(*) FROM RAW.T",
+        "rows": 3,
+        "query_id": "01b2-query",
+    }
+    assert failed_sql.error == "RuntimeError: SQL compilation error"
+
+
+def test_spans_are_noops_without_tracer() -> None:
+    with span("orphan") as item:
+        assert item is None
+    with traced(_FakeConn()).cursor() as cur:
+        cur.execute("SELECT 1")
+
+
+def test_stage_threads_inherit_trace_and_export_critical_path(tmp_path) -> None:
+    def load(ctx):
+        with span("COPY", kind="sql"):
+            pass
+        return {}
+
+    stages = [
+        Stage("discover", lambda ctx: {}),
+        Stage("load_a", load, depends_on=("discover",)),
+        Stage("load_b", load, depends_on=("discover",)),
+        Stage("controls", lambda ctx: {}, depends_on=("load_a", "load_b")),
+    ]
+    with start_trace("run_2") as tracer:
+        with span("nightly_job", kind="run"):
+            DagRunner(stages, Checkpoint.create(tmp_path, "run_2", "2026-02-21")).run()
+    path = tracer.export(tmp_path)
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    spans = [line for line in lines if line["type"] == "span"]
+    run_id = next(line["span_id"] for line in spans if line["name"] == "nightly_job")
+    stage_parents = {line["name"]: line["parent_id"] for line in spans if line["kind"] == "stage"}
+    assert stage_parents == {name: run_id for name in ("discover", "load_a", "load_b", "controls")}
+    summary = lines[-1]
+    assert summary["type"] == "summary"
+    assert [item["name"] for item in summary["critical_path"]] == ["nightly_job", "controls"]
+    assert summary["span_count"] == len(spans)
@@ -0,0 +1,200 @@
+"""Tests for per-stage warehouse sizing against a recording fake connection."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from pipeline.common.tracing import start_trace
+from pipeline.orchestrator import nightly_job
+from pipeline.orchestrator.warehouse_policy import SizingRule, WarehousePolicy, workload_estimate
+
+
+class _RecordingCursor:
+    def __init__(self, log: list[str], fail: bool) -> None:
+        self._log = log
+        self._fail = fail
+
+    def __enter__(self) -> "_RecordingCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._log.append(sql)
+        if self._fail:
+            raise RuntimeError("Insufficient privileges to operate on warehouse")
+
+
+class _RecordingConn:
+    def __init__(self, fail: bool = False) -> None:
+        self.log: list[str] = []
+        self.fail = fail
+
+    def cursor(self) -> _RecordingCursor:
+        return _RecordingCursor(self.log, self.fail)
+
+
+def _factory(conn: _RecordingConn):
+    @contextmanager
+    def connect():
+        yield conn
+
+    return connect
+
+
+RULES = [
+    SizingRule(stages=("load_*",), basis="file_bytes", tiers=((100, "XSMALL"), (1000, "MEDIUM"), (None, "LARGE"))),
+    SizingRule(stages=("promote_*",), basis="rows", tiers=((10, "XSMALL"), (None, "SMALL"))),
+]
+
+
+def _outputs(tmp_path: Path) -> dict:
+    big = tmp_path / "claims_snapshot_20260219.csv"
+    big.write_bytes(b"x" * 5000)
+    small = tmp_path / "claims_events_20260219.csv"
+    small.write_bytes(b"x" * 50)
+    return {
+        "discover": {"files": {"snapshot": str(big), "events": str(small)}},
+        "validate_snapshot": {"row_count": 40},
+        "validate_events": {"row_count": 3},
+        "load_snapshot": {"loaded": 42},
+    }
+
+
+def test_estimates_are_per_feed_for_feed_stages_and_run_wide_otherwise(tmp_path: Path) -> None:
+    outputs = _outputs(tmp_path)
+    policy = WarehousePolicy("CLAIMS_WH", "XSMALL", RULES)
+
+    assert workload_estimate("load_snapshot", outputs) == {"file_bytes": 5000, "rows": 42}
+    assert workload_estimate("controls", outputs) == {"file_bytes": 5050, "rows": 45}
+    assert policy.decide("load_snapshot", outputs).size == "LARGE"
+    assert policy.decide("load_events", outputs).size == "XSMALL"
+    assert policy.decide("promote_snapshot", outputs).size == "SMALL"
+    assert policy.decide("controls", outputs).basis is None
+
+
+def test_resize_holds_the_largest_running_request_and_scales_back(tmp_path: Path) -> None:
+    outputs = _outputs(tmp_path)
+    stage_conn = _RecordingConn()
+    control = _RecordingConn()
+    policy = WarehousePolicy("CLAIMS_WH", "XSMALL", RULES, control_connect=_factory(control))
+
+    with policy.sized(stage_conn, "discover", outputs):
+        pass
+    # Overlapping stages, as when the DAG loads feeds in parallel.
+    with policy.sized(stage_conn, "load_snapshot", outputs):
+        with policy.sized(stage_conn, "promote_snapshot", outputs):
+            pass
+        with policy.sized(stage_conn, "load_events", outputs):
+            pass
+
+    assert control.log == [
+        "ALTER WAREHOUSE CLAIMS_WH SET WAREHOUSE_SIZE = XSMALL WAIT_FOR_COMPLETION = TRUE",
+        "ALTER WAREHOUSE CLAIMS_WH SET WAREHOUSE_SIZE = LARGE WAIT_FOR_COMPLETION = TRUE",
+        "ALTER WAREHOUSE CLAIMS_WH SET WAREHOUSE_SIZE = XSMALL",
+    ]
+    # The warehouse DDL never runs inside a stage's transaction.
+    assert stage_conn.log == []
+
+
+def test_resize_runs_outside_the_policy_lock(tmp_path: Path) -> None:
+    held: list[bool] = []
+
+    @contextmanager
+    def connect():
+        held.append(policy._lock.locked())
+        yield _RecordingConn()
+
+    policy = WarehousePolicy("CLAIMS_WH", "XSMALL", RULES, control_connect=connect)
+    with policy.sized(_RecordingConn(), "load_snapshot", _outputs(tmp_path)):
+        pass
+
+    assert held == [False, False]
+
+
+def test_switch_mode_uses_the_mapped_warehouse_on_the_stage_session(tmp_path: Path) -> None:
+    stage_conn = _RecordingConn()
+    policy = WarehousePolicy(
+        "CLAIMS_WH",
+        "XSMALL",
+        RULES,
+        mode="switch",
+        warehouses={"XSMALL": "CLAIMS_WH", "SMALL": "CLAIMS_WH", "MEDIUM": "CLAIMS_WH_M", "LARGE": "CLAIMS_WH_L"},
+    )
+
+    with policy.sized(stage_conn, "load_snapshot", _outputs(tmp_path)) as decision:
+        stage_conn.log.append("COPY INTO RAW.CLAIMS_SNAPSHOT_NIGHTLY")
+    with policy.sized(stage_conn, "controls", _outputs(tmp_path)):
+        pass
+
+    assert decision.warehouse == "CLAIMS_WH_L"
+    assert stage_conn.log == [
+        "USE WAREHOUSE CLAIMS_WH_L",
+        "COPY INTO RAW.CLAIMS_SNAPSHOT_NIGHTLY",
+        "USE WAREHOUSE CLAIMS_WH",
+    ]
+    with pytest.raises(ValueError, match="LARGE, MEDIUM"):
+        WarehousePolicy("CLAIMS_WH", "XSMALL", RULES, mode="switch", warehouses={"XSMALL": "A", "SMALL": "A"})
+
+
+def test_decisions_are_traced_and_a_failed_resize_disables_the_policy(tmp_path: Path) -> None:
+    control = _RecordingConn(fail=True)
+    policy = WarehousePolicy("CLAIMS_WH", "XSMALL", RULES, control_connect=_factory(control))
+
+    with start_trace("run_1") as tracer:
+        with policy.sized(_RecordingConn(), "load_snapshot", _outputs(tmp_path)):
+            ran = True
+    with policy.sized(_RecordingConn(), "promote_snapshot", _outputs(tmp_path)):
+        pass
+
+    spans = {item.name: item.attributes for item in tracer.spans}
+    assert ran
+    assert spans["warehouse_sizing"] == {
+        "stage": "load_snapshot",
+        "mode": "resize",
+        "size": "LARGE",
+        "warehouse": "CLAIMS_WH",
+        "basis": "file_bytes",
+        "estimate": 5000,
+        "action": "failed",
+    }
+    assert spans["warehouse_restore"]["action"] == "disabled"
+    # Later stages do not retry the ALTER.
+    assert control.log == ["ALTER WAREHOUSE CLAIMS_WH SET WAREHOUSE_SIZE = LARGE WAIT_FOR_COMPLETION = TRUE"]
+
+
+def test_nightly_wraps_only_connection_stages_and_config_parses(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("SNOWFLAKE_WAREHOUSE", raising=False)
+    config = tmp_path / "env.yaml"
+    config.write_text(
+        "warehouse_size: SMALL\n"
+        "snowflake: {warehouse: COMPUTE_WH}\n"
+        "warehouse_policy:\n"
+        "  enabled: true\n"
+        "  rules:\n"
+        "    - {stages: [load_*], basis: file_bytes, tiers: [{up_to: 10, size: x-small}, {size: MEDIUM}]}\n",
+        encoding="utf-8",
+    )
+    policy = WarehousePolicy.from_config(config)
+    sized = {stage.name: stage for stage in nightly_job.build_stages(policy=policy)}
+
+    assert (policy.warehouse, policy.default_size, policy.rules[0].tiers) == (
+        "COMPUTE_WH",
+        "SMALL",
+        ((10, "XSMALL"), (None, "MEDIUM")),
+    )
+    assert sized["validate_snapshot"].run.__name__ == "run"
+    assert {sized[name].run.__name__ for name in ("discover", "load_snapshot", "controls")} == {"sized_run"}
+
+    disabled = tmp_path / "disabled.yaml"
+    disabled.write_text("warehouse_policy: {enabled: false}\n", encoding="utf-8")
+    assert WarehousePolicy.from_config(disabled) is None
+    # Dev ships disabled; an environment opts in by naming its own config.
+    monkeypatch.delenv("PIPELINE_WAREHOUSE_POLICY_CONFIG", raising=False)
+    assert WarehousePolicy.from_config() is None
+    monkeypatch.setenv("PIPELINE_WAREHOUSE_POLICY_CONFIG", str(config))
+    assert WarehousePolicy.from_config().default_size == "SMALL"